@@ -0,0 +1,400 @@
+"""
+Benchmark suite for the seed data generators.
+
+Times every generator in src/generators/, the date, string and ID helpers,
+and the full `python -m src.main` build at several scale points. Each
+benchmark records wall time, rows produced, rows/s and peak memory:
+tracemalloc peak for in-process benchmarks, max RSS of the child process
+for full builds. Results are written as JSON so runs can be compared
+between commits.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --scales small 1 large --output results.json
+    python -m benchmarks.run --compare benchmarks/results/<old>.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.rng_utils import get_rng, get_np_rng
+from src.utils.scale_utils import resolve_scale, get_scale_settings
+from src.utils import date_utils, string_utils, id_utils
+from src.generators.users import generate_users
+from src.generators.teams import generate_teams
+from src.generators.team_memberships import (
+    assign_team_members,
+    generate_team_memberships,
+    project_teams
+)
+from src.generators.projects import generate_projects
+from src.generators.sections import generate_sections
+from src.generators.tasks import iter_task_batches, iter_task_refs
+from src.generators.comments import generate_comment_columns
+from src.generators.custom_fields import (
+    generate_custom_field_definitions,
+    iter_custom_field_values
+)
+from src.generators.tags_attachments import (
+    generate_tags,
+    iter_task_tags,
+    iter_attachments
+)
+
+
+RESULTS_DIR = Path("benchmarks/results")
+DEFAULT_SCALES = ["small", "medium", "large"]
+HELPER_CALLS = 100_000  # Calls per scalar helper benchmark (batch helpers draw this many values)
+
+
+# -----------------------------------------------------------------------------
+# MEASUREMENT
+# -----------------------------------------------------------------------------
+
+def measure(name, scale, fn, track_memory=True):
+    """
+    Time fn() and optionally re-run it under tracemalloc for peak memory.
+
+    Args:
+        name: Benchmark name
+        scale: Scale factor the benchmark ran at (None for helpers)
+        fn: Callable returning the number of rows/values it produced
+        track_memory: Do the second, traced run
+
+    Returns:
+        dict: One result record
+    """
+    gc.collect()
+    start = time.perf_counter()
+    rows = fn()
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+    result = {
+        "name": name,
+        "scale": scale,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds else None,
+        "peak_mem_mb": peak_mb
+    }
+    _print_result(result)
+    return result
+
+
+def _print_result(result):
+    scale = "" if result["scale"] is None else f"x{result['scale']:g}"
+    rate = f"{result['rows_per_sec']:>14,.0f} rows/s" if result["rows_per_sec"] else ""
+    memory = f"{result['peak_mem_mb']:>9.1f} MB" if result["peak_mem_mb"] is not None else ""
+    print(
+        f"  {result['name']:<38} {scale:>7} {result['rows']:>11,} rows "
+        f"{result['seconds']:>9.3f} s {rate} {memory}"
+    )
+
+
+# -----------------------------------------------------------------------------
+# BENCHMARKS
+# -----------------------------------------------------------------------------
+
+def bench_generators(scale, track_memory=True):
+    """
+    Benchmark each generator stage at one scale, feeding each stage the
+    output of the stages before it, as main() does.
+    """
+    settings = get_scale_settings(scale)
+    workspace_id = "workspace-bench"
+    results = []
+
+    def run(name, fn):
+        results.append(measure(name, scale, fn, track_memory))
+
+    users = generate_users(workspace_id, settings["num_users"])
+    run("generators.users", lambda: len(generate_users(workspace_id, settings["num_users"])))
+
+    teams = generate_teams(workspace_id, settings["team_types"])
+    run("generators.teams", lambda: len(generate_teams(workspace_id, settings["team_types"])))
+
+    team_members = assign_team_members(users, teams)
+    run(
+        "generators.team_memberships",
+        lambda: len(generate_team_memberships(users, teams, assign_team_members(users, teams)))
+    )
+
+    projects = generate_projects(
+        workspace_id, teams, users, settings["projects_per_team"], team_members
+    )
+    run(
+        "generators.projects",
+        lambda: len(generate_projects(
+            workspace_id, teams, users, settings["projects_per_team"], team_members
+        ))
+    )
+
+    sections = generate_sections(projects)
+    run("generators.sections", lambda: len(generate_sections(projects)))
+
+    field_defs = generate_custom_field_definitions(projects)
+    run(
+        "generators.custom_field_definitions",
+        lambda: len(generate_custom_field_definitions(projects))
+    )
+
+    tags = generate_tags(workspace_id)
+    run("generators.tags", lambda: len(generate_tags(workspace_id)))
+
+    def task_batches():
+        return iter_task_batches(
+            projects,
+            sections,
+            teams,
+            users,
+            tasks_per_project=settings["tasks_per_project"],
+            team_members=team_members
+        )
+
+    run("generators.tasks", lambda: sum(len(b["task_id"]) for b in task_batches()))
+
+    task_refs = [ref for batch in task_batches() for ref in iter_task_refs(batch)]
+    teams_of_projects = project_teams(team_members, projects)
+
+    run(
+        "generators.comments",
+        lambda: sum(
+            len(generate_comment_columns(
+                batch, users, team_members=team_members, project_teams=teams_of_projects
+            )["comment_id"])
+            for batch in task_batches()
+        )
+    )
+    run(
+        "generators.custom_field_values",
+        lambda: sum(1 for _ in iter_custom_field_values(task_refs, field_defs))
+    )
+    run("generators.task_tags", lambda: sum(1 for _ in iter_task_tags(task_refs, tags)))
+    run("generators.attachments", lambda: sum(1 for _ in iter_attachments(task_refs, users)))
+
+    return results
+
+
+def bench_helpers(track_memory=True):
+    """
+    Benchmark the scalar and batch date helpers and the string/ID helpers.
+    """
+    n = HELPER_CALLS
+    rng = get_rng("benchmarks", "helpers")
+    np_rng = get_np_rng("benchmarks", "helpers")
+
+    created = [date_utils.generate_creation_date(rng=rng) for _ in range(n)]
+    due = [date_utils.generate_due_date(c, "sprint", rng) for c in created]
+    created_batch = date_utils.generate_creation_dates(n, rng=np_rng)
+    due_batch = date_utils.generate_due_dates(created_batch, "sprint", np_rng)
+
+    def calls(fn):
+        def run():
+            for _ in range(n):
+                fn()
+            return n
+        return run
+
+    def each(fn, values):
+        def run():
+            for value in values:
+                fn(value)
+            return len(values)
+        return run
+
+    benchmarks = [
+        ("date_utils.generate_creation_date", calls(lambda: date_utils.generate_creation_date(rng=rng))),
+        ("date_utils.generate_due_date", each(lambda c: date_utils.generate_due_date(c, "sprint", rng), created)),
+        (
+            "date_utils.generate_completion_date",
+            each(lambda pair: date_utils.generate_completion_date(*pair, rng), list(zip(created, due)))
+        ),
+        ("date_utils.avoid_weekend", each(date_utils.avoid_weekend, created)),
+        ("date_utils.align_to_sprint_boundary", each(date_utils.align_to_sprint_boundary, created)),
+        ("date_utils.generate_creation_dates", lambda: len(date_utils.generate_creation_dates(n, rng=np_rng))),
+        ("date_utils.generate_due_dates", lambda: len(date_utils.generate_due_dates(created_batch, "sprint", np_rng))),
+        (
+            "date_utils.generate_completion_dates",
+            lambda: len(date_utils.generate_completion_dates(created_batch, due_batch, np_rng))
+        ),
+        ("date_utils.avoid_weekends", lambda: len(date_utils.avoid_weekends(created_batch))),
+        ("date_utils.align_to_sprint_boundaries", lambda: len(date_utils.align_to_sprint_boundaries(created_batch))),
+        ("string_utils.generate_email", calls(lambda: string_utils.generate_email("Priya", "Iyer", "techflow.com", rng))),
+        ("string_utils.truncate_string", calls(lambda: string_utils.truncate_string("Implement login flow " * 12, 200))),
+        ("string_utils.clean_string", calls(lambda: string_utils.clean_string("  Fix   login \n button  "))),
+        ("string_utils.capitalize_title", calls(lambda: string_utils.capitalize_title("fix the login button on the main page"))),
+        ("id_utils.generate_id", calls(lambda: id_utils.generate_id("task", rng))),
+        ("id_utils.uuid_strings", lambda: len(id_utils.uuid_strings(n, np_rng))),
+    ]
+
+    return [measure(name, None, fn, track_memory) for name, fn in benchmarks]
+
+
+def bench_build(scale, workers=1):
+    """
+    Benchmark a full `python -m src.main` build in a child process.
+
+    Peak memory is the child's max RSS, read with os.wait4.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.sqlite"
+        cmd = [
+            sys.executable, "-m", "src.main",
+            "--scale", str(scale),
+            "--workers", str(workers),
+            "--db-path", str(db_path)
+        ]
+
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+        _, status, rusage = os.wait4(proc.pid, 0)
+        seconds = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+        if proc.returncode != 0:
+            raise RuntimeError(f"Build failed at scale {scale}: exit code {proc.returncode}")
+
+        rows = _count_rows(db_path)
+
+    result = {
+        "name": "main.build" if workers == 1 else f"main.build[workers={workers}]",
+        "scale": scale,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds,
+        "peak_mem_mb": rusage.ru_maxrss / 1024  # ru_maxrss is in KiB on Linux
+    }
+    _print_result(result)
+    return result
+
+
+def _count_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    rows = sum(conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in tables)
+    conn.close()
+    return rows
+
+
+# -----------------------------------------------------------------------------
+# RESULTS
+# -----------------------------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """
+    Print the speed change of each benchmark against a saved run.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    previous = {(r["name"], r["scale"]): r for r in baseline["results"]}
+
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('git_commit')}):")
+    for result in results:
+        before = previous.get((result["name"], result["scale"]))
+        if before is None or not before["seconds"]:
+            continue
+        speedup = before["seconds"] / result["seconds"] if result["seconds"] else float("inf")
+        scale = "" if result["scale"] is None else f"x{result['scale']:g}"
+        print(
+            f"  {result['name']:<38} {scale:>7} "
+            f"{before['seconds']:>9.3f} s -> {result['seconds']:>9.3f} s  ({speedup:.2f}x)"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the seed data generators.")
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        default=DEFAULT_SCALES,
+        help=f"Scale points: factors or profile names (default: {' '.join(DEFAULT_SCALES)})"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Also time full builds with this many workers")
+    parser.add_argument("--skip-build", action="store_true", help="Skip the full main() builds")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scales = [resolve_scale(s) for s in args.scales]
+    track_memory = not args.no_memory
+
+    results = []
+
+    print("Helpers:")
+    results.extend(bench_helpers(track_memory))
+
+    for scale in scales:
+        print(f"Generators at scale x{scale:g}:")
+        results.extend(bench_generators(scale, track_memory))
+
+    if not args.skip_build:
+        print("Full builds:")
+        for scale in scales:
+            results.append(bench_build(scale))
+            if args.workers > 1:
+                results.append(bench_build(scale, args.workers))
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "git_commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scales": scales
+        },
+        "results": results
+    }
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
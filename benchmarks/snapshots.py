@@ -0,0 +1,167 @@
+"""
+Episode reset latency for each snapshot method.
+
+For each method in snapshot_utils.SNAPSHOT_METHODS, runs a number of
+simulated episodes against a SnapshotPool: acquire a copy, apply a few
+writes (complete a task, add a comment), close it. Reports how long each
+reset waited for its copy (p50/p95/p99) and how long making one copy
+takes without the pool, the cost a reset would have without pre-warming.
+
+The "overlay" method runs the same episodes in one
+episode_utils.EpisodeSession and times session.reset(); its copy time is
+the time to open a session.
+
+Usage:
+    python -m benchmarks.snapshots
+    python -m benchmarks.snapshots --db-path output/x.sqlite --episodes 500
+    python -m benchmarks.snapshots --methods memory reflink --episode-ms 5
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.run import RESULTS_DIR, _git_commit
+from src.utils.snapshot_utils import SnapshotPool, SNAPSHOT_METHODS
+from src.utils.episode_utils import EpisodeSession
+from src.config import DATABASE_PATH, SNAPSHOT_POOL_SIZE
+
+
+METHODS = SNAPSHOT_METHODS + ("overlay",)
+
+
+def run_episode(conn, episode_seconds):
+    """
+    A stand-in agent episode: a few writes, then think time.
+    """
+    task_id = conn.execute("SELECT task_id FROM tasks WHERE completed = 0 LIMIT 1").fetchone()[0]
+    conn.execute("UPDATE tasks SET completed = 1 WHERE task_id = ?", (task_id,))
+    conn.execute(
+        """
+        INSERT INTO comments (comment_id, task_id, user_id, comment_text, created_at, is_edited)
+        SELECT 'episode-comment', task_id, assignee_id, 'Done.', created_at, 0
+        FROM tasks WHERE task_id = ? AND assignee_id IS NOT NULL
+        """,
+        (task_id,)
+    )
+    conn.commit()
+    time.sleep(episode_seconds)
+
+
+def bench_method(db_path, method, episodes, pool_size, episode_seconds):
+    """
+    Measure resets for one snapshot method.
+
+    Returns:
+        dict: Reset latency summary plus the unpooled copy time
+    """
+    with SnapshotPool(db_path, method=method, size=pool_size) as pool:
+        pool.wait_ready()
+
+        copy_times = []
+        for _ in range(min(episodes, 20)):
+            start = time.perf_counter()
+            pool.make_copy().close()
+            copy_times.append(time.perf_counter() - start)
+
+        for _ in range(episodes):
+            with pool.acquire() as episode:
+                run_episode(episode.conn, episode_seconds)
+
+        result = {"method": method, **pool.latency_summary()}
+    result["copy_ms"] = float(np.median(copy_times) * 1000)
+    return result
+
+
+def bench_overlay(db_path, episodes, episode_seconds):
+    """
+    Measure resets of a copy-on-write EpisodeSession.
+
+    Returns:
+        dict: Same fields as bench_method
+    """
+    open_times = []
+    for _ in range(min(episodes, 20)):
+        start = time.perf_counter()
+        EpisodeSession(db_path).close()
+        open_times.append(time.perf_counter() - start)
+
+    latencies = []
+    with EpisodeSession(db_path) as session:
+        for _ in range(episodes):
+            run_episode(session.conn, episode_seconds)
+            start = time.perf_counter()
+            session.reset()
+            latencies.append(time.perf_counter() - start)
+
+    latencies = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "method": "overlay",
+        "resets": len(latencies),
+        "mean_ms": float(latencies.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(latencies.max()),
+        "copy_ms": float(np.median(open_times) * 1000)
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure episode reset latency per snapshot method.")
+    parser.add_argument("--db-path", default=DATABASE_PATH, help=f"Base database, built if missing (default: {DATABASE_PATH})")
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=list(METHODS))
+    parser.add_argument("--episodes", type=int, default=200, help="Episodes per method (default: 200)")
+    parser.add_argument("--pool-size", type=int, default=SNAPSHOT_POOL_SIZE, help=f"Ready copies (default: {SNAPSHOT_POOL_SIZE})")
+    parser.add_argument("--episode-ms", type=float, default=20.0, help="Think time per episode (default: 20)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<time>-<commit>-snapshots.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+
+    print(f"Episode resets on {args.db_path} ({args.episodes} episodes, pool of {args.pool_size}):")
+    for method in args.methods:
+        if method == "overlay":
+            result = bench_overlay(args.db_path, args.episodes, args.episode_ms / 1000)
+        else:
+            result = bench_method(args.db_path, method, args.episodes, args.pool_size, args.episode_ms / 1000)
+        print(
+            f"  {method:<8} reset p50 {result['p50_ms']:>8.3f} ms  p95 {result['p95_ms']:>8.3f} ms  "
+            f"p99 {result['p99_ms']:>8.3f} ms   unpooled copy {result['copy_ms']:>8.2f} ms"
+        )
+        results.append(result)
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "git_commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "db_path": args.db_path,
+            "db_size_mb": os.path.getsize(args.db_path) / 2**20,
+            "episodes": args.episodes,
+            "pool_size": args.pool_size,
+            "episode_ms": args.episode_ms
+        },
+        "results": results
+    }
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}-snapshots.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Agent query workload for a generated database.
+
+Replays a catalog of agent-style read queries (my tasks due this week,
+tasks in a section, a subtask tree, comments on a task, ...) against a
+SQLite file with N concurrent reader processes, and reports p50/p95/p99
+latency and QPS per query. Use it to judge index and schema changes:
+build the database, run the workload, change something, and compare.
+
+Query parameters are drawn from ids that exist in the database, sampled
+once up front, so every reader runs realistic lookups. Each reader opens
+its own read-only connection.
+
+Usage:
+    python -m benchmarks.workload
+    python -m benchmarks.workload --db-path output/x.sqlite --readers 8 --duration 10
+    python -m benchmarks.workload --compare benchmarks/results/<old>-workload.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.run import RESULTS_DIR, _git_commit
+from src.config import DATABASE_PATH
+
+
+PARAMETER_SAMPLE_SIZE = 2000  # Ids kept per parameter pool
+
+
+# -----------------------------------------------------------------------------
+# QUERY CATALOG
+# -----------------------------------------------------------------------------
+
+# name: (SQL, function(pools, rng) -> parameters)
+QUERIES = {
+    "my_tasks_due_this_week": (
+        """
+        SELECT task_id, name, due_date, priority
+        FROM tasks
+        WHERE assignee_id = ? AND completed = 0 AND due_date >= ? AND due_date < ?
+        ORDER BY due_date
+        """,
+        lambda pools, rng: (rng.choice(pools["user_ids"]), pools["week_start"], pools["week_end"])
+    ),
+    "tasks_in_section": (
+        """
+        SELECT task_id, name, assignee_id, due_date, completed
+        FROM tasks
+        WHERE section_id = ? AND parent_task_id IS NULL
+        ORDER BY created_at
+        """,
+        lambda pools, rng: (rng.choice(pools["section_ids"]),)
+    ),
+    "project_board": (
+        """
+        SELECT s.name, s.display_order, COUNT(t.task_id), SUM(t.completed)
+        FROM sections s
+        LEFT JOIN tasks t ON t.section_id = s.section_id
+        WHERE s.project_id = ?
+        GROUP BY s.section_id
+        ORDER BY s.display_order
+        """,
+        lambda pools, rng: (rng.choice(pools["project_ids"]),)
+    ),
+    "subtask_tree": (
+        """
+        WITH RECURSIVE tree(task_id, depth) AS (
+            SELECT ?, 0
+            UNION ALL
+            SELECT t.task_id, tree.depth + 1
+            FROM tasks t JOIN tree ON t.parent_task_id = tree.task_id
+        )
+        SELECT t.task_id, t.name, t.completed, tree.depth
+        FROM tree JOIN tasks t ON t.task_id = tree.task_id
+        """,
+        lambda pools, rng: (rng.choice(pools["parent_task_ids"]),)
+    ),
+    "task_comments": (
+        """
+        SELECT c.comment_id, u.name, c.comment_text, c.created_at
+        FROM comments c JOIN users u ON u.user_id = c.user_id
+        WHERE c.task_id = ?
+        ORDER BY c.created_at
+        """,
+        lambda pools, rng: (rng.choice(pools["commented_task_ids"]),)
+    ),
+    "task_detail": (
+        """
+        SELECT t.*, p.name, s.name, u.name
+        FROM tasks t
+        JOIN projects p ON p.project_id = t.project_id
+        LEFT JOIN sections s ON s.section_id = t.section_id
+        LEFT JOIN users u ON u.user_id = t.assignee_id
+        WHERE t.task_id = ?
+        """,
+        lambda pools, rng: (rng.choice(pools["task_ids"]),)
+    ),
+    "tasks_by_tag": (
+        """
+        SELECT t.task_id, t.name, t.due_date
+        FROM task_tags tt JOIN tasks t ON t.task_id = tt.task_id
+        WHERE tt.tag_id = ? AND t.completed = 0
+        ORDER BY t.due_date
+        LIMIT 50
+        """,
+        lambda pools, rng: (rng.choice(pools["tag_ids"]),)
+    ),
+    "tasks_by_custom_field": (
+        """
+        SELECT t.task_id, t.name, t.assignee_id
+        FROM custom_field_values v JOIN tasks t ON t.task_id = v.task_id
+        WHERE v.field_id = ? AND v.value = ?
+        LIMIT 50
+        """,
+        lambda pools, rng: tuple(rng.choice(pools["field_values"]))
+    ),
+    "team_open_work": (
+        """
+        SELECT t.assignee_id, COUNT(*)
+        FROM projects p JOIN tasks t ON t.project_id = p.project_id
+        WHERE p.team_id = ? AND t.completed = 0
+        GROUP BY t.assignee_id
+        """,
+        lambda pools, rng: (rng.choice(pools["team_ids"]),)
+    )
+}
+
+
+def sample_parameters(db_path, sample_size=PARAMETER_SAMPLE_SIZE, seed=0):
+    """
+    Sample the ids the catalog's parameters are drawn from.
+
+    "This week" starts at the latest task creation time, i.e. the
+    simulation's current date.
+
+    Returns:
+        dict: {pool_name: list of ids (or (field_id, value) pairs), ...}
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+    def sample(sql):
+        rows = [r if len(r) > 1 else r[0] for r in conn.execute(sql)]
+        random.Random(seed).shuffle(rows)
+        return rows[:sample_size]
+
+    now = conn.execute("SELECT MAX(created_at) FROM tasks").fetchone()[0]
+    week_start = datetime.fromisoformat(now).replace(hour=0, minute=0, second=0)
+
+    pools = {
+        "user_ids": sample("SELECT DISTINCT assignee_id FROM tasks WHERE assignee_id IS NOT NULL"),
+        "team_ids": sample("SELECT team_id FROM teams"),
+        "project_ids": sample("SELECT project_id FROM projects"),
+        "section_ids": sample("SELECT section_id FROM sections"),
+        "task_ids": sample("SELECT task_id FROM tasks"),
+        "parent_task_ids": sample("SELECT DISTINCT parent_task_id FROM tasks WHERE parent_task_id IS NOT NULL"),
+        "commented_task_ids": sample("SELECT DISTINCT task_id FROM comments"),
+        "tag_ids": sample("SELECT DISTINCT tag_id FROM task_tags"),
+        "field_values": sample("SELECT DISTINCT field_id, value FROM custom_field_values"),
+        "week_start": week_start.isoformat(sep=" "),
+        "week_end": (week_start + timedelta(days=7)).isoformat(sep=" ")
+    }
+    conn.close()
+
+    empty = [name for name, values in pools.items() if isinstance(values, list) and not values]
+    if empty:
+        raise ValueError(f"No rows to sample parameters from for: {', '.join(empty)}")
+    return pools
+
+
+# -----------------------------------------------------------------------------
+# READERS
+# -----------------------------------------------------------------------------
+
+def run_reader(db_path, pools, query_name, duration, seed):
+    """
+    Run one query repeatedly on one connection until duration elapses.
+
+    Returns:
+        list: Latency of each execution in seconds
+    """
+    rng = random.Random(seed)
+    sql, parameters = QUERIES[query_name]
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    latencies = []
+
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        args = parameters(pools, rng)
+
+        start = time.perf_counter()
+        conn.execute(sql, args).fetchall()
+        latencies.append(time.perf_counter() - start)
+
+    conn.close()
+    return latencies
+
+
+def run_workload(db_path, readers=4, duration=5.0, query_names=None, seed=0):
+    """
+    Replay the catalog with concurrent readers.
+
+    Each query gets its own phase in which all readers run only that
+    query for `duration` seconds, so its QPS is measured under the full
+    reader concurrency.
+
+    Args:
+        db_path: SQLite file to query
+        readers: Reader processes, each with its own connection
+        duration: Seconds per query phase
+        query_names: Subset of QUERIES (default: all)
+        seed: Seed for parameter sampling and each reader's choices
+
+    Returns:
+        list: One result record per query
+    """
+    query_names = list(query_names or QUERIES)
+    pools = sample_parameters(db_path, seed=seed)
+    results = []
+
+    with ProcessPoolExecutor(max_workers=readers) as executor:
+        for name in query_names:
+            start = time.perf_counter()
+            futures = [
+                executor.submit(run_reader, db_path, pools, name, duration, seed + i + 1)
+                for i in range(readers)
+            ]
+            latencies = np.array([t for future in futures for t in future.result()])
+            wall = time.perf_counter() - start
+
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+            result = {
+                "name": name,
+                "queries": int(latencies.size),
+                "qps": latencies.size / wall,
+                "mean_ms": float(latencies.mean() * 1000),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99)
+            }
+            _print_result(result)
+            results.append(result)
+
+    return results
+
+
+def _print_result(result):
+    print(
+        f"  {result['name']:<26} {result['queries']:>9,} q {result['qps']:>10,.0f} qps "
+        f"p50 {result['p50_ms']:>8.3f} ms  p95 {result['p95_ms']:>8.3f} ms  "
+        f"p99 {result['p99_ms']:>8.3f} ms"
+    )
+
+
+# -----------------------------------------------------------------------------
+# RESULTS
+# -----------------------------------------------------------------------------
+
+def compare(results, baseline_path):
+    """
+    Print the p50/p99 change of each query against a saved run.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    previous = {r["name"]: r for r in baseline["results"]}
+
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('git_commit')}):")
+    for result in results:
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        print(
+            f"  {result['name']:<26} "
+            f"p50 {before['p50_ms']:>8.3f} -> {result['p50_ms']:>8.3f} ms  "
+            f"p99 {before['p99_ms']:>8.3f} -> {result['p99_ms']:>8.3f} ms  "
+            f"qps {before['qps']:>9,.0f} -> {result['qps']:>9,.0f}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay agent-style queries against a generated database.")
+    parser.add_argument("--db-path", default=DATABASE_PATH, help=f"Database to query (default: {DATABASE_PATH})")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader processes (default: 4)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per query phase (default: 5)")
+    parser.add_argument("--queries", nargs="+", choices=list(QUERIES), help="Subset of the catalog to run")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for query parameters (default: 0)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<time>-<commit>-workload.json)")
+    parser.add_argument("--compare", help="Earlier workload result file to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not Path(args.db_path).exists():
+        raise SystemExit(f"{args.db_path} not found; build it first with python -m src.main")
+
+    print(f"Workload on {args.db_path} ({args.readers} readers, {args.duration:g} s per query):")
+    results = run_workload(args.db_path, args.readers, args.duration, args.queries, args.seed)
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "git_commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "db_path": args.db_path,
+            "db_size_mb": os.path.getsize(args.db_path) / 2**20,
+            "readers": args.readers,
+            "duration": args.duration,
+            "seed": args.seed
+        },
+        "results": results
+    }
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}-workload.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
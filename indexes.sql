@@ -0,0 +1,20 @@
+-- Secondary indexes, created by the finalize stage after the bulk load.
+-- Foreign keys used for joins, plus the lookups agents run most often.
+CREATE INDEX IF NOT EXISTS idx_teams_workspace ON teams(workspace_id);
+CREATE INDEX IF NOT EXISTS idx_users_workspace ON users(workspace_id);
+CREATE INDEX IF NOT EXISTS idx_team_memberships_user ON team_memberships(user_id);
+CREATE INDEX IF NOT EXISTS idx_projects_team ON projects(team_id);
+CREATE INDEX IF NOT EXISTS idx_projects_owner ON projects(owner_id);
+CREATE INDEX IF NOT EXISTS idx_sections_project ON sections(project_id, display_order);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_section ON tasks(project_id, section_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_section ON tasks(section_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee_due ON tasks(assignee_id, completed, due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_parent ON tasks(parent_task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_by ON tasks(created_by);
+CREATE INDEX IF NOT EXISTS idx_comments_task ON comments(task_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_comments_user ON comments(user_id);
+CREATE INDEX IF NOT EXISTS idx_custom_field_definitions_project ON custom_field_definitions(project_id);
+CREATE INDEX IF NOT EXISTS idx_custom_field_values_task ON custom_field_values(task_id);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag_id);
+CREATE INDEX IF NOT EXISTS idx_attachments_task ON attachments(task_id);
+CREATE INDEX IF NOT EXISTS idx_attachments_uploaded_by ON attachments(uploaded_by);
@@ -0,0 +1,383 @@
+"""
+Incremental "advance the clock" mode (python -m src.main --append-days N).
+
+Opens an existing database and simulates N more days of activity after
+its latest timestamp instead of rebuilding the workspace:
+
+- open tasks are completed at APPEND_DAILY_COMPLETION_RATE per day
+- a sample of the open tasks (APPEND_DAILY_ACTIVITY_RATE per day) gets
+  new comments and attachments
+- every project gets new tasks (with subtasks, custom field values, tags,
+  comments and attachments) at the build's rate per day of timeline
+
+Users, teams, projects, sections, custom fields and tags are read back
+from the database and reused. Every new timestamp falls inside the window
+and never before the task it belongs to. Window rows draw from their own
+random streams, keyed by the window start, so UUIDs never repeat the
+existing ones; GID counters continue after the highest GID in use.
+"""
+
+import math
+import sqlite3
+from datetime import datetime, timedelta
+import numpy as np
+from src.utils.db_utils import fetch_rows
+from src.utils.id_utils import detect_id_format, set_id_format, advance_gid_counter
+from src.utils.rng_utils import get_np_rng
+from src.utils.date_utils import random_datetimes_between, to_datetimes
+from src.generators.tasks import iter_task_batches, iter_task_refs
+from src.generators.comments import generate_comment_columns, task_columns
+from src.generators.team_memberships import team_members_from_rows, project_teams
+from src.generators.custom_fields import iter_custom_field_values
+from src.generators.tags_attachments import iter_task_tags, iter_attachments
+from src.config import (
+    CURRENT_DATE,
+    WORKSPACE_START_DATE,
+    TASKS_PER_PROJECT_MIN,
+    TASKS_PER_PROJECT_MAX,
+    APPEND_DAILY_COMPLETION_RATE,
+    APPEND_DAILY_ACTIVITY_RATE
+)
+
+
+# Tables that receive new rows: {table: (id column, ID kind)}
+APPENDED_IDS = {
+    "tasks": ("task_id", "task"),
+    "comments": ("comment_id", "comment"),
+    "custom_field_values": ("value_id", "custom_field_value"),
+    "task_tags": ("task_tag_id", "task_tag"),
+    "attachments": ("attachment_id", "attachment")
+}
+
+# Columns complete_open_tasks updates
+COMPLETION_COLUMNS = ("completed", "completed_at", "modified_at", "actual_hours")
+
+# Timestamps whose maximum is the database's "now"
+ACTIVITY_COLUMNS = (
+    ("tasks", "created_at"),
+    ("tasks", "completed_at"),
+    ("comments", "created_at"),
+    ("task_tags", "created_at"),
+    ("attachments", "uploaded_at")
+)
+
+
+def as_datetime(value):
+    """
+    Convert a stored timestamp to a datetime (SQLite returns text,
+    DuckDB returns datetime).
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+# -----------------------------------------------------------------------------
+# READING THE EXISTING WORKSPACE
+# -----------------------------------------------------------------------------
+
+def load_workspace(conn):
+    """
+    Read back the entities new activity is generated for, in the fields
+    the generators use.
+
+    Returns:
+        dict: users, teams, projects (active only), sections, field_defs
+            and tags as lists of row dicts, team_members (see
+            team_memberships.build_team_members) and project_teams
+            ({project_id: team index}, every project)
+    """
+    users = fetch_rows(conn, "SELECT user_id FROM users ORDER BY user_id")
+    teams = fetch_rows(conn, "SELECT team_id, team_type FROM teams ORDER BY team_id")
+    memberships = fetch_rows(conn, "SELECT team_id, user_id FROM team_memberships")
+    team_members = team_members_from_rows(users, teams, memberships)
+    return {
+        "users": users,
+        "teams": teams,
+        "team_members": team_members,
+        "project_teams": project_teams(
+            team_members,
+            fetch_rows(conn, "SELECT project_id, team_id FROM projects")
+        ),
+        "projects": fetch_rows(
+            conn,
+            """
+            SELECT project_id, team_id, project_type FROM projects
+            WHERE status = 'active' AND project_id IN (SELECT project_id FROM sections)
+            ORDER BY project_id
+            """
+        ),
+        "sections": fetch_rows(
+            conn,
+            "SELECT section_id, project_id, display_order FROM sections ORDER BY section_id"
+        ),
+        "field_defs": fetch_rows(
+            conn,
+            """
+            SELECT field_id, project_id, field_type, enum_options
+            FROM custom_field_definitions ORDER BY field_id
+            """
+        ),
+        "tags": fetch_rows(conn, "SELECT tag_id FROM tags ORDER BY tag_id")
+    }
+
+
+def load_open_tasks(conn):
+    """
+    Return the tasks and subtasks that are still open.
+
+    Returns:
+        list: {"task_id", "project_id", "parent_task_id", "created_at"}
+            per open task
+    """
+    tasks = fetch_rows(
+        conn,
+        """
+        SELECT task_id, project_id, parent_task_id, created_at FROM tasks
+        WHERE completed = 0 ORDER BY task_id
+        """
+    )
+    for task in tasks:
+        task["created_at"] = as_datetime(task["created_at"])
+    return tasks
+
+
+def activity_window(conn, days):
+    """
+    The window to simulate: from the latest timestamp in the database to
+    `days` days after it.
+
+    Returns:
+        tuple: (start, end) datetimes
+    """
+    latest = [
+        as_datetime(conn.execute(f"SELECT MAX({column}) FROM {table}").fetchone()[0])
+        for table, column in ACTIVITY_COLUMNS
+    ]
+    start = max(value for value in latest if value is not None)
+    return start, start + timedelta(days=days)
+
+
+def continue_ids(conn):
+    """
+    Switch to the database's ID format and, for GIDs, move the counters
+    past the GIDs already in use.
+
+    Returns:
+        str: The detected ID format
+    """
+    sample = conn.execute("SELECT task_id FROM tasks LIMIT 1").fetchone()
+    if sample is None:
+        raise ValueError("The database has no tasks to continue from")
+
+    id_format = detect_id_format(sample[0])
+    set_id_format(id_format)
+
+    if id_format == "gid":
+        for table, (column, kind) in APPENDED_IDS.items():
+            last = conn.execute(f"SELECT MAX(CAST({column} AS BIGINT)) FROM {table}").fetchone()[0]
+            advance_gid_counter(kind, last)
+
+    return id_format
+
+
+def window_tasks_per_project(days, tasks_per_project=(TASKS_PER_PROJECT_MIN, TASKS_PER_PROJECT_MAX)):
+    """
+    Scale the build's tasks per project (spread over the whole timeline)
+    down to a window of `days` days.
+
+    Returns:
+        tuple: (min, max) new top-level tasks per project
+    """
+    timeline_days = (CURRENT_DATE - WORKSPACE_START_DATE).days
+    low, high = tasks_per_project
+    return math.floor(low * days / timeline_days), math.ceil(high * days / timeline_days)
+
+
+# -----------------------------------------------------------------------------
+# ACTIVITY ON EXISTING TASKS
+# -----------------------------------------------------------------------------
+
+def _window_probability(daily_rate, days):
+    return 1 - (1 - daily_rate) ** days
+
+
+def complete_open_tasks(conn, open_tasks, window, days):
+    """
+    Complete a share of the open top-level tasks inside the window; their
+    open subtasks are completed with them, as in a full build.
+
+    Args:
+        conn: Database connection
+        open_tasks: Result of load_open_tasks
+        window: (start, end) datetimes
+        days: Window length in days
+
+    Returns:
+        dict: {task_id: completed_at} of the task rows completed
+    """
+    rng = get_np_rng("append_completions", window[0].isoformat())
+
+    top_level = [t["task_id"] for t in open_tasks if t["parent_task_id"] is None]
+    done = rng.random(len(top_level)) < _window_probability(APPEND_DAILY_COMPLETION_RATE, days)
+    done_ids = [task_id for task_id, is_done in zip(top_level, done) if is_done]
+    completed_at = dict(zip(
+        done_ids,
+        to_datetimes(random_datetimes_between(window[0], window[1], len(done_ids), rng))
+    ))
+
+    is_subtask = np.array([t["parent_task_id"] is not None for t in open_tasks], dtype=bool)
+    actual_hours = np.round(np.where(
+        is_subtask,
+        rng.uniform(0.5, 10, len(open_tasks)),
+        rng.uniform(1, 20, len(open_tasks))
+    ), 1).tolist()
+
+    updates = []
+    for task, hours in zip(open_tasks, actual_hours):
+        at = completed_at.get(task["parent_task_id"] or task["task_id"])
+        if at is not None:
+            updates.append((at, at, hours, task["task_id"]))
+    completed = {task_id: at for at, _, _, task_id in updates}
+
+    if updates:
+        if not isinstance(conn, sqlite3.Connection):
+            from src.utils.duckdb_utils import drop_indexes_covering
+            drop_indexes_covering(conn, "tasks", COMPLETION_COLUMNS)
+        conn.executemany(
+            """
+            UPDATE tasks SET completed = 1, completed_at = ?, modified_at = ?, actual_hours = ?
+            WHERE task_id = ?
+            """,
+            updates
+        )
+    return completed
+
+
+def sample_active_tasks(open_tasks, window, days, completed=None):
+    """
+    Pick the open tasks that see new comments and attachments in the window.
+
+    Args:
+        open_tasks: Result of load_open_tasks
+        window: (start, end) datetimes
+        days: Window length in days
+        completed: Result of complete_open_tasks, so threads on tasks
+            completed in the window end there
+
+    Returns:
+        list: {"task_id", "project_id", "created_at", "completed_at"} per
+            picked task
+    """
+    completed = completed or {}
+    rng = get_np_rng("append_activity", window[0].isoformat())
+    active = rng.random(len(open_tasks)) < _window_probability(APPEND_DAILY_ACTIVITY_RATE, days)
+    return [
+        {
+            "task_id": task["task_id"],
+            "project_id": task["project_id"],
+            "created_at": task["created_at"],
+            "completed_at": completed.get(task["task_id"])
+        }
+        for task, is_active in zip(open_tasks, active)
+        if is_active
+    ]
+
+
+# -----------------------------------------------------------------------------
+# PIPELINE
+# -----------------------------------------------------------------------------
+
+def append_activity(
+    conn,
+    writer,
+    run,
+    days,
+    text_pools,
+    workers=1,
+    tasks_per_project=(TASKS_PER_PROJECT_MIN, TASKS_PER_PROJECT_MAX)
+):
+    """
+    Simulate `days` more days of activity in an existing database.
+
+    Args:
+        conn: Connection to the existing database
+        writer: Bulk writer for the connection (see db_utils.create_writer)
+        run: RunReport the stages are recorded in
+        days: Days to advance the clock by
+        text_pools: {pool_name: TextPool} (see text_corpus.load_text_pools)
+        workers: Processes used to generate new tasks
+        tasks_per_project: The build's (min, max) tasks per project over
+            the whole timeline
+
+    Returns:
+        dict: Window bounds, ID format and counts of updated rows
+    """
+    id_format = continue_ids(conn)
+    window = activity_window(conn, days)
+    workspace = load_workspace(conn)
+    users = workspace["users"]
+    open_tasks = load_open_tasks(conn)
+    print(f"Advancing {days} days: {window[0]} to {window[1]}")
+
+    print("Completing open tasks...")
+    with run.stage("completions"):
+        completed = complete_open_tasks(conn, open_tasks, window, days)
+
+    print("Generating comments and attachments on open tasks...")
+    with run.stage("open_task_activity"):
+        active = sample_active_tasks(open_tasks, window, days, completed)
+        writer.write_columns("comments", generate_comment_columns(
+            task_columns(active),
+            users,
+            text_pools["comments"],
+            window,
+            workspace["team_members"],
+            workspace["project_teams"]
+        ))
+        writer.write("attachments", iter_attachments(active, users, window))
+
+    print("Generating new tasks, comments, custom field values, task tags and attachments...")
+    with run.stage("new_tasks_and_activity"):
+        task_batches = iter_task_batches(
+            workspace["projects"],
+            workspace["sections"],
+            workspace["teams"],
+            users,
+            workers=workers,
+            tasks_per_project=window_tasks_per_project(days, tasks_per_project),
+            name_pool=text_pools["task_names"],
+            window=window,
+            team_members=workspace["team_members"]
+        )
+
+        for batch in task_batches:
+            writer.write_columns("tasks", batch)
+            writer.write_columns("comments", generate_comment_columns(
+                batch,
+                users,
+                text_pools["comments"],
+                window,
+                workspace["team_members"],
+                workspace["project_teams"]
+            ))
+            writer.write(
+                "custom_field_values",
+                iter_custom_field_values(iter_task_refs(batch), workspace["field_defs"])
+            )
+            writer.write(
+                "task_tags",
+                iter_task_tags(iter_task_refs(batch, with_dates=True), workspace["tags"], window)
+            )
+            writer.write(
+                "attachments",
+                iter_attachments(iter_task_refs(batch, with_dates=True), users, window)
+            )
+
+    return {
+        "window_start": window[0].isoformat(sep=" "),
+        "window_end": window[1].isoformat(sep=" "),
+        "id_format": id_format,
+        "completed_tasks": len(completed),
+        "active_open_tasks": len(active)
+    }
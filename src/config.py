@@ -15,6 +15,56 @@ load_dotenv()
 # ============================================================================
 
 DATABASE_PATH = "output/asana_simulation.sqlite"
+# Storage backend: "sqlite", or "duckdb" for fast analytics (requires duckdb
+# and pyarrow). See src/utils/db_utils.py.
+DATABASE_BACKEND = os.getenv("DATABASE_BACKEND", "sqlite")
+TEXT_POOL_DIR = "output/text_pools"  # Compiled string pools (see text_corpus.py)
+SCHEMA_PATH = "schema.sql"
+INDEXES_PATH = "indexes.sql"  # Secondary indexes, built after the load
+UNIQUE_INDEXES_PATH = "unique_indexes.sql"  # Deferred UNIQUE constraints (--defer-unique)
+
+# Parquet export (--parquet-dir, requires pyarrow)
+PARQUET_ROW_GROUP_SIZE = 100_000
+PARQUET_COMPRESSION = "zstd"
+# Enum-like columns stored dictionary-encoded
+PARQUET_DICTIONARY_COLUMNS = {
+    'workspaces': ['workspace_type'],
+    'users': ['role'],
+    'teams': ['team_type'],
+    'projects': ['project_type', 'status', 'privacy', 'color'],
+    'tasks': ['priority'],
+    'custom_field_definitions': ['field_type'],
+    'tags': ['color'],
+    'attachments': ['file_type']
+}
+
+# DuckDB backend: rows buffered (per table) before an Arrow bulk insert
+DUCKDB_FLUSH_ROWS = 200_000
+
+# Tables whose UNIQUE constraint --defer-unique moves to unique_indexes.sql
+DEFERRED_UNIQUE_TABLES = ("custom_field_values", "task_tags")
+
+# Primary key format: "uuid", "compact" (dashless hex) or "gid" (Asana-style
+# numeric IDs). See src/utils/id_utils.py.
+ID_FORMAT = os.getenv("ID_FORMAT", "uuid")
+
+# Episode snapshots (see src/utils/snapshot_utils.py): how each episode gets
+# its copy of the database ("memory", "backup" or "reflink"), how many
+# ready copies are kept warm, and where file copies live
+SNAPSHOT_METHOD = os.getenv("SNAPSHOT_METHOD", "memory")
+SNAPSHOT_POOL_SIZE = 4
+SNAPSHOT_DIR = "output/snapshots"
+
+# Bulk load settings
+BULK_INSERT_BATCH_SIZE = 5000  # Rows per executemany() call
+
+# PRAGMAs applied for the duration of the load and restored afterwards
+LOAD_PRAGMAS = {
+    'journal_mode': 'MEMORY',  # Keep the rollback journal off disk
+    'synchronous': 'OFF',      # No fsync per transaction
+    'cache_size': -262144,     # Negative = KiB, i.e. 256 MB page cache
+    'temp_store': 'MEMORY'
+}
 
 # ============================================================================
 # COMPANY SCALE CONFIGURATION
@@ -25,6 +75,18 @@ DATABASE_PATH = "output/asana_simulation.sqlite"
 COMPANY_NAME = "TechFlow Solutions"
 COMPANY_DOMAIN = "techflow.com"
 
+# Multi-workspace runs (--workspaces N) name each company prefix + suffix
+COMPANY_NAME_PREFIXES = [
+    "Acme", "Northwind", "Bluepeak", "Brightline", "Cobalt", "Evergreen",
+    "Ironclad", "Lumen", "Meridian", "Nimbus", "Orbit", "Pinecrest",
+    "Quantum", "Redwood", "Silverline", "Summit", "Tidewater", "Vertex",
+    "Willow", "Zenith"
+]
+COMPANY_NAME_SUFFIXES = [
+    "Labs", "Systems", "Analytics", "Software", "Health", "Logistics",
+    "Robotics", "Media", "Networks", "Financial"
+]
+
 # Teams - based on research: typical engineering team size is 7 members
 # For a 5000-10000 person company, estimate ~15-20 teams using Asana
 NUM_TEAMS = 15
@@ -41,32 +103,69 @@ TEAM_TYPES = {
 NUM_USERS = 150
 USERS_PER_TEAM_MIN = 5
 USERS_PER_TEAM_MAX = 12
+# Everyone is in at least one team; this share of users is in more, up to
+# MAX_TEAMS_PER_USER teams in total (see team_memberships.py)
+MULTI_TEAM_USER_PERCENTAGE = 0.15
+MAX_TEAMS_PER_USER = 3
 ADMIN_PERCENTAGE = 0.05  # 5% admins
 GUEST_PERCENTAGE = 0.05  # 5% guests
+# Name corpora for users: text files with one name per line, compiled into
+# the person_names text pool (unset: the built-in lists in users.py)
+FIRST_NAMES_PATH = os.getenv("FIRST_NAMES_PATH")
+LAST_NAMES_PATH = os.getenv("LAST_NAMES_PATH")
 
 # Projects
 NUM_PROJECTS = 120
 PROJECTS_PER_TEAM_MIN = 5
 PROJECTS_PER_TEAM_MAX = 10
 
+# Named workspace sizes for --scale. The values above are the "medium"
+# workspace; other sizes multiply users and teams (and with them projects
+# and tasks) while keeping every ratio. See src/utils/scale_utils.py.
+SCALE_PROFILES = {
+    'small': 0.1,
+    'medium': 1.0,
+    'large': 10.0,
+    'xl': 100.0
+}
+
 # Tasks
 TASKS_PER_PROJECT_MIN = 15
 TASKS_PER_PROJECT_MAX = 40
 SUBTASK_PROBABILITY = 0.30  # 30% of tasks have subtasks
 SUBTASKS_PER_TASK_MIN = 2
 SUBTASKS_PER_TASK_MAX = 5
+# Projects generated together as one columnar batch. This is the unit of
+# work for --workers and bounds how many tasks are held in memory at once.
+TASK_SHARD_SIZE = 64
 
 # ============================================================================
 # DATE CONFIGURATION
 # ============================================================================
 
+# Master seed for all random streams (see src/utils/rng_utils.py)
+RANDOM_SEED = int(os.getenv("RANDOM_SEED", "42"))
+
 # Workspace history - simulating 6 months of activity
-WORKSPACE_START_DATE = datetime.now() - timedelta(days=180)  # 6 months ago
-CURRENT_DATE = datetime.now()
+# The timeline is anchored to midnight today so every process of a run,
+# and every run on the same day, shares it. Set SIMULATION_DATE
+# (YYYY-MM-DD) to pin it for fully reproducible datasets. Nothing is
+# created after it: date ranges ending at CURRENT_DATE exclude its day.
+CURRENT_DATE = (
+    datetime.fromisoformat(os.getenv("SIMULATION_DATE"))
+    if os.getenv("SIMULATION_DATE")
+    else datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+)
+WORKSPACE_START_DATE = CURRENT_DATE - timedelta(days=180)  # 6 months ago
 
 # Sprint configuration (from research: 2-week sprints are standard)
 SPRINT_DURATION_DAYS = 14
 
+# Append mode (--append-days): per simulated day, the chance that an open
+# task gets completed and the chance that it gets new comments/attachments
+APPEND_DAILY_COMPLETION_RATE = 0.03
+APPEND_DAILY_ACTIVITY_RATE = 0.05
+
 # ============================================================================
 # TASK DISTRIBUTION PATTERNS
 # ============================================================================
@@ -200,6 +299,8 @@ DESCRIPTION_PATTERNS = {
 COMMENTS_PER_TASK_MIN = 0
 COMMENTS_PER_TASK_MAX = 8
 ACTIVE_TASK_COMMENT_PROBABILITY = 0.60  # 60% of active tasks have comments
+COMMENT_EDIT_PROBABILITY = 0.10  # Comments edited after posting
+COMMENT_EDIT_DELAY_MINUTES = 90  # Mean time to the edit
 
 # Attachment patterns
 ATTACHMENT_PROBABILITY = 0.25  # 25% of tasks have attachments
@@ -244,6 +345,27 @@ LLM_MODEL = "claude-sonnet-4-20250514"
 LLM_MAX_TOKENS = 1000
 LLM_TEMPERATURE = 0.8  # Higher temperature for more variety
 
+# Concurrent (batch) LLM requests
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))  # Requests in flight
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "50"))  # Token bucket refill rate
+LLM_MAX_RETRIES = 5
+LLM_BACKOFF_BASE = 1.0  # Seconds; doubles per attempt, with full jitter
+LLM_BACKOFF_MAX = 30.0
+
+# Batched generation: items requested per JSON-mode call, sized to fit LLM_MAX_TOKENS
+LLM_BATCH_ITEMS = {
+    'task_name': 25,
+    'task_description': 8,
+    'comment': 15
+}
+LLM_BATCH_MAX_ROUNDS = 3  # Requests made for items missing from a response
+
+# Persistent LLM response cache (SQLite), shared across runs
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "output/llm_cache.sqlite")
+LLM_CACHE_MAX_ENTRIES = 200_000  # Least recently used entries evicted beyond this
+LLM_CACHE_MAX_AGE_DAYS = 90  # Entries older than this are evicted
+
 # ============================================================================
 # FILE TYPE DISTRIBUTIONS
 # ============================================================================
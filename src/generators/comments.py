@@ -1,10 +1,28 @@
 """
 Comment (story) data generator.
+
+Comment threads are generated for a whole batch of tasks at once:
+ACTIVE_TASK_COMMENT_PROBABILITY of the tasks get a thread of
+COMMENTS_PER_TASK_MIN..MAX comments (at least one), dated inside the
+task's lifetime, from created_at to completed_at or CURRENT_DATE,
+whichever comes first, in order (tasks with no such time get none).
+COMMENT_EDIT_PROBABILITY of the comments are edited a while after they
+were posted, within the same lifetime. Commenters are members of the
+task's team (see team_memberships.py).
 """
 
-import random
-from src.utils.string_utils import generate_uuid
-from src.utils.date_utils import generate_creation_date
+import numpy as np
+from src.utils.id_utils import generate_ids
+from src.utils.rng_utils import get_np_rng
+from src.generators.team_memberships import sample_team_members
+from src.config import (
+    CURRENT_DATE,
+    COMMENTS_PER_TASK_MIN,
+    COMMENTS_PER_TASK_MAX,
+    ACTIVE_TASK_COMMENT_PROBABILITY,
+    COMMENT_EDIT_PROBABILITY,
+    COMMENT_EDIT_DELAY_MINUTES
+)
 
 
 COMMENT_TEMPLATES = [
@@ -18,28 +36,149 @@ COMMENT_TEMPLATES = [
     "Assigning this to the appropriate owner."
 ]
 
+COMMENT_COLUMNS = (
+    "comment_id", "task_id", "user_id", "comment_text", "created_at", "edited_at", "is_edited"
+)
+
+
+def generate_comments(tasks, users, text_pool=None, window=None, team_members=None, project_teams=None):
+    """
+    Generate comments for a batch of tasks as row dicts.
+    """
+    return list(iter_comments(tasks, users, text_pool, window, team_members, project_teams))
+
+
+def iter_comments(tasks, users, text_pool=None, window=None, team_members=None, project_teams=None):
+    """
+    Stream comments for a batch of tasks as row dicts.
+
+    Convenience wrapper over generate_comment_columns for callers that
+    want dicts; tasks may also be a list of task dicts here.
+    """
+    if not isinstance(tasks, dict):
+        tasks = task_columns(tasks)
+
+    columns = generate_comment_columns(tasks, users, text_pool, window, team_members, project_teams)
+    values = [
+        columns[c].tolist() if hasattr(columns[c], "tolist") else columns[c]
+        for c in COMMENT_COLUMNS
+    ]
+    for row in zip(*values):
+        yield dict(zip(COMMENT_COLUMNS, row))
 
-def generate_comments(tasks, users):
+
+def task_columns(tasks):
+    """
+    Turn task dicts into the columns generate_comment_columns reads;
+    missing created_at / completed_at are left open (NaT).
     """
-    Generate comments for a subset of tasks.
+    tasks = list(tasks)
+    return {
+        "task_id": np.array([t["task_id"] for t in tasks], dtype=object),
+        "project_id": np.array([t["project_id"] for t in tasks], dtype=object),
+        "created_at": np.array([t.get("created_at") for t in tasks], dtype="datetime64[s]"),
+        "completed_at": np.array([t.get("completed_at") for t in tasks], dtype="datetime64[s]")
+    }
+
+
+def generate_comment_columns(
+    tasks,
+    users,
+    text_pool=None,
+    window=None,
+    team_members=None,
+    project_teams=None
+):
     """
+    Generate the comment threads of a batch of tasks as columns.
+
+    Args:
+        tasks: {"task_id", "project_id", "created_at", "completed_at"}
+            columns, e.g. a task batch from iter_task_batches; NaT
+            created_at means unknown, NaT completed_at still open
+        users: User dicts, commenters when there are no team members
+        text_pool: TextPool of comment text (default: COMMENT_TEMPLATES)
+        window: (start, end) datetimes: date comments inside the window
+            instead of the whole lifetime, from a stream of their own (see
+            append.py)
+        team_members: Team members (see team_memberships.build_team_members)
+        project_teams: {project_id: team index} for team_members
+
+    Returns:
+        dict: {column_name: ndarray} for the comments table, each task's
+            thread in order
+    """
+    task_ids = np.asarray(tasks["task_id"], dtype=object)
+    n = task_ids.size
+    if not n:
+        return {c: np.array([], dtype=object) for c in COMMENT_COLUMNS}
+
+    window_key = () if window is None else ("window", window[0].isoformat())
+    rng = get_np_rng("comments", *window_key, task_ids[0])
+
+    # ---------------- LIFETIMES ----------------
+    # Comments fall in [created_at, min(completed_at, CURRENT_DATE)], or
+    # in the part of it inside the window
+    created_at = np.asarray(tasks["created_at"], dtype="datetime64[s]")
+    completed_at = np.asarray(tasks["completed_at"], dtype="datetime64[s]")
+    if window is None:
+        now = np.datetime64(CURRENT_DATE, "s")
+        start = np.where(np.isnat(created_at), now, created_at)
+        end = np.where(np.isnat(completed_at), now, np.minimum(completed_at, now))
+    else:
+        window_start, window_end = (np.datetime64(bound, "s") for bound in window)
+        start = np.where(np.isnat(created_at), window_start, np.maximum(created_at, window_start))
+        end = np.where(np.isnat(completed_at), window_end, np.minimum(completed_at, window_end))
+    # Tasks with no time left in range (created after CURRENT_DATE or after
+    # the window, completed before they were created or before the window)
+    # get no thread
+    has_lifetime = end >= start
+    lifetime = np.where(has_lifetime, end - start, 0).astype(np.int64)
+
+    # ---------------- THREAD SIZES ----------------
+    has_comments = (rng.random(n) < ACTIVE_TASK_COMMENT_PROBABILITY) & has_lifetime
+    num_comments = np.where(
+        has_comments,
+        rng.integers(max(COMMENTS_PER_TASK_MIN, 1), COMMENTS_PER_TASK_MAX + 1, n),
+        0
+    )
+    comment_task = np.repeat(np.arange(n), num_comments)
+    m = comment_task.size
+
+    # Uniform points in each lifetime, sorted into a thread
+    offsets = (rng.random(m) * lifetime[comment_task]).astype(np.int64)
+    offsets = offsets[np.lexsort((offsets, comment_task))]
+    posted_at = start[comment_task] + offsets.astype("timedelta64[s]")
 
-    comments = []
+    is_edited = rng.random(m) < COMMENT_EDIT_PROBABILITY
+    edit_delay = rng.exponential(COMMENT_EDIT_DELAY_MINUTES * 60, m).astype(np.int64)
+    edited_at = np.where(
+        is_edited,
+        np.minimum(posted_at + edit_delay.astype("timedelta64[s]"), end[comment_task]),
+        np.datetime64("NaT", "s")
+    )
 
-    for task in tasks:
-        # Not every task has comments
-        if random.random() < 0.6:
-            num_comments = random.randint(1, 5)
+    # ---------------- AUTHORS AND TEXT ----------------
+    if team_members is not None:
+        team_index = np.array([project_teams.get(p, -1) for p in tasks["project_id"]])
+        user_id = sample_team_members(team_members, team_index[comment_task], rng)
+    else:
+        user_ids = np.array([u["user_id"] for u in users], dtype=object)
+        user_id = user_ids[rng.integers(0, len(user_ids), m)]
 
-            for _ in range(num_comments):
-                comments.append({
-                    "comment_id": generate_uuid(),
-                    "task_id": task["task_id"],
-                    "user_id": random.choice(users)["user_id"],
-                    "comment_text": random.choice(COMMENT_TEMPLATES),
-                    "created_at": generate_creation_date(),
-                    "edited_at": None,
-                    "is_edited": 0
-                })
+    if text_pool is not None:
+        comment_text = text_pool.take(text_pool.sample(m, rng))
+    else:
+        comment_text = np.array(COMMENT_TEMPLATES, dtype=object)[
+            rng.integers(0, len(COMMENT_TEMPLATES), m)
+        ]
 
-    return comments
+    return {
+        "comment_id": generate_ids("comment", m, rng),
+        "task_id": task_ids[comment_task],
+        "user_id": user_id,
+        "comment_text": comment_text,
+        "created_at": posted_at,
+        "edited_at": edited_at,
+        "is_edited": is_edited.astype(np.int64)
+    }
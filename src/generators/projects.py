@@ -2,11 +2,14 @@
 Project data generator.
 """
 
-import random
-from src.utils.string_utils import generate_uuid
+from src.utils.id_utils import generate_id
 from src.utils.date_utils import generate_creation_date
+from src.utils.rng_utils import get_rng
+from src.generators.team_memberships import team_member_ids
 from src.config import (
     NUM_PROJECTS,
+    PROJECTS_PER_TEAM_MIN,
+    PROJECTS_PER_TEAM_MAX,
     PROJECT_TYPE_BY_TEAM,
     PROJECT_TYPES
 )
@@ -36,28 +39,43 @@ PROJECT_NAME_TEMPLATES = {
 }
 
 
-def generate_projects(workspace_id, teams, users):
+def generate_projects(
+    workspace_id,
+    teams,
+    users,
+    projects_per_team=(PROJECTS_PER_TEAM_MIN, PROJECTS_PER_TEAM_MAX),
+    team_members=None
+):
     """
     Generate projects owned by teams.
+
+    With team_members (see team_memberships.assign_team_members) each
+    project's owner is a member of its team; otherwise any user.
     """
 
     projects = []
     user_ids = [u["user_id"] for u in users]
 
     for team in teams:
+        rng = get_rng("projects", team["team_id"])
+        owner_ids = (
+            team_member_ids(team_members, team["team_id"])
+            if team_members is not None
+            else user_ids
+        )
         team_type = team["team_type"]
         possible_types = PROJECT_TYPE_BY_TEAM.get(team_type, ["ongoing"])
 
-        num_projects = random.randint(5, 10)
+        num_projects = rng.randint(*projects_per_team)
 
         for i in range(num_projects):
-            project_type = random.choice(possible_types)
-            name_template = random.choice(PROJECT_NAME_TEMPLATES[project_type])
+            project_type = rng.choice(possible_types)
+            name_template = rng.choice(PROJECT_NAME_TEMPLATES[project_type])
 
-            project_name = name_template.format(n=random.randint(1, 4))
+            project_name = name_template.format(n=rng.randint(1, 4))
 
             projects.append({
-                "project_id": generate_uuid(),
+                "project_id": generate_id("project", rng),
                 "workspace_id": workspace_id,
                 "team_id": team["team_id"],
                 "name": project_name,
@@ -65,8 +83,8 @@ def generate_projects(workspace_id, teams, users):
                 "project_type": project_type,
                 "status": "active",
                 "privacy": "team",
-                "owner_id": random.choice(user_ids),
-                "created_at": generate_creation_date(),
+                "owner_id": rng.choice(owner_ids),
+                "created_at": generate_creation_date(rng=rng),
                 "color": "light-gray"
             })
 
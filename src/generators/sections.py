@@ -2,8 +2,9 @@
 Section data generator.
 """
 
-from src.utils.string_utils import generate_uuid
+from src.utils.id_utils import generate_id
 from src.utils.date_utils import generate_creation_date
+from src.utils.rng_utils import get_rng
 from src.config import PROJECT_TYPES
 
 
@@ -15,16 +16,17 @@ def generate_sections(projects):
     sections = []
 
     for project in projects:
+        rng = get_rng("sections", project["project_id"])
         project_type = project["project_type"]
         section_names = PROJECT_TYPES[project_type]["sections"]
 
         for order, name in enumerate(section_names):
             sections.append({
-                "section_id": generate_uuid(),
+                "section_id": generate_id("section", rng),
                 "project_id": project["project_id"],
                 "name": name,
                 "display_order": order,
-                "created_at": generate_creation_date()
+                "created_at": generate_creation_date(rng=rng)
             })
 
     return sections
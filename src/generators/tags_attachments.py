@@ -2,9 +2,9 @@
 Tag and attachment data generator.
 """
 
-import random
-from src.utils.string_utils import generate_uuid
-from src.utils.date_utils import generate_creation_date
+from src.utils.id_utils import generate_id, uuid_strings
+from src.utils.date_utils import generate_creation_date, random_datetime_between
+from src.utils.rng_utils import get_rng
 from src.config import COMMON_TAGS, ATTACHMENT_PROBABILITY, TAG_PROBABILITY
 
 
@@ -12,58 +12,106 @@ def generate_tags(workspace_id):
     """
     Generate workspace-level tags.
     """
+    rng = get_rng("tags", workspace_id)
     tags = []
 
     for tag in COMMON_TAGS:
         tags.append({
-            "tag_id": generate_uuid(),
+            "tag_id": generate_id("tag", rng),
             "workspace_id": workspace_id,
             "name": tag["name"],
             "color": tag["color"],
-            "created_at": generate_creation_date()
+            "created_at": generate_creation_date(rng=rng)
         })
 
     return tags
 
 
-def generate_task_tags(tasks, tags):
+def generate_task_tags(tasks, tags, window=None):
     """
     Assign tags to a subset of tasks.
     """
-    task_tags = []
+    return list(iter_task_tags(tasks, tags, window))
 
+
+def iter_task_tags(tasks, tags, window=None):
+    """
+    Stream tag assignments for a subset of tasks.
+
+    Only task["task_id"] is read from each task (and its created_at and
+    completed_at with a window, see _activity_span).
+    """
     for task in tasks:
-        if random.random() < TAG_PROBABILITY:
-            selected = random.sample(tags, random.randint(1, min(2, len(tags))))
+        if window is not None and _activity_span(task, window) is None:
+            continue
+        rng = _activity_rng("task_tags", task, window)
+        if rng.random() < TAG_PROBABILITY:
+            selected = rng.sample(tags, rng.randint(1, min(2, len(tags))))
 
             for tag in selected:
-                task_tags.append({
-                    "task_tag_id": generate_uuid(),
+                yield {
+                    "task_tag_id": generate_id("task_tag", rng),
                     "task_id": task["task_id"],
                     "tag_id": tag["tag_id"],
-                    "created_at": generate_creation_date()
-                })
-
-    return task_tags
+                    "created_at": _activity_date(task, window, rng)
+                }
 
 
-def generate_attachments(tasks, users):
+def generate_attachments(tasks, users, window=None):
     """
     Generate attachments for a subset of tasks.
     """
-    attachments = []
+    return list(iter_attachments(tasks, users, window))
 
+
+def iter_attachments(tasks, users, window=None):
+    """
+    Stream attachments for a subset of tasks.
+
+    Only task["task_id"] is read from each task (and its created_at and
+    completed_at with a window, see _activity_span).
+    """
     for task in tasks:
-        if random.random() < ATTACHMENT_PROBABILITY:
-            attachments.append({
-                "attachment_id": generate_uuid(),
+        if window is not None and _activity_span(task, window) is None:
+            continue
+        rng = _activity_rng("attachments", task, window)
+        if rng.random() < ATTACHMENT_PROBABILITY:
+            yield {
+                "attachment_id": generate_id("attachment", rng),
                 "task_id": task["task_id"],
-                "uploaded_by": random.choice(users)["user_id"],
-                "file_name": f"attachment_{random.randint(1,999)}.pdf",
-                "file_size": random.randint(50_000, 5_000_000),
+                "uploaded_by": rng.choice(users)["user_id"],
+                "file_name": f"attachment_{rng.randint(1,999)}.pdf",
+                "file_size": rng.randint(50_000, 5_000_000),
                 "file_type": "pdf",
-                "url": f"https://files.example.com/{generate_uuid()}",
-                "uploaded_at": generate_creation_date()
-            })
+                "url": f"https://files.example.com/{uuid_strings(1, rng)[0]}",
+                "uploaded_at": _activity_date(task, window, rng)
+            }
+
 
-    return attachments
+def _activity_rng(stage, task, window):
+    """
+    Stream for one task's rows; window runs (see append.py) get their own.
+    """
+    if window is None:
+        return get_rng(stage, task["task_id"])
+    return get_rng(stage, task["task_id"], "window", window[0].isoformat())
+
+
+def _activity_span(task, window):
+    """
+    The part of the window inside the task's lifetime, from created_at to
+    completed_at (either may be missing), or None if there is none.
+    """
+    start = max(window[0], task.get("created_at") or window[0])
+    end = min(window[1], task.get("completed_at") or window[1])
+    return (start, end) if start <= end else None
+
+
+def _activity_date(task, window, rng):
+    """
+    Timestamp of a per-task row: anywhere on the workspace timeline, or
+    inside the window and the task's lifetime (see _activity_span).
+    """
+    if window is None:
+        return generate_creation_date(rng=rng)
+    return random_datetime_between(*_activity_span(task, window), rng)
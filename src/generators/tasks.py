@@ -3,11 +3,18 @@ Task and subtask data generator.
 """
 
 import random
-from src.utils.string_utils import generate_uuid, truncate_string
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import numpy as np
+from src.utils.db_utils import iter_batches, get_table_columns
+from src.utils.rng_utils import get_np_rng, get_master_seed, set_master_seed
+from src.utils.id_utils import generate_ids
+from src.generators.team_memberships import sample_team_members
 from src.utils.date_utils import (
-    generate_creation_date,
-    generate_due_date,
-    generate_completion_date
+    generate_creation_dates,
+    generate_due_dates,
+    generate_completion_dates
 )
 from src.config import (
     TASKS_PER_PROJECT_MIN,
@@ -16,7 +23,9 @@ from src.config import (
     SUBTASKS_PER_TASK_MIN,
     SUBTASKS_PER_TASK_MAX,
     PRIORITY_DISTRIBUTION,
-    COMPLETION_RATES
+    COMPLETION_RATES,
+    UNASSIGNED_TASK_PERCENTAGE,
+    TASK_SHARD_SIZE
 )
 
 
@@ -54,8 +63,8 @@ TASK_NAME_TEMPLATES = {
 }
 
 
-def weighted_choice(weight_dict):
-    r = random.random()
+def weighted_choice(weight_dict, rng=None):
+    r = (rng or random).random()
     cumulative = 0.0
     for key, weight in weight_dict.items():
         cumulative += weight
@@ -64,108 +73,435 @@ def weighted_choice(weight_dict):
     return None
 
 
-def generate_tasks(projects, sections, teams, users):
+def generate_tasks(
+    projects,
+    sections,
+    teams,
+    users,
+    workers=1,
+    tasks_per_project=(TASKS_PER_PROJECT_MIN, TASKS_PER_PROJECT_MAX)
+):
     """
     Generate tasks and subtasks for projects.
     """
-    tasks = []
+    return list(iter_tasks(projects, sections, teams, users, workers, tasks_per_project))
 
+
+def iter_tasks(
+    projects,
+    sections,
+    teams,
+    users,
+    workers=1,
+    tasks_per_project=(TASKS_PER_PROJECT_MIN, TASKS_PER_PROJECT_MAX)
+):
+    """
+    Stream tasks and subtasks for projects as row dicts.
+
+    Convenience wrapper over iter_task_batches for callers that want dicts.
+    """
+    columns = get_table_columns("tasks")
+
+    batches = iter_task_batches(projects, sections, teams, users, workers, tasks_per_project)
+
+    for batch in batches:
+        for row in zip(*(batch[c].tolist() for c in columns)):
+            yield dict(zip(columns, row))
+
+
+def iter_task_batches(
+    projects,
+    sections,
+    teams,
+    users,
+    workers=1,
+    tasks_per_project=(TASKS_PER_PROJECT_MIN, TASKS_PER_PROJECT_MAX),
+    name_pool=None,
+    window=None,
+    team_members=None
+):
+    """
+    Stream tasks and subtasks for projects in columnar batches.
+
+    Projects are independent, so they are grouped into shards of
+    TASK_SHARD_SIZE projects and each shard is generated as one batch by
+    generate_task_columns. With workers > 1 the shards are spread over a
+    process pool; batches are yielded in project order either way, which
+    keeps the write order stable. Each shard draws from its own stream,
+    keyed by its project ids, so the rows don't depend on workers.
+
+    With a name_pool (a TextPool grouped by team type, see text_corpus.py)
+    task names are sampled from the pool; workers map the same pool file.
+
+    With a window, a (start, end) pair of datetimes, tasks are created
+    inside it instead of over the whole workspace timeline and only those
+    finished by its end are completed (see append.py). Window batches draw
+    from their own streams, so they never repeat the original build's ids.
+
+    With team_members (see team_memberships.assign_team_members) tasks
+    are assigned to and created by members of their project's team.
+
+    Yields:
+        dict: {column_name: ndarray} for one shard of projects
+    """
     # Quick lookup maps
     sections_by_project = {}
     for s in sections:
         sections_by_project.setdefault(s["project_id"], []).append(s)
 
-    users_by_team = {}
-    for u in users:
-        users_by_team.setdefault(u["workspace_id"], []).append(u["user_id"])
+    context = {
+        "user_ids": [u["user_id"] for u in users],
+        "tasks_per_project": tasks_per_project,
+        "name_pool": name_pool,
+        "team_types": {t["team_id"]: t["team_type"] for t in teams},
+        "window": window,
+        "team_members": team_members
+    }
+
+    shards = (
+        [(p, sections_by_project[p["project_id"]]) for p in shard_projects]
+        for shard_projects in iter_batches(projects, TASK_SHARD_SIZE)
+    )
+
+    if workers <= 1:
+        for shard in shards:
+            yield _assign_shard_ids(shard, _generate_shard(shard, context), window)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(context, get_master_seed())
+    ) as executor:
+        # Keep a bounded window of shards in flight so finished results
+        # don't pile up in memory ahead of the writer
+        pending = deque(
+            (shard, executor.submit(_generate_shard, shard))
+            for shard in islice(shards, workers * 2)
+        )
+
+        while pending:
+            shard, future = pending.popleft()
+            batch = future.result()
+
+            next_shard = next(shards, None)
+            if next_shard is not None:
+                pending.append((next_shard, executor.submit(_generate_shard, next_shard)))
+
+            # IDs are assigned here rather than in the workers so that
+            # counter-based GIDs stay unique and in write order
+            yield _assign_shard_ids(shard, batch, window)
+
+
+def iter_task_refs(batch, with_dates=False):
+    """
+    Yield the fields per-task generators read (task_id, project_id) from a
+    columnar task batch, plus created_at and completed_at if asked for.
+    """
+    if not with_dates:
+        for task_id, project_id in zip(batch["task_id"], batch["project_id"]):
+            yield {"task_id": task_id, "project_id": project_id}
+        return
+
+    for task_id, project_id, created_at, completed_at in zip(
+        batch["task_id"],
+        batch["project_id"],
+        batch["created_at"].tolist(),
+        batch["completed_at"].tolist()
+    ):
+        yield {
+            "task_id": task_id,
+            "project_id": project_id,
+            "created_at": created_at,
+            "completed_at": completed_at
+        }
+
+
+def _window_key(window):
+    """
+    Extra stream key parts for a creation window (none for a full build).
+    """
+    return () if window is None else ("window", window[0].isoformat())
+
+
+# -----------------------------------------------------------------------------
+# PROCESS POOL WORKERS
+# -----------------------------------------------------------------------------
+
+_worker_context = None
+
+
+def _init_worker(context, master_seed):
+    """
+    Receive the user ids and settings once per worker process instead of
+    once per shard, along with the parent's master seed.
+    """
+    global _worker_context
+    _worker_context = context
+    set_master_seed(master_seed)
+
+
+def _generate_shard(shard, context=None):
+    """
+    Generate all tasks for one shard of (project, sections) pairs.
+    """
+    if context is None:
+        context = _worker_context
+
+    projects = [project for project, _ in shard]
+    window = context["window"]
+    rng = get_np_rng("tasks", *_window_key(window), *(p["project_id"] for p in projects))
+    start_date, end_date = window if window is not None else (None, None)
+
+    return generate_task_columns(
+        projects,
+        {p["project_id"]: project_sections for p, project_sections in shard},
+        context["user_ids"],
+        rng,
+        tasks_per_project=context["tasks_per_project"],
+        assign_ids=False,
+        name_pool=context["name_pool"],
+        team_types=context["team_types"],
+        start_date=start_date,
+        end_date=end_date,
+        team_members=context["team_members"]
+    )
 
-    for project in projects:
-        project_id = project["project_id"]
-        project_type = project["project_type"]
 
-        project_sections = sorted(
+def _assign_shard_ids(shard, batch, window=None):
+    rng = get_np_rng("task_ids", *_window_key(window), *(p["project_id"] for p, _ in shard))
+    return assign_task_ids(batch, rng)
+
+
+# -----------------------------------------------------------------------------
+# COLUMNAR ENGINE
+# -----------------------------------------------------------------------------
+
+PRIORITY_VALUES = np.array(list(PRIORITY_DISTRIBUTION), dtype=object)
+PRIORITY_WEIGHTS = np.array(list(PRIORITY_DISTRIBUTION.values()))
+PRIORITY_WEIGHTS = PRIORITY_WEIGHTS / PRIORITY_WEIGHTS.sum()
+
+NO_DATE = np.datetime64('NaT', 's')
+
+
+def generate_task_columns(
+    projects,
+    sections_by_project,
+    user_ids,
+    rng=None,
+    tasks_per_project=(TASKS_PER_PROJECT_MIN, TASKS_PER_PROJECT_MAX),
+    assign_ids=True,
+    name_pool=None,
+    team_types=None,
+    start_date=None,
+    end_date=None,
+    team_members=None
+):
+    """
+    Generate the tasks and subtasks of a group of projects as columns.
+
+    Every field is drawn for all rows at once: task counts and completion
+    rates per project, then creation/due/completion dates, completion
+    flags, priorities, sections, assignees and hours per task, then the
+    subtask fan-out. Subtasks inherit section, people, dates, completion
+    and priority from their parent, as before.
+
+    Args:
+        projects: Project dicts
+        sections_by_project: {project_id: [section dicts]}
+        user_ids: Candidate assignees / creators
+        rng: numpy Generator to draw from
+        tasks_per_project: (min, max) top-level tasks per project
+        assign_ids: Fill task_id / parent_task_id now. If False, the batch
+            carries a parent_index column instead and assign_task_ids must
+            be called on it before writing.
+        name_pool: TextPool of task names grouped by team type (default:
+            numbered placeholder names)
+        team_types: {team_id: team_type}, used with name_pool
+        start_date: Create tasks from this datetime (default: WORKSPACE_START_DATE)
+        end_date: Create tasks until this datetime and leave open the ones
+            not finished by then (default: CURRENT_DATE, with completions
+            pulled back before it)
+        team_members: Team members (see team_memberships.build_team_members);
+            people are drawn from the project's team instead of user_ids
+
+    Returns:
+        dict: {column_name: ndarray} for the tasks table, each task
+            followed by its subtasks, in project order
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    user_ids = np.asarray(user_ids, dtype=object)
+
+    project_ids = np.array([p["project_id"] for p in projects], dtype=object)
+    project_types = np.array([p["project_type"] for p in projects], dtype=object)
+
+    # Sections of all projects in display order, flattened with offsets
+    section_ids = []
+    section_counts = []
+    for project_id in project_ids:
+        ordered = sorted(
             sections_by_project[project_id],
             key=lambda x: x["display_order"]
         )
+        section_ids.extend(s["section_id"] for s in ordered)
+        section_counts.append(len(ordered))
+    section_ids = np.array(section_ids, dtype=object)
+    section_counts = np.array(section_counts)
+    section_offsets = np.cumsum(section_counts) - section_counts
+
+    # ---------------- TOP-LEVEL TASKS ----------------
+    tasks_min, tasks_max = tasks_per_project
+    num_tasks = rng.integers(tasks_min, tasks_max + 1, len(projects))
+    completion_bounds = np.array([COMPLETION_RATES[t] for t in project_types]).reshape(-1, 2)
+    completion_rate = rng.uniform(completion_bounds[:, 0], completion_bounds[:, 1])
+
+    task_project = np.repeat(np.arange(len(projects)), num_tasks)
+    n = task_project.size
+
+    created_at = generate_creation_dates(n, start_date, end_date, rng=rng)
+    if start_date is not None and end_date is not None:
+        # Weekend shifts and times of day may step outside a short window
+        created_at = np.clip(
+            created_at,
+            np.datetime64(start_date, 's'),
+            np.datetime64(end_date, 's')
+        )
+    due_date = generate_due_dates(created_at, project_types[task_project], rng)
+
+    completed = rng.random(n) < completion_rate[task_project]
+    completed_at = np.full(n, NO_DATE)
+    completed_at[completed] = generate_completion_dates(
+        created_at[completed],
+        due_date[completed],
+        rng,
+        current_date=end_date,
+        open_past_current=end_date is not None
+    )
+    if end_date is not None:
+        # Nothing in a window may predate the task it belongs to
+        completed_at = np.where(completed_at < created_at, created_at, completed_at)
+    completed = ~np.isnat(completed_at)
+
+    priority = PRIORITY_VALUES[rng.choice(len(PRIORITY_VALUES), n, p=PRIORITY_WEIGHTS)]
+
+    section_pick = (rng.random(n) * section_counts[task_project]).astype(np.int64)
+    section = section_ids[section_offsets[task_project] + section_pick]
+
+    assigned = rng.random(n) > UNASSIGNED_TASK_PERCENTAGE
+    if team_members is not None:
+        team_index = team_members["team_index"]
+        task_team = np.array([team_index.get(p["team_id"], -1) for p in projects])[task_project]
+        assignee = np.where(assigned, sample_team_members(team_members, task_team, rng), None)
+        created_by = sample_team_members(team_members, task_team, rng)
+    else:
+        assignee = np.where(assigned, user_ids[rng.integers(0, len(user_ids), n)], None)
+        created_by = user_ids[rng.integers(0, len(user_ids), n)]
+
+    if name_pool is not None:
+        names = name_pool.take(_sample_name_indices(
+            name_pool,
+            [team_types.get(p["team_id"]) for p in projects],
+            task_project,
+            rng
+        ))
+    else:
+        name_numbers = rng.integers(1, 1000, n).tolist()
+        names = [
+            f"{project_type.capitalize()} Task - {number}"
+            for project_type, number in zip(project_types[task_project], name_numbers)
+        ]
+
+    # ---------------- SUBTASKS ----------------
+    has_subtasks = rng.random(n) < SUBTASK_PROBABILITY
+    num_subtasks = np.where(
+        has_subtasks,
+        rng.integers(SUBTASKS_PER_TASK_MIN, SUBTASKS_PER_TASK_MAX + 1, n),
+        0
+    )
+    subtasks_before = np.cumsum(num_subtasks) - num_subtasks
+
+    sub_parent = np.repeat(np.arange(n), num_subtasks)
+    m = sub_parent.size
+    sub_number = np.arange(m) - subtasks_before[sub_parent] + 1
+
+    # Output order: each task immediately followed by its subtasks
+    total = n + m
+    parent_pos = np.arange(n) + subtasks_before
+    sub_pos = parent_pos[sub_parent] + sub_number
+
+    source = np.empty(total, dtype=np.int64)  # Top-level task each row derives from
+    source[parent_pos] = np.arange(n)
+    source[sub_pos] = sub_parent
+
+    is_subtask = np.zeros(total, dtype=bool)
+    is_subtask[sub_pos] = True
+
+    row_names = np.empty(total, dtype=object)
+    row_names[parent_pos] = names
+    row_names[sub_pos] = [f"Subtask {i} for task" for i in sub_number.tolist()]
+
+    estimated_hours = np.empty(total)
+    estimated_hours[parent_pos] = rng.uniform(1, 16, n)
+    estimated_hours[sub_pos] = rng.uniform(0.5, 8, m)
+
+    actual_hours = np.empty(total)
+    actual_hours[parent_pos] = rng.uniform(1, 20, n)
+    actual_hours[sub_pos] = rng.uniform(0.5, 10, m)
+
+    row_completed = completed[source]
+    row_created_at = created_at[source]
+    row_completed_at = completed_at[source]
+
+    batch = {
+        "parent_index": np.where(is_subtask, parent_pos[source], -1),
+        "project_id": project_ids[task_project[source]],
+        "section_id": section[source],
+        "name": row_names,
+        "description": np.full(total, None, dtype=object),
+        "assignee_id": assignee[source],
+        "created_by": created_by[source],
+        "created_at": row_created_at,
+        "modified_at": np.where(np.isnat(row_completed_at), row_created_at, row_completed_at),
+        "start_date": np.full(total, None, dtype=object),
+        "due_date": due_date[source],
+        "completed": row_completed.astype(np.int64),
+        "completed_at": row_completed_at,
+        "priority": priority[source],
+        "estimated_hours": np.round(estimated_hours, 1),
+        "actual_hours": np.where(row_completed, np.round(actual_hours, 1), None)
+    }
+
+    return assign_task_ids(batch, rng) if assign_ids else batch
+
+
+def _sample_name_indices(name_pool, project_groups, task_project, rng):
+    """
+    Draw one pool index per task from its project's group (team type);
+    projects whose team type has no group draw from the whole pool.
+    """
+    bounds = np.array([
+        name_pool.group_range(group if group in name_pool.groups else None)
+        for group in project_groups
+    ]).reshape(-1, 2)
+    start = bounds[task_project, 0]
+    size = bounds[task_project, 1] - start
+    return start + (rng.random(task_project.size) * size).astype(np.int64)
+
+
+def assign_task_ids(batch, rng=None):
+    """
+    Give a columnar task batch its task_id and parent_task_id columns.
+
+    Args:
+        batch: Batch from generate_task_columns(..., assign_ids=False)
+        rng: numpy Generator for UUID-format IDs
+
+    Returns:
+        dict: The same batch, with parent_index replaced by the ID columns
+    """
+    parent_index = batch.pop("parent_index")
+    task_ids = np.array(generate_ids("task", len(parent_index), rng), dtype=object)
 
-        num_tasks = random.randint(TASKS_PER_PROJECT_MIN, TASKS_PER_PROJECT_MAX)
-        completion_low, completion_high = COMPLETION_RATES[project_type]
-        completion_rate = random.uniform(completion_low, completion_high)
-
-        for _ in range(num_tasks):
-            created_at = generate_creation_date()
-            due_date = generate_due_date(created_at, project_type)
-
-            completed = random.random() < completion_rate
-            completed_at = (
-                generate_completion_date(created_at, due_date)
-                if completed else None
-            )
-
-            priority = weighted_choice(PRIORITY_DISTRIBUTION)
-
-            section = random.choice(project_sections)
-
-            task_id = generate_uuid()
-            task = {
-                "task_id": task_id,
-                "project_id": project_id,
-                "section_id": section["section_id"],
-                "parent_task_id": None,
-                "name": truncate_string(
-                    f"{project_type.capitalize()} Task - {random.randint(1, 999)}",
-                    200
-                ),
-                "description": None,
-                "assignee_id": random.choice(users)[
-                    "user_id"
-                ] if random.random() > 0.15 else None,
-                "created_by": random.choice(users)["user_id"],
-                "created_at": created_at,
-                "modified_at": completed_at or created_at,
-                "start_date": None,
-                "due_date": due_date,
-                "completed": int(completed),
-                "completed_at": completed_at,
-                "priority": priority,
-                "estimated_hours": round(random.uniform(1, 16), 1),
-                "actual_hours": round(random.uniform(1, 20), 1) if completed else None
-            }
-
-            tasks.append(task)
-
-            # ---------------- SUBTASKS ----------------
-            if random.random() < SUBTASK_PROBABILITY:
-                num_subtasks = random.randint(
-                    SUBTASKS_PER_TASK_MIN,
-                    SUBTASKS_PER_TASK_MAX
-                )
-
-                for i in range(num_subtasks):
-                    subtask_id = generate_uuid()
-                    subtask = {
-                        "task_id": subtask_id,
-                        "project_id": project_id,
-                        "section_id": section["section_id"],
-                        "parent_task_id": task_id,
-                        "name": truncate_string(
-                            f"Subtask {i + 1} for task",
-                            200
-                        ),
-                        "description": None,
-                        "assignee_id": task["assignee_id"],
-                        "created_by": task["created_by"],
-                        "created_at": created_at,
-                        "modified_at": completed_at or created_at,
-                        "start_date": None,
-                        "due_date": due_date,
-                        "completed": int(completed),
-                        "completed_at": completed_at,
-                        "priority": priority,
-                        "estimated_hours": round(random.uniform(0.5, 8), 1),
-                        "actual_hours": round(random.uniform(0.5, 10), 1) if completed else None
-                    }
-
-                    tasks.append(subtask)
-
-    return tasks
+    batch["task_id"] = task_ids
+    batch["parent_task_id"] = np.where(parent_index >= 0, task_ids[parent_index], None)
+    return batch
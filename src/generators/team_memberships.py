@@ -1,46 +1,244 @@
 """
 Team membership data generator.
+
+Memberships are assigned for all users and teams at once with NumPy:
+
+- every user gets a primary team; primaries are dealt out in proportion
+  to a target size per team (USERS_PER_TEAM_MIN..MAX), and every team gets
+  at least one when there are as many users as teams
+- MULTI_TEAM_USER_PERCENTAGE of users join up to MAX_TEAMS_PER_USER teams
+  in total; extra teams are drawn by target size, redrawing the few that
+  repeat a team the user is already in
+
+The result is kept as compact CSR arrays ("team members"): the member
+rows of team i are members[offsets[i]:offsets[i + 1]], as indices into
+user_ids. Later stages draw project owners, assignees and commenters from
+a project's team through sample_team_members / team_member_ids instead of
+building their own lookups.
 """
 
-import random
-from src.utils.string_utils import generate_uuid
-from src.utils.date_utils import generate_creation_date
-from src.config import USERS_PER_TEAM_MIN, USERS_PER_TEAM_MAX
+import numpy as np
+from src.utils.id_utils import generate_ids
+from src.utils.date_utils import generate_creation_dates, to_datetimes
+from src.utils.rng_utils import get_np_rng
+from src.config import (
+    USERS_PER_TEAM_MIN,
+    USERS_PER_TEAM_MAX,
+    MULTI_TEAM_USER_PERCENTAGE,
+    MAX_TEAMS_PER_USER,
+    CURRENT_DATE
+)
+
+
+def assign_team_members(users, teams):
+    """
+    Decide which users belong to which teams.
+
+    Args:
+        users: User dicts
+        teams: Team dicts
+
+    Returns:
+        dict: Team members (see build_team_members)
+    """
+    num_users, num_teams = len(users), len(teams)
+    if not num_users or not num_teams:
+        return build_team_members(users, teams, [], [])
+
+    rng = get_np_rng("team_memberships", teams[0]["workspace_id"])
+    target = rng.integers(USERS_PER_TEAM_MIN, USERS_PER_TEAM_MAX + 1, num_teams)
+    weights = target / target.sum()
+
+    # Primary teams: quotas proportional to the targets, at least one each
+    floor = 1 if num_users >= num_teams else 0
+    share = weights * (num_users - floor * num_teams)
+    quota = floor + np.floor(share).astype(np.int64)
+    leftover = num_users - quota.sum()
+    quota[np.argsort(np.floor(share) - share, kind="stable")[:leftover]] += 1
+    primary = np.repeat(np.arange(num_teams), quota)[rng.permutation(num_users)]
+
+    # Extra teams for multi-team users
+    max_extra = min(MAX_TEAMS_PER_USER, num_teams) - 1
+    extra = np.zeros(num_users, dtype=np.int64)
+    if max_extra > 0:
+        multi = rng.random(num_users) < MULTI_TEAM_USER_PERCENTAGE
+        extra[multi] = rng.integers(1, max_extra + 1, multi.sum())
+    extra_user = np.repeat(np.arange(num_users), extra)
+    extra_team = rng.choice(num_teams, extra_user.size, p=weights)
+
+    primary_keys = np.arange(num_users) * num_teams + primary
+    while True:
+        keys = np.concatenate([primary_keys, extra_user * num_teams + extra_team])
+        _, first = np.unique(keys, return_index=True)
+        repeated = np.ones(keys.size, dtype=bool)
+        repeated[first] = False
+        repeated = repeated[num_users:]
+        if not repeated.any():
+            break
+        extra_team[repeated] = rng.choice(num_teams, repeated.sum(), p=weights)
+
+    return build_team_members(
+        users,
+        teams,
+        np.concatenate([primary, extra_team]),
+        np.concatenate([np.arange(num_users), extra_user])
+    )
+
+
+def build_team_members(users, teams, team_index, user_index):
+    """
+    Pack (team, user) pairs into CSR arrays.
+
+    Args:
+        users: User dicts (position = user index)
+        teams: Team dicts (position = team index)
+        team_index: Team index per membership
+        user_index: User index per membership
+
+    Returns:
+        dict: {"team_ids": [team_id], "team_index": {team_id: index},
+            "user_ids": ndarray of user_id,
+            "offsets": int64 ndarray (len(teams) + 1),
+            "members": int64 ndarray of user indices, by team then user}
+    """
+    team_index = np.asarray(team_index, dtype=np.int64)
+    user_index = np.asarray(user_index, dtype=np.int64)
+    order = np.lexsort((user_index, team_index))
+
+    offsets = np.zeros(len(teams) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(team_index, minlength=len(teams)), out=offsets[1:])
 
+    return {
+        "team_ids": [t["team_id"] for t in teams],
+        "team_index": {t["team_id"]: i for i, t in enumerate(teams)},
+        "user_ids": np.array([u["user_id"] for u in users], dtype=object),
+        "offsets": offsets,
+        "members": user_index[order]
+    }
 
-def generate_team_memberships(users, teams):
+
+def team_members_from_rows(users, teams, memberships):
+    """
+    Rebuild team members from team_memberships rows (e.g. read back from
+    the database); rows naming unknown users or teams are ignored.
+
+    Returns:
+        dict: Team members (see build_team_members)
     """
-    Assign users to teams.
+    team_pos = {t["team_id"]: i for i, t in enumerate(teams)}
+    user_pos = {u["user_id"]: i for i, u in enumerate(users)}
+    pairs = [
+        (team_pos[m["team_id"]], user_pos[m["user_id"]])
+        for m in memberships
+        if m["team_id"] in team_pos and m["user_id"] in user_pos
+    ]
+    return build_team_members(
+        users,
+        teams,
+        [team for team, _ in pairs],
+        [user for _, user in pairs]
+    )
 
-    Ensures:
-    - No duplicate (team_id, user_id) pairs
-    - Each team has realistic membership size
+
+def team_member_ids(team_members, team_id):
+    """
+    Return the user ids of one team's members (all users if it has none).
     """
+    offsets = team_members["offsets"]
+    i = team_members["team_index"][team_id]
+    members = team_members["members"][offsets[i]:offsets[i + 1]]
+    if not members.size:
+        return team_members["user_ids"].tolist()
+    return team_members["user_ids"][members].tolist()
 
-    memberships = []
-    used_pairs = set()
 
-    user_ids = [u["user_id"] for u in users]
+def project_teams(team_members, projects):
+    """
+    Map each project to the index of its team (-1 if the team is unknown),
+    for sample_team_members.
+
+    Returns:
+        dict: {project_id: team index}
+    """
+    team_index = team_members["team_index"]
+    return {p["project_id"]: team_index.get(p["team_id"], -1) for p in projects}
+
+
+def sample_team_members(team_members, team_index, rng):
+    """
+    Draw one member per entry of team_index, uniformly within each team;
+    entries whose team has no members draw from all users.
 
-    for team in teams:
-        team_id = team["team_id"]
+    Args:
+        team_members: See build_team_members
+        team_index: Team index per draw (-1: any user)
+        rng: numpy Generator
 
-        num_members = random.randint(USERS_PER_TEAM_MIN, USERS_PER_TEAM_MAX)
-        selected_users = random.sample(user_ids, min(num_members, len(user_ids)))
+    Returns:
+        ndarray: user_id per draw
+    """
+    team_index = np.asarray(team_index, dtype=np.int64)
+    user_ids = team_members["user_ids"]
+    offsets = team_members["offsets"]
+
+    start = np.where(team_index >= 0, offsets[team_index], 0)
+    size = np.where(team_index >= 0, offsets[team_index + 1] - start, 0)
+    pick = rng.random(team_index.size)
+
+    anyone = size == 0
+    users = np.empty(team_index.size, dtype=object)
+    users[~anyone] = user_ids[team_members["members"][
+        start[~anyone] + (pick[~anyone] * size[~anyone]).astype(np.int64)
+    ]]
+    users[anyone] = user_ids[(pick[anyone] * len(user_ids)).astype(np.int64)]
+    return users
+
+
+def generate_team_memberships(users, teams, team_members=None):
+    """
+    Generate team_memberships rows, one per (team, user) pair, by team.
+
+    Nobody joins a team before both they and the team exist.
+
+    Args:
+        users: User dicts
+        teams: Team dicts
+        team_members: Result of assign_team_members (computed if not given)
+
+    Returns:
+        list: Membership row dicts
+    """
+    if team_members is None:
+        team_members = assign_team_members(users, teams)
 
-        for user_id in selected_users:
-            pair = (team_id, user_id)
+    offsets = team_members["offsets"]
+    members = team_members["members"]
+    if not members.size:
+        return []
 
-            if pair in used_pairs:
-                continue  # skip duplicate
+    rng = get_np_rng("team_membership_rows", teams[0]["workspace_id"])
+    team_index = np.repeat(np.arange(len(teams)), np.diff(offsets))
 
-            used_pairs.add(pair)
+    user_created = np.array([u["created_at"] for u in users], dtype="datetime64[s]")
+    team_created = np.array([t["created_at"] for t in teams], dtype="datetime64[s]")
+    earliest = np.maximum(user_created[members], team_created[team_index])
 
-            memberships.append({
-                "membership_id": generate_uuid(),
-                "team_id": team_id,
-                "user_id": user_id,
-                "joined_at": generate_creation_date()
-            })
+    membership_ids = generate_ids("team_membership", members.size, rng)
+    latest = np.maximum(earliest, np.datetime64(CURRENT_DATE, "s"))
+    joined_at = to_datetimes(generate_creation_dates(members.size, earliest, latest, rng=rng))
+    team_ids = team_members["team_ids"]
 
-    return memberships
+    return [
+        {
+            "membership_id": membership_id,
+            "team_id": team_ids[team],
+            "user_id": user_id,
+            "joined_at": joined
+        }
+        for membership_id, team, user_id, joined in zip(
+            membership_ids,
+            team_index.tolist(),
+            team_members["user_ids"][members].tolist(),
+            joined_at
+        )
+    ]
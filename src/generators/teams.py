@@ -2,10 +2,10 @@
 Team data generator.
 """
 
-import random
 from src.config import NUM_TEAMS, TEAM_TYPES
-from src.utils.string_utils import generate_uuid
+from src.utils.id_utils import generate_id
 from src.utils.date_utils import generate_creation_date
+from src.utils.rng_utils import get_rng
 
 
 TEAM_NAME_TEMPLATES = {
@@ -38,23 +38,27 @@ TEAM_NAME_TEMPLATES = {
 }
 
 
-def generate_teams(workspace_id):
+def generate_teams(workspace_id, team_types=TEAM_TYPES):
+    rng = get_rng("teams", workspace_id)
     teams = []
 
-    for team_type, count in TEAM_TYPES.items():
+    for team_type, count in team_types.items():
         names = TEAM_NAME_TEMPLATES.get(team_type, [])
-        random.shuffle(names)
+        names = rng.sample(names, len(names))  # Shuffled copy; keep templates intact
 
         for i in range(count):
             team_name = names[i % len(names)]
+            if i >= len(names):
+                # Large workspaces reuse names; number the repeats
+                team_name = f"{team_name} {i // len(names) + 1}"
 
             teams.append({
-                "team_id": generate_uuid(),
+                "team_id": generate_id("team", rng),
                 "workspace_id": workspace_id,
                 "name": team_name,
                 "description": f"{team_name} team",
                 "team_type": team_type,
-                "created_at": generate_creation_date(),
+                "created_at": generate_creation_date(rng=rng),
                 "is_archived": 0
             })
 
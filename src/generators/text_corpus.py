@@ -0,0 +1,227 @@
+"""
+Text corpus compilation.
+
+Builds the string pools the generators sample from (see
+src/utils/text_pool.py) out of the template lists in the generator
+modules, expanded over a placeholder vocabulary, plus optional batched
+LLM output, and the person name corpora users are drawn from. LLM
+responses go through the persistent cache, so rebuilding the pools with
+the same settings costs no requests.
+
+Pools are rebuilt automatically when the templates, vocabulary, name
+corpora or LLM settings change (tracked by a fingerprint in each pool's
+header).
+"""
+
+import hashlib
+import json
+from itertools import product
+from pathlib import Path
+from string import Formatter
+from src.generators.tasks import TASK_NAME_TEMPLATES
+from src.generators.comments import COMMENT_TEMPLATES
+from src.generators.users import load_name_corpus
+from src.utils.text_pool import TextPool, write_pool, read_pool_header
+from src.utils.llm_utils import generate_items_with_llm
+from src.config import TEXT_POOL_DIR, LLM_MODEL, USE_LLM_GENERATION
+
+
+POOL_NAMES = ("task_names", "comments", "person_names")
+
+
+# Values substituted into TASK_NAME_TEMPLATES placeholders
+TEMPLATE_VOCABULARY = {
+    "feature": [
+        "SSO login", "bulk export", "audit log", "dark mode", "search filters",
+        "notifications", "usage analytics", "billing page", "API rate limits",
+        "onboarding flow", "file uploads", "role permissions", "mobile sync",
+        "webhooks", "two-factor auth", "saved views"
+    ],
+    "component": [
+        "auth service", "payments API", "web dashboard", "iOS app", "Android app",
+        "data pipeline", "search index", "notification worker", "admin console",
+        "GraphQL gateway", "CI pipeline", "reporting service"
+    ],
+    "issue": [
+        "memory leak", "race condition", "timeout errors", "flaky tests",
+        "broken pagination", "slow queries", "null pointer crash",
+        "timezone bug", "encoding issue", "stale cache"
+    ],
+    "reason": [
+        "reduce coupling", "remove dead code", "simplify config",
+        "prepare for v2", "improve testability", "drop legacy API"
+    ],
+    "asset": [
+        "landing page", "email sequence", "case study", "webinar deck",
+        "product video", "blog post", "social carousel", "one-pager",
+        "press release", "banner ads"
+    ],
+    "campaign": [
+        "Q1 launch", "spring promo", "brand refresh", "customer week",
+        "holiday campaign", "partner program", "webinar series", "EMEA expansion"
+    ],
+    "channel": [
+        "LinkedIn", "newsletter", "Google Ads", "YouTube", "Instagram",
+        "partner sites", "events"
+    ],
+    "process": [
+        "vendor onboarding", "expense approvals", "hiring pipeline",
+        "access reviews", "incident response", "procurement", "month-end close",
+        "equipment requests"
+    ],
+    "tool": [
+        "Jira", "Slack", "Okta", "Zendesk", "Looker", "Notion", "PagerDuty",
+        "Salesforce"
+    ],
+    "prospect": [
+        "Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Logistics",
+        "Wayne Retail", "Hooli", "Soylent Foods", "Vandelay Imports", "Cyberdyne"
+    ],
+    "stage": [
+        "discovery", "qualification", "proposal", "negotiation", "closed won",
+        "renewal"
+    ]
+}
+
+COMMENT_OPENERS = ["", "Quick update:", "FYI -", "Heads up:", "Thanks!", "Following up:"]
+COMMENT_CLOSERS = [
+    "",
+    "Let me know if you have questions.",
+    "Will follow up tomorrow.",
+    "cc the team for visibility.",
+    "Happy to pair on this."
+]
+
+
+def expand_template(template, vocabulary=TEMPLATE_VOCABULARY):
+    """
+    Expand a template over every combination of its placeholder values.
+
+    Args:
+        template: str.format template, e.g. "Fix {issue} in {component}"
+        vocabulary: {placeholder: [values]}
+
+    Returns:
+        list: Expanded strings (just the template if it has no placeholders)
+    """
+    fields = [name for _, name, _, _ in Formatter().parse(template) if name]
+    if not fields:
+        return [template]
+
+    return [
+        template.format(**dict(zip(fields, values)))
+        for values in product(*(vocabulary[field] for field in fields))
+    ]
+
+
+def build_corpus(llm_items=0):
+    """
+    Compile the strings of every pool.
+
+    Args:
+        llm_items: LLM-generated items added per pool group (0: templates only;
+            ignored when LLM generation is disabled)
+
+    Returns:
+        dict: {pool_name: {group_name: [strings]}}
+    """
+    task_names = {
+        team_type: sorted({
+            name
+            for template in templates
+            for name in expand_template(template)
+        })
+        for team_type, templates in TASK_NAME_TEMPLATES.items()
+    }
+
+    comments = [
+        " ".join(part for part in (opener, body, closer) if part)
+        for opener, body, closer in product(COMMENT_OPENERS, COMMENT_TEMPLATES, COMMENT_CLOSERS)
+    ]
+
+    if llm_items:
+        team_types = list(task_names)
+        generated = generate_items_with_llm(
+            "task_name",
+            [(llm_items, {"team_type": team_type}) for team_type in team_types]
+        )
+        for team_type, items in zip(team_types, generated):
+            task_names[team_type].extend(item for item in items if item)
+
+        comments.extend(
+            item
+            for item in generate_items_with_llm("comment", [(llm_items, None)])[0]
+            if item
+        )
+
+    return {
+        "task_names": task_names,
+        "comments": {"all": comments},
+        "person_names": load_name_corpus()
+    }
+
+
+def corpus_fingerprint(llm_items=0):
+    """
+    Hash of everything the corpus is compiled from.
+    """
+    llm_items = llm_items if USE_LLM_GENERATION else 0
+    material = json.dumps([
+        TASK_NAME_TEMPLATES,
+        COMMENT_TEMPLATES,
+        TEMPLATE_VOCABULARY,
+        COMMENT_OPENERS,
+        COMMENT_CLOSERS,
+        load_name_corpus(),
+        llm_items,
+        LLM_MODEL if llm_items else None
+    ], sort_keys=True)
+    return hashlib.blake2b(material.encode(), digest_size=16).hexdigest()
+
+
+def build_text_pools(pool_dir=TEXT_POOL_DIR, llm_items=0):
+    """
+    Compile the corpus and write one pool file per pool.
+
+    Args:
+        pool_dir: Directory for the .pool files
+        llm_items: See build_corpus
+
+    Returns:
+        dict: {pool_name: number of strings}
+    """
+    fingerprint = corpus_fingerprint(llm_items)
+    corpus = build_corpus(llm_items)
+
+    return {
+        name: write_pool(Path(pool_dir) / f"{name}.pool", groups, {"fingerprint": fingerprint})
+        for name, groups in corpus.items()
+    }
+
+
+def load_text_pools(pool_dir=TEXT_POOL_DIR, llm_items=0, rebuild=False):
+    """
+    Open every pool, (re)building them first if missing or out of date.
+
+    Args:
+        pool_dir: Directory of the .pool files
+        llm_items: See build_corpus
+        rebuild: Rebuild even if the pools are current
+
+    Returns:
+        dict: {pool_name: TextPool}
+    """
+    pool_dir = Path(pool_dir)
+    fingerprint = corpus_fingerprint(llm_items)
+    paths = {name: pool_dir / f"{name}.pool" for name in POOL_NAMES}
+
+    def is_current(path):
+        try:
+            return read_pool_header(path)["meta"].get("fingerprint") == fingerprint
+        except (OSError, ValueError):
+            return False
+
+    if rebuild or not all(is_current(path) for path in paths.values()):
+        build_text_pools(pool_dir, llm_items)
+
+    return {name: TextPool(path) for name, path in paths.items()}
@@ -1,59 +1,170 @@
 """
 User data generator.
+
+Users are generated column-wise with NumPy: first and last names are drawn
+as indices into the name corpora (the person_names text pool, see
+text_corpus.py, or the built-in lists below), and only the distinct
+(first, last, email pattern) combinations are turned into strings.
+
+Emails are made unique with one counter per base address, as a mail
+system would: the first john.doe@ keeps the plain address, later ones
+become john.doe1@, john.doe2@, ... Counters are assigned by sorting the
+base addresses, so each user costs O(1) instead of probing suffixes until
+a free one turns up. Local parts are letters only (see
+string_utils.email_name), so a suffixed address never equals a base one.
 """
 
-import random
+import numpy as np
 from src.config import (
     NUM_USERS,
     ADMIN_PERCENTAGE,
     GUEST_PERCENTAGE,
-    COMPANY_DOMAIN
+    COMPANY_DOMAIN,
+    FIRST_NAMES_PATH,
+    LAST_NAMES_PATH
 )
-from src.utils.string_utils import generate_uuid, generate_email
-from src.utils.date_utils import generate_creation_date
-
+from src.utils.string_utils import EMAIL_PATTERNS, email_local_part
+from src.utils.id_utils import generate_ids
+from src.utils.date_utils import generate_creation_dates, to_datetimes
+from src.utils.rng_utils import get_np_rng
 
-FIRST_NAMES = ["Amit", "Neha", "Rahul", "Priya", "Ankit", "Sneha", "Vikas", "Pooja"]
-LAST_NAMES = ["Sharma", "Verma", "Patel", "Singh", "Iyer", "Gupta"]
 
+FIRST_NAMES = [
+    "Aarav", "Aisha", "Akira", "Alejandro", "Amara", "Amit", "Ana", "Andrei",
+    "Ankit", "Arjun", "Astrid", "Ben", "Bianca", "Carlos", "Chen", "Chloe",
+    "Daniel", "Deepa", "Diego", "Dmitri", "Elena", "Emeka", "Emily", "Emma",
+    "Farah", "Fatima", "Felix", "Gabriel", "Grace", "Hana", "Hannah", "Hiroshi",
+    "Ibrahim", "Ines", "Isabel", "Ivan", "Jack", "James", "Javier", "Jin",
+    "Julia", "Kai", "Kavya", "Kenji", "Kwame", "Lars", "Laura", "Leila",
+    "Liam", "Lucas", "Lucia", "Maya", "Mei", "Mohammed", "Nadia", "Naveen",
+    "Neha", "Nikolai", "Noah", "Nora", "Olivia", "Omar", "Oscar", "Pablo",
+    "Pooja", "Priya", "Rahul", "Ravi", "Rosa", "Ryan", "Sakura", "Samuel",
+    "Sara", "Sebastian", "Sofia", "Sneha", "Tariq", "Thomas", "Uma", "Victor",
+    "Vikas", "Wei", "Yara", "Yusuf", "Zara", "Zoe"
+]
+LAST_NAMES = [
+    "Adeyemi", "Ahmed", "Alvarez", "Andersen", "Bauer", "Becker", "Bianchi",
+    "Brown", "Chen", "Cohen", "Costa", "Da Silva", "Das", "Dubois", "Fernandez",
+    "Fischer", "Garcia", "Gupta", "Hansen", "Hernandez", "Hoffmann", "Ito",
+    "Iyer", "Jensen", "Johnson", "Kang", "Kapoor", "Kim", "Kowalski", "Kumar",
+    "Lee", "Li", "Lopez", "Martin", "Martinez", "Mehta", "Mensah", "Meyer",
+    "Moreau", "Muller", "Nakamura", "Nguyen", "Novak", "Okafor", "Olsen",
+    "Park", "Patel", "Petrov", "Ramirez", "Reddy", "Rossi", "Santos", "Sato",
+    "Schmidt", "Shah", "Sharma", "Silva", "Singh", "Smith", "Suzuki", "Tanaka",
+    "Taylor", "Thompson", "Tran", "Verma", "Wagner", "Wang", "Williams",
+    "Wilson", "Wong", "Yamamoto", "Yilmaz", "Zhang"
+]
 
-def generate_users(workspace_id):
-    users = []
-    used_emails = set()
 
-    for i in range(NUM_USERS):
-        first = random.choice(FIRST_NAMES)
-        last = random.choice(LAST_NAMES)
+def load_name_corpus():
+    """
+    Return the first and last name corpora: the files named by
+    FIRST_NAMES_PATH / LAST_NAMES_PATH (one name per line) where set,
+    otherwise the built-in lists. Blank lines and repeats are dropped.
 
-        role_rand = random.random()
-        if role_rand < ADMIN_PERCENTAGE:
-            role = "admin"
-        elif role_rand < ADMIN_PERCENTAGE + GUEST_PERCENTAGE:
-            role = "guest"
+    Returns:
+        dict: {"first": [names], "last": [names]}
+    """
+    corpus = {}
+    for group, path, default in (
+        ("first", FIRST_NAMES_PATH, FIRST_NAMES),
+        ("last", LAST_NAMES_PATH, LAST_NAMES)
+    ):
+        if path:
+            with open(path, encoding="utf-8") as f:
+                names = [line.strip() for line in f]
         else:
-            role = "member"
+            names = default
+        corpus[group] = list(dict.fromkeys(name for name in names if name))
+    return corpus
+
+
+def generate_users(workspace_id, num_users=NUM_USERS, domain=COMPANY_DOMAIN, name_pool=None):
+    """
+    Generate the users of a workspace.
+
+    Args:
+        workspace_id: Workspace the users belong to
+        num_users: Number of users
+        domain: Email domain
+        name_pool: The person_names TextPool (groups "first" and "last");
+            without one, names come from FIRST_NAMES and LAST_NAMES
 
-        # Ensure unique email
-        base_email = generate_email(first, last, COMPANY_DOMAIN)
-        email = base_email
-        counter = 1
+    Returns:
+        list: User row dicts
+    """
+    rng = get_np_rng("users", workspace_id)
 
-        while email in used_emails:
-            # Append a numeric suffix to ensure uniqueness
-            name, domain = base_email.split("@")
-            email = f"{name}{counter}@{domain}"
-            counter += 1
+    if name_pool is not None:
+        first_idx = name_pool.sample(num_users, rng, "first")
+        last_idx = name_pool.sample(num_users, rng, "last")
+        decode = name_pool.take
+    else:
+        names = np.array(FIRST_NAMES + LAST_NAMES, dtype=object)
+        first_idx = rng.integers(0, len(FIRST_NAMES), num_users)
+        last_idx = rng.integers(len(FIRST_NAMES), len(names), num_users)
+        decode = names.__getitem__
+    pattern = rng.integers(0, len(EMAIL_PATTERNS), num_users)
 
-        used_emails.add(email)
+    role_rand = rng.random(num_users)
+    role = np.where(
+        role_rand < ADMIN_PERCENTAGE,
+        "admin",
+        np.where(role_rand < ADMIN_PERCENTAGE + GUEST_PERCENTAGE, "guest", "member")
+    ).tolist()
 
-        users.append({
-            "user_id": generate_uuid(),
+    user_ids = generate_ids("user", num_users, rng)
+    created_at = to_datetimes(generate_creation_dates(num_users, rng=rng))
+
+    # Name strings for the distinct (first, last) pairs only
+    name_count = len(name_pool) if name_pool is not None else len(names)
+    pair_keys, pair_of_user = np.unique(first_idx * name_count + last_idx, return_inverse=True)
+    pair_firsts = decode(pair_keys // name_count)
+    pair_lasts = decode(pair_keys % name_count)
+    full_names = np.array(
+        [f"{first} {last}" for first, last in zip(pair_firsts, pair_lasts)], dtype=object
+    )
+
+    # Base local parts for the distinct (pair, pattern) combinations, then
+    # for the distinct base addresses (different names can share one, e.g. jdoe)
+    combo_keys, combo_of_user = np.unique(
+        pair_of_user * len(EMAIL_PATTERNS) + pattern, return_inverse=True
+    )
+    combo_locals = [
+        email_local_part(
+            pair_firsts[key // len(EMAIL_PATTERNS)],
+            pair_lasts[key // len(EMAIL_PATTERNS)],
+            key % len(EMAIL_PATTERNS)
+        )
+        for key in combo_keys.tolist()
+    ]
+    base_locals, base_of_combo = np.unique(np.array(combo_locals, dtype=object), return_inverse=True)
+    base_of_user = base_of_combo.ravel()[combo_of_user.ravel()]
+
+    # Per-base counters: the k-th user (in row order) with a base address gets suffix k
+    order = np.argsort(base_of_user, kind="stable")
+    sorted_bases = base_of_user[order]
+    group_start = np.flatnonzero(np.r_[True, sorted_bases[1:] != sorted_bases[:-1]])
+    group_sizes = np.diff(np.r_[group_start, num_users])
+    suffix = np.empty(num_users, dtype=np.int64)
+    suffix[order] = np.arange(num_users) - np.repeat(group_start, group_sizes)
+
+    emails = [
+        f"{local}{n}@{domain}" if n else f"{local}@{domain}"
+        for local, n in zip(base_locals[base_of_user].tolist(), suffix.tolist())
+    ]
+
+    return [
+        {
+            "user_id": user_id,
             "workspace_id": workspace_id,
-            "name": f"{first} {last}",
+            "name": name,
             "email": email,
-            "role": role,
-            "created_at": generate_creation_date(),
+            "role": user_role,
+            "created_at": created,
             "is_active": 1
-        })
-
-    return users
+        }
+        for user_id, name, email, user_role, created in zip(
+            user_ids, full_names[pair_of_user].tolist(), emails, role, created_at
+        )
+    ]
@@ -2,338 +2,323 @@
 Entry point for Asana seed data generation.
 """
 
-from src.utils.db_utils import initialize_database
-from src.generators.users import generate_users
-from src.generators.tasks import generate_tasks
-from src.generators.projects import generate_projects
-from src.generators.comments import generate_comments
-from src.generators.sections import generate_sections
-from src.generators.teams import generate_teams
-from src.generators.team_memberships import generate_team_memberships
-from src.config import COMPANY_NAME
-from src.generators.tags_attachments import (
-    generate_tags,
-    generate_task_tags,
-    generate_attachments
+import argparse
+from pathlib import Path
+from src.utils.db_utils import (
+    initialize_database,
+    open_database,
+    finalize_database,
+    load_pragmas,
+    create_writer,
+    MultiWriter,
+    BACKENDS
 )
-from src.generators.custom_fields import (
-    generate_custom_field_definitions,
-    generate_custom_field_values
+from src.generators.text_corpus import load_text_pools
+from src.append import append_activity
+from src.workspaces import (
+    build_workspace,
+    plan_workspaces,
+    load_workspace_specs,
+    generate_workspaces,
+    WorkspaceTotals
+)
+from src.utils.rng_utils import set_master_seed
+from src.utils.id_utils import ID_FORMATS, set_id_format
+from src.utils.scale_utils import resolve_scale, get_scale_settings
+from src.utils.instrumentation import RunReport, report_path_for
+from src.config import (
+    RANDOM_SEED,
+    ID_FORMAT,
+    SCALE_PROFILES,
+    DATABASE_PATH,
+    DATABASE_BACKEND,
+    TEXT_POOL_DIR
 )
 
+def scale_arg(value):
+    """
+    argparse type for scales: checks the value but keeps the string, which
+    is what the run report and workspace specs record.
+    """
+    try:
+        resolve_scale(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
 
 
-def main():
-    print("Initializing database...")
-    conn = initialize_database()
-    cursor = conn.cursor()
-
-    # -------------------------------------------------
-    # WORKSPACE
-    # -------------------------------------------------
-    print("Creating workspace...")
-    workspace_id = "workspace-001"
-
-    cursor.execute(
-        """
-        INSERT INTO workspaces (workspace_id, name, domain, created_at, is_active)
-        VALUES (?, ?, ?, CURRENT_TIMESTAMP, 1)
-        """,
-        (workspace_id, COMPANY_NAME, "example.com")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the Asana seed database.")
+    parser.add_argument(
+        "--db-path",
+        help=(
+            f"Database file to (re)build (default: {DATABASE_PATH}, "
+            "with a .duckdb suffix for the DuckDB backend)"
+        )
     )
-
-    # -------------------------------------------------
-    # USERS
-    # -------------------------------------------------
-    print("Generating users...")
-    users = generate_users(workspace_id)
-
-    for u in users:
-        cursor.execute(
-            """
-            INSERT INTO users (user_id, workspace_id, name, email, role, created_at, is_active)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                u["user_id"],
-                u["workspace_id"],
-                u["name"],
-                u["email"],
-                u["role"],
-                u["created_at"],
-                u["is_active"],
-            )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=DATABASE_BACKEND,
+        help="Storage backend (default: DATABASE_BACKEND)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to generate tasks (default: 1, no pool)"
+    )
+    parser.add_argument(
+        "--scale",
+        type=scale_arg,
+        default="medium",
+        help=(
+            "Workspace size: a factor (e.g. 2.5) or one of "
+            f"{', '.join(SCALE_PROFILES)} (default: medium = config sizes)"
         )
-
-    # -------------------------------------------------
-    # TEAMS
-    # -------------------------------------------------
-    print("Generating teams...")
-    teams = generate_teams(workspace_id)
-
-    for t in teams:
-        cursor.execute(
-            """
-            INSERT INTO teams (team_id, workspace_id, name, description, team_type, created_at, is_archived)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                t["team_id"],
-                t["workspace_id"],
-                t["name"],
-                t["description"],
-                t["team_type"],
-                t["created_at"],
-                t["is_archived"],
-            )
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=RANDOM_SEED,
+        help="Master seed for every random stream (default: RANDOM_SEED)"
+    )
+    parser.add_argument(
+        "--id-format",
+        choices=ID_FORMATS,
+        default=ID_FORMAT,
+        help="Primary key format (default: ID_FORMAT)"
+    )
+    parser.add_argument(
+        "--text-pool-dir",
+        default=TEXT_POOL_DIR,
+        help=f"Compiled string pools, built on first use (default: {TEXT_POOL_DIR})"
+    )
+    parser.add_argument(
+        "--rebuild-text-pools",
+        action="store_true",
+        help="Recompile the string pools even if they are up to date"
+    )
+    parser.add_argument(
+        "--llm-pool-items",
+        type=int,
+        default=0,
+        help="LLM-generated strings added to each pool group (default: 0, templates only)"
+    )
+    parser.add_argument(
+        "--parquet-dir",
+        help=(
+            "Also stream every table to <dir>/<table>.parquet (requires pyarrow); "
+            "the SQLite database is still written"
         )
-
-    # -------------------------------------------------
-    # TEAM MEMBERSHIPS  (RUNS ONCE — ONLY HERE)
-    # -------------------------------------------------
-    print("Generating team memberships...")
-    memberships = generate_team_memberships(users, teams)
-
-    for m in memberships:
-        cursor.execute(
-            """
-            INSERT INTO team_memberships (membership_id, team_id, user_id, joined_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (
-                m["membership_id"],
-                m["team_id"],
-                m["user_id"],
-                m["joined_at"],
-            )
+    )
+    parser.add_argument(
+        "--defer-unique",
+        action="store_true",
+        help=(
+            "Load custom_field_values and task_tags without their UNIQUE "
+            "constraints and build them as unique indexes after the load"
         )
-    # -------------------------------------------------
-    # PROJECTS
-    # -------------------------------------------------
+    )
+    parser.add_argument(
+        "--append-days",
+        type=int,
+        help=(
+            "Instead of rebuilding, open the existing database and simulate "
+            "this many more days of activity (see src/append.py)"
+        )
+    )
+    parser.add_argument(
+        "--workspaces",
+        type=int,
+        help=(
+            "Build this many independent workspaces, --workers at a time, "
+            "into the one database (see src/workspaces.py)"
+        )
+    )
+    parser.add_argument(
+        "--workspace-spec",
+        help="JSON list of workspaces to build (name, domain, scale, seed), instead of --workspaces"
+    )
+    parser.add_argument(
+        "--workspace-scales",
+        nargs="+",
+        type=scale_arg,
+        help="Scales drawn from per workspace with --workspaces (default: --scale)"
+    )
+    parser.add_argument(
+        "--split-workspaces",
+        action="store_true",
+        help="Write each workspace to its own <db stem>.<workspace_id>.sqlite instead of merging"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run each stage under cProfile and dump <db>.profile/<stage>.prof"
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Record the tracemalloc peak and top allocation sites per stage (slows generation down)"
+    )
+    args = parser.parse_args(argv)
+    if args.append_days is not None:
+        if args.append_days < 1:
+            parser.error("--append-days must be at least 1")
+        if args.parquet_dir or args.defer_unique:
+            parser.error("--parquet-dir and --defer-unique only apply to a full build")
+    if args.workspaces is not None and args.workspace_spec:
+        parser.error("--workspaces and --workspace-spec are alternatives")
+    if args.workspaces is not None or args.workspace_spec:
+        if args.workspaces is not None and args.workspaces < 1:
+            parser.error("--workspaces must be at least 1")
+        if args.append_days is not None or args.parquet_dir:
+            parser.error("--append-days and --parquet-dir apply to a single workspace")
+        if args.backend != "sqlite":
+            parser.error("Multi-workspace builds use the sqlite backend")
+    elif args.split_workspaces or args.workspace_scales:
+        parser.error("--split-workspaces and --workspace-scales need --workspaces or --workspace-spec")
+    if args.db_path is None:
+        path = Path(DATABASE_PATH)
+        args.db_path = str(path.with_suffix(".duckdb") if args.backend == "duckdb" else path)
+    return args
 
-    print("Generating projects...")
-    projects = generate_projects(workspace_id, teams, users)
 
-    for p in projects:
-        cursor.execute(
-            """
-            INSERT INTO projects (
-                project_id, workspace_id, team_id, name, description,
-                project_type, status, privacy, owner_id, created_at, color
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                p["project_id"],
-                p["workspace_id"],
-                p["team_id"],
-                p["name"],
-                p["description"],
-                p["project_type"],
-                p["status"],
-                p["privacy"],
-                p["owner_id"],
-                p["created_at"],
-                p["color"],
-            )
-        )
+def build_many_workspaces(args):
+    """
+    Multi-workspace build (--workspaces / --workspace-spec).
+    """
+    if args.workspace_spec:
+        specs = load_workspace_specs(args.workspace_spec, args.scale, args.seed)
+    else:
+        specs = plan_workspaces(args.workspaces, args.workspace_scales or [args.scale], args.seed)
 
-    # -------------------------------------------------
-    # SECTIONS
-    # -------------------------------------------------
-    print("Generating sections...")
-    sections = generate_sections(projects)
+    db_path = Path(args.db_path)
+    run = RunReport(
+        WorkspaceTotals(),
+        trace_memory=args.trace_memory,
+        meta={
+            "db_path": str(db_path),
+            "backend": args.backend,
+            "seed": args.seed,
+            "workers": args.workers,
+            "id_format": args.id_format,
+            "defer_unique": args.defer_unique,
+            "split_workspaces": args.split_workspaces
+        }
+    )
 
-    for s in sections:
-        cursor.execute(
-            """
-            INSERT INTO sections (section_id, project_id, name, display_order, created_at)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                s["section_id"],
-                s["project_id"],
-                s["name"],
-                s["display_order"],
-                s["created_at"],
-            )
+    print("Loading text pools...")
+    with run.stage("text_pools"):
+        text_pools = load_text_pools(
+            args.text_pool_dir,
+            llm_items=args.llm_pool_items,
+            rebuild=args.rebuild_text_pools
         )
-    # -------------------------------------------------
-    # TASKS + SUBTASKS
-    # -------------------------------------------------
-    print("Generating tasks...")
-    tasks = generate_tasks(projects, sections, teams, users)
 
-    for t in tasks:
-        cursor.execute(
-            """
-            INSERT INTO tasks (
-                task_id, project_id, section_id, parent_task_id,
-                name, description, assignee_id, created_by,
-                created_at, modified_at, start_date, due_date,
-                completed, completed_at, priority,
-                estimated_hours, actual_hours
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                t["task_id"],
-                t["project_id"],
-                t["section_id"],
-                t["parent_task_id"],
-                t["name"],
-                t["description"],
-                t["assignee_id"],
-                t["created_by"],
-                t["created_at"],
-                t["modified_at"],
-                t["start_date"],
-                t["due_date"],
-                t["completed"],
-                t["completed_at"],
-                t["priority"],
-                t["estimated_hours"],
-                t["actual_hours"],
-            )
-        )
-    # -------------------------------------------------
-    # COMMENTS
-    # -------------------------------------------------
-    print("Generating comments...")
-    comments = generate_comments(tasks, users)
+    print(f"Building {len(specs)} workspaces with {args.workers} workers:")
+    results = generate_workspaces(
+        specs,
+        db_path,
+        text_pools,
+        run,
+        workers=args.workers,
+        split=args.split_workspaces,
+        id_format=args.id_format,
+        defer_unique=args.defer_unique
+    )
+    run.writer.report()
+    run.print_summary()
 
-    for c in comments:
-        cursor.execute(
-            """
-            INSERT INTO comments (
-                comment_id, task_id, user_id,
-                comment_text, created_at, edited_at, is_edited
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                c["comment_id"],
-                c["task_id"],
-                c["user_id"],
-                c["comment_text"],
-                c["created_at"],
-                c["edited_at"],
-                c["is_edited"],
-            )
-        )
-    # -------------------------------------------------
-    # CUSTOM FIELDS
-    # -------------------------------------------------
-    print("Generating custom fields...")
-    field_defs = generate_custom_field_definitions(projects)
+    rows = sum(result["rows"] for result in results)
+    seconds = run.to_dict()["totals"]["seconds"]
+    print(f"{rows:,} rows in {len(results)} workspaces, {rows / seconds:,.0f} rows/s overall")
 
-    for f in field_defs:
-        cursor.execute(
-            """
-            INSERT INTO custom_field_definitions (
-                field_id, project_id, field_name,
-                field_type, enum_options, is_required, created_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                f["field_id"],
-                f["project_id"],
-                f["field_name"],
-                f["field_type"],
-                f["enum_options"],
-                f["is_required"],
-                f["created_at"],
-            )
-        )
+    report_path = report_path_for(db_path)
+    run.write(report_path)
+    print(f"Run report written to {report_path}")
+    print("Done!")
 
-    field_values = generate_custom_field_values(tasks, field_defs)
 
-    for v in field_values:
-        cursor.execute(
-            """
-            INSERT INTO custom_field_values (
-                value_id, field_id, task_id, value
-            )
-            VALUES (?, ?, ?, ?)
-            """,
-            (
-                v["value_id"],
-                v["field_id"],
-                v["task_id"],
-                v["value"],
-            )
-        )
-    # -------------------------------------------------
-    # TAGS
-    # -------------------------------------------------
-    print("Generating tags...")
-    tags = generate_tags(workspace_id)
+def main(argv=None):
+    args = parse_args(argv)
+    if args.workspaces is not None or args.workspace_spec:
+        build_many_workspaces(args)
+        return
 
-    for t in tags:
-        cursor.execute(
-            """
-            INSERT INTO tags (tag_id, workspace_id, name, color, created_at)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                t["tag_id"],
-                t["workspace_id"],
-                t["name"],
-                t["color"],
-                t["created_at"],
-            )
-        )
+    set_master_seed(args.seed)
+    set_id_format(args.id_format)
+    scale = get_scale_settings(resolve_scale(args.scale))
 
-    print("Assigning tags to tasks...")
-    task_tags = generate_task_tags(tasks, tags)
+    if args.append_days:
+        print(f"Opening {args.db_path}...")
+        conn = open_database(args.db_path, args.backend)
+    else:
+        print("Initializing database...")
+        conn = initialize_database(args.db_path, args.defer_unique, args.backend)
+    writer = create_writer(conn)
+    if args.parquet_dir:
+        from src.utils.parquet_utils import ParquetWriter
+        writer = MultiWriter(writer, ParquetWriter(args.parquet_dir))
 
-    for tt in task_tags:
-        cursor.execute(
-            """
-            INSERT INTO task_tags (task_tag_id, task_id, tag_id, created_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (
-                tt["task_tag_id"],
-                tt["task_id"],
-                tt["tag_id"],
-                tt["created_at"],
-            )
+    db_path = Path(args.db_path)
+    run = RunReport(
+        writer,
+        trace_memory=args.trace_memory,
+        profile_dir=db_path.with_name(f"{db_path.stem}.profile") if args.profile else None,
+        meta={
+            "db_path": str(db_path),
+            "backend": args.backend,
+            "seed": args.seed,
+            "scale": args.scale,
+            "workers": args.workers,
+            "id_format": args.id_format,
+            "defer_unique": args.defer_unique,
+            "parquet_dir": args.parquet_dir,
+            "append_days": args.append_days
+        }
+    )
+
+    print("Loading text pools...")
+    with run.stage("text_pools"):
+        text_pools = load_text_pools(
+            args.text_pool_dir,
+            llm_items=args.llm_pool_items,
+            rebuild=args.rebuild_text_pools
         )
 
-    # -------------------------------------------------
-    # ATTACHMENTS
-    # -------------------------------------------------
-    print("Generating attachments...")
-    attachments = generate_attachments(tasks, users)
+    with load_pragmas(conn):
+        if args.append_days:
+            run.meta.update(append_activity(
+                conn,
+                writer,
+                run,
+                args.append_days,
+                text_pools,
+                workers=args.workers,
+                tasks_per_project=scale["tasks_per_project"]
+            ))
+        else:
+            build_workspace(writer, run, scale, text_pools, workers=args.workers)
 
-    for a in attachments:
-        cursor.execute(
-            """
-            INSERT INTO attachments (
-                attachment_id, task_id, uploaded_by,
-                file_name, file_size, file_type, url, uploaded_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                a["attachment_id"],
-                a["task_id"],
-                a["uploaded_by"],
-                a["file_name"],
-                a["file_size"],
-                a["file_type"],
-                a["url"],
-                a["uploaded_at"],
-            )
-        )
+        # -------------------------------------------------
+        # FINALIZE: INDEXES AFTER THE BULK LOAD
+        # -------------------------------------------------
+        print("Building indexes...")
+        with run.stage("finalize"):
+            if hasattr(writer, "close"):
+                writer.close()
+            finalize_database(conn, defer_unique=args.defer_unique)
 
-    conn.commit()
     conn.close()
+    writer.report()
+    run.print_summary()
+
+    report_path = report_path_for(db_path, "append-report" if args.append_days else "report")
+    run.write(report_path)
+    print(f"Run report written to {report_path}")
     print("Done!")
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,185 @@
+"""
+Arrow conversion shared by the columnar outputs (Parquet, DuckDB).
+
+Tables are mapped from schema.sql (TIMESTAMP -> timestamp[s], DATE ->
+date32, BOOLEAN -> bool, ...); the enum-like columns in
+PARQUET_DICTIONARY_COLUMNS are dictionary-encoded. ArrowBatchWriter
+gives the same write / write_columns interface as db_utils.BulkWriter
+and buffers each table as Arrow record batches until a flush.
+
+Requires pyarrow (optional dependency).
+"""
+
+import time
+from functools import lru_cache
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from src.utils.db_utils import (
+    load_schema,
+    get_table_columns,
+    iter_batches,
+    report_write_stats
+)
+from src.config import (
+    BULK_INSERT_BATCH_SIZE,
+    PARQUET_DICTIONARY_COLUMNS
+)
+
+
+def arrow_type(table, column, sql_type):
+    """
+    Map a schema.sql column type to an Arrow type.
+
+    Args:
+        table: Table name
+        column: Column name
+        sql_type: Declared type, e.g. "TEXT"
+
+    Returns:
+        pyarrow.DataType
+    """
+    if column in PARQUET_DICTIONARY_COLUMNS.get(table, ()):
+        return pa.dictionary(pa.int32(), pa.string())
+
+    return {
+        "TEXT": pa.string(),
+        "INTEGER": pa.int64(),
+        "REAL": pa.float64(),
+        "BOOLEAN": pa.bool_(),
+        "TIMESTAMP": pa.timestamp("s"),
+        "DATE": pa.date32()
+    }[sql_type]
+
+
+@lru_cache(maxsize=None)
+def arrow_schema(table):
+    """
+    Arrow schema of a table in schema.sql.
+    """
+    return pa.schema([
+        pa.field(column, arrow_type(table, column, sql_type))
+        for column, sql_type in load_schema()[table]
+    ])
+
+
+def _to_arrow(values, arrow_field):
+    """
+    Convert one column (ndarray or list) to an Arrow array of the field's type.
+    """
+    field_type = arrow_field.type
+
+    if isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.datetime64):
+        if pa.types.is_date32(field_type):
+            values = values.astype("datetime64[D]")
+        return pa.array(values, type=field_type)
+
+    if pa.types.is_boolean(field_type):
+        # SQLite-style 0/1 flags
+        if isinstance(values, np.ndarray) and values.dtype != object:
+            values = values != 0
+        else:
+            values = [None if v is None else bool(v) for v in values]
+
+    if pa.types.is_date32(field_type):
+        values = [v.date() if hasattr(v, "date") else v for v in values]
+
+    return pa.array(values, type=field_type)
+
+
+class ArrowBatchWriter:
+    """
+    Base for writers that buffer tables as Arrow record batches.
+
+    Subclasses implement _flush(table), which takes the buffered batches
+    with _take_buffer(table) and records its own time with _record, and
+    close().
+    """
+
+    def __init__(self, flush_rows):
+        if pa is None:
+            raise ImportError(f"{type(self).__name__} requires pyarrow (pip install pyarrow)")
+
+        self.flush_rows = flush_rows
+        self.stats = {}
+        self._buffers = {}
+
+    def write(self, table, rows, columns=None):
+        """
+        Buffer rows (dicts or tuples) for a table.
+
+        Args:
+            table: Table name
+            rows: Iterable of dicts or tuples
+            columns: Column names for tuple rows, or the subset to take
+                from dict rows (default: every column in the schema)
+
+        Returns:
+            int: Number of rows written
+        """
+        columns = tuple(columns) if columns else get_table_columns(table)
+
+        written = 0
+        for batch in iter_batches(rows, BULK_INSERT_BATCH_SIZE):
+            if isinstance(batch[0], dict):
+                batch = [tuple(map(row.get, columns)) for row in batch]
+            written += self.write_columns(table, dict(zip(columns, zip(*batch))))
+
+        return written
+
+    def write_columns(self, table, columns):
+        """
+        Buffer a columnar batch for a table.
+
+        Args:
+            table: Table name
+            columns: {column_name: ndarray or list}; columns of the table
+                missing from the batch are written as null
+
+        Returns:
+            int: Number of rows written
+        """
+        start = time.perf_counter()
+        schema = arrow_schema(table)
+        n = len(next(iter(columns.values())))
+
+        arrays = [
+            _to_arrow(columns[field.name], field) if field.name in columns
+            else pa.nulls(n, field.type)
+            for field in schema
+        ]
+        buffer = self._buffers.setdefault(table, [])
+        buffer.append(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+        self._record(table, n, time.perf_counter() - start)
+
+        if sum(batch.num_rows for batch in buffer) >= self.flush_rows:
+            self._flush(table)
+
+        return n
+
+    def _take_buffer(self, table):
+        """
+        Remove and return the buffered batches of a table as one Arrow table
+        (None if nothing is buffered).
+        """
+        buffer = self._buffers.pop(table, [])
+        return pa.Table.from_batches(buffer) if buffer else None
+
+    def _flush(self, table):
+        raise NotImplementedError
+
+    def _record(self, table, rows, seconds):
+        table_stats = self.stats.setdefault(table, {"rows": 0, "seconds": 0.0})
+        table_stats["rows"] += rows
+        table_stats["seconds"] += seconds
+
+    def report(self):
+        """
+        Print rows written and write throughput per table.
+        """
+        report_write_stats(self.stats)
@@ -4,6 +4,7 @@ Date and time utility functions for generating realistic temporal patterns.
 
 import random
 from datetime import datetime, timedelta
+import numpy as np
 from src.config import (
     WORKSPACE_START_DATE,
     CURRENT_DATE,
@@ -11,11 +12,12 @@ from src.config import (
     AVOID_WEEKEND_DUE_DATES,
     COMPLETION_TIME_MEAN,
     COMPLETION_TIME_STDDEV,
-    DUE_DATE_DISTRIBUTION
+    DUE_DATE_DISTRIBUTION,
+    SPRINT_DURATION_DAYS
 )
 
 
-def generate_creation_date(start_date=None, end_date=None):
+def generate_creation_date(start_date=None, end_date=None, rng=None):
     """
     Generate a realistic creation date with weighted activity patterns.
     
@@ -25,45 +27,55 @@ def generate_creation_date(start_date=None, end_date=None):
     Args:
         start_date: Start of date range (default: WORKSPACE_START_DATE)
         end_date: End of date range (default: CURRENT_DATE)
+        rng: random.Random stream to draw from (default: global random)
     
     Returns:
         datetime: A realistic creation timestamp
     """
+    rng = rng or random
     if start_date is None:
         start_date = WORKSPACE_START_DATE
     if end_date is None:
         end_date = CURRENT_DATE
     
-    # Generate random date within range
-    time_between = end_date - start_date
-    days_between = time_between.days
+    # Generate random date within range. The day range is end-exclusive,
+    # so a midnight end_date (e.g. CURRENT_DATE) doesn't offer its own day
+    last_day = (end_date - timedelta(seconds=1)).date()
+    days_between = max((last_day - start_date.date()).days, 0)
     
     # Bias toward recent dates (more recent activity)
     # Use exponential distribution - more weight on recent dates
-    random_days = int(random.expovariate(1.0 / (days_between / 2)))
+    random_days = int(rng.expovariate(1.0 / (days_between / 2))) if days_between else 0
     random_days = min(random_days, days_between)
     
     creation_date = start_date + timedelta(days=random_days)
     
     # Apply day-of-week weighting
-    # If it's a weekend, shift to Friday or Monday
-    while creation_date.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
-        if random.random() < 0.5:
+    # If it's a weekend, shift to Friday or Monday, without leaving the
+    # range (a range of only weekend days keeps its weekend date)
+    first_day = start_date.date()
+    has_weekday = days_between >= 2 or first_day.weekday() < 5 or last_day.weekday() < 5
+    while has_weekday and creation_date.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
+        if creation_date.date() >= last_day:
+            creation_date -= timedelta(days=1)
+        elif creation_date.date() <= first_day:
+            creation_date += timedelta(days=1)
+        elif rng.random() < 0.5:
             creation_date -= timedelta(days=1)  # Shift to Friday
         else:
             creation_date += timedelta(days=1)  # Shift to Monday
     
     # Add realistic time of day (9 AM - 6 PM work hours)
-    hour = random.randint(9, 18)
-    minute = random.randint(0, 59)
-    second = random.randint(0, 59)
+    hour = rng.randint(9, 18)
+    minute = rng.randint(0, 59)
+    second = rng.randint(0, 59)
     
     creation_date = creation_date.replace(hour=hour, minute=minute, second=second)
     
-    return creation_date
+    return min(max(creation_date, start_date), end_date)
 
 
-def generate_due_date(created_at, project_type='sprint'):
+def generate_due_date(created_at, project_type='sprint', rng=None):
     """
     Generate a realistic due date based on research patterns.
     
@@ -77,32 +89,35 @@ def generate_due_date(created_at, project_type='sprint'):
     Args:
         created_at: Task creation timestamp
         project_type: Type of project (affects due date patterns)
+        rng: random.Random stream to draw from (default: global random)
     
     Returns:
         datetime or None: Due date (None if no due date)
     """
+    rng = rng or random
+
     # Select distribution bucket
-    rand = random.random()
+    rand = rng.random()
     
     if rand < DUE_DATE_DISTRIBUTION['overdue']:
         # Overdue - due date in the past
-        days_overdue = random.randint(1, 30)
+        days_overdue = rng.randint(1, 30)
         due_date = created_at - timedelta(days=days_overdue)
     
     elif rand < DUE_DATE_DISTRIBUTION['overdue'] + DUE_DATE_DISTRIBUTION['week_1']:
         # Due within 1 week
-        days_ahead = random.randint(1, 7)
+        days_ahead = rng.randint(1, 7)
         due_date = created_at + timedelta(days=days_ahead)
     
     elif rand < DUE_DATE_DISTRIBUTION['overdue'] + DUE_DATE_DISTRIBUTION['week_1'] + DUE_DATE_DISTRIBUTION['month_1']:
         # Due within 1 month
-        days_ahead = random.randint(8, 30)
+        days_ahead = rng.randint(8, 30)
         due_date = created_at + timedelta(days=days_ahead)
     
     elif rand < (DUE_DATE_DISTRIBUTION['overdue'] + DUE_DATE_DISTRIBUTION['week_1'] + 
                  DUE_DATE_DISTRIBUTION['month_1'] + DUE_DATE_DISTRIBUTION['months_1_3']):
         # Due in 1-3 months
-        days_ahead = random.randint(31, 90)
+        days_ahead = rng.randint(31, 90)
         due_date = created_at + timedelta(days=days_ahead)
     
     else:
@@ -110,7 +125,7 @@ def generate_due_date(created_at, project_type='sprint'):
         return None
     
     # Avoid weekend due dates (85% of the time)
-    if random.random() < AVOID_WEEKEND_DUE_DATES:
+    if rng.random() < AVOID_WEEKEND_DUE_DATES:
         due_date = avoid_weekend(due_date)
     
     # For sprint projects, align to sprint boundaries (2-week cycles)
@@ -162,7 +177,7 @@ def align_to_sprint_boundary(date):
     return date
 
 
-def generate_completion_date(created_at, due_date=None):
+def generate_completion_date(created_at, due_date=None, rng=None):
     """
     Generate a realistic completion date for a completed task.
     
@@ -172,13 +187,16 @@ def generate_completion_date(created_at, due_date=None):
     Args:
         created_at: When task was created
         due_date: Task due date (if any)
+        rng: random.Random stream to draw from (default: global random)
     
     Returns:
         datetime: Completion timestamp
     """
+    rng = rng or random
+
     # Generate days to complete using log-normal distribution
     # This creates realistic "cycle time" patterns
-    days_to_complete = random.lognormvariate(
+    days_to_complete = rng.lognormvariate(
         mu=COMPLETION_TIME_MEAN / 3,  # Mean of underlying normal
         sigma=COMPLETION_TIME_STDDEV / 5  # Std dev of underlying normal
     )
@@ -188,29 +206,46 @@ def generate_completion_date(created_at, due_date=None):
     
     completed_at = created_at + timedelta(days=days_to_complete)
     
-    # Ensure completion is before current date
+    # Ensure completion is before current date (and not before creation)
     if completed_at > CURRENT_DATE:
-        completed_at = CURRENT_DATE - timedelta(days=random.randint(1, 7))
+        completed_at = max(created_at, CURRENT_DATE - timedelta(days=rng.randint(1, 7)))
     
     # If there's a due date, some tasks complete after (realistic!)
     if due_date:
         # 80% complete before due date, 20% complete after
-        if random.random() < 0.8:
+        if rng.random() < 0.8:
             # Complete before due date
-            if completed_at > due_date:
+            if completed_at > due_date > created_at:
                 # Adjust to be before due date
                 time_before_due = (due_date - created_at).total_seconds()
-                random_seconds = random.uniform(0, time_before_due)
+                random_seconds = rng.uniform(0, time_before_due)
                 completed_at = created_at + timedelta(seconds=random_seconds)
         # else: leave as-is (complete after due date - realistic!)
     
     # Add realistic time of day
-    hour = random.randint(9, 18)
-    minute = random.randint(0, 59)
-    second = random.randint(0, 59)
+    hour = rng.randint(9, 18)
+    minute = rng.randint(0, 59)
+    second = rng.randint(0, 59)
     completed_at = completed_at.replace(hour=hour, minute=minute, second=second)
     
-    return completed_at
+    return min(max(completed_at, created_at), max(created_at, CURRENT_DATE))
+
+
+def random_datetime_between(start_date, end_date, rng=None):
+    """
+    Draw a timestamp uniformly between two datetimes.
+
+    Args:
+        start_date: Earliest timestamp
+        end_date: Latest timestamp
+        rng: random.Random stream to draw from (default: global random)
+
+    Returns:
+        datetime: Timestamp in [start_date, end_date]
+    """
+    rng = rng or random
+    seconds = max(0.0, (end_date - start_date).total_seconds())
+    return start_date + timedelta(seconds=int(rng.uniform(0, seconds)))
 
 
 def is_business_day(date):
@@ -226,16 +261,20 @@ def is_business_day(date):
     return date.weekday() < 5  # 0-4 are Mon-Fri
 
 
-def get_random_time_in_workday():
+def get_random_time_in_workday(rng=None):
     """
     Generate a random time during work hours (9 AM - 6 PM).
     
+    Args:
+        rng: random.Random stream to draw from (default: global random)
+    
     Returns:
         tuple: (hour, minute, second)
     """
-    hour = random.randint(9, 18)
-    minute = random.randint(0, 59)
-    second = random.randint(0, 59)
+    rng = rng or random
+    hour = rng.randint(9, 18)
+    minute = rng.randint(0, 59)
+    second = rng.randint(0, 59)
     return (hour, minute, second)
 
 
@@ -250,4 +289,280 @@ def days_between(start_date, end_date):
     Returns:
         int: Number of days
     """
-    return (end_date - start_date).days
\ No newline at end of file
+    return (end_date - start_date).days
+
+# -----------------------------------------------------------------------------
+# BATCH (VECTORIZED) DATE GENERATION
+# -----------------------------------------------------------------------------
+# NumPy counterparts of the functions above. They draw whole arrays at once
+# from the same distributions and return datetime64[s] arrays, with NaT
+# standing in for None. `rng` is a numpy.random.Generator (see
+# rng_utils.get_np_rng).
+
+ONE_DAY = np.timedelta64(1, 'D')
+
+
+def _as_datetime64(dates):
+    return np.asarray(dates, dtype='datetime64[s]')
+
+
+def weekdays(dates):
+    """
+    Day of week for an array of dates (0 = Monday ... 6 = Sunday).
+
+    Args:
+        dates: datetime64 array
+
+    Returns:
+        ndarray: int64 weekday per date
+    """
+    days = _as_datetime64(dates).astype('datetime64[D]').astype(np.int64)
+    return (days + 3) % 7  # 1970-01-01 was a Thursday
+
+
+def random_workday_times(n, rng=None):
+    """
+    Draw n times of day during work hours (9 AM - 6 PM).
+
+    Args:
+        n: Number of draws
+        rng: numpy Generator to draw from
+
+    Returns:
+        ndarray: timedelta64[s] offsets from midnight
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    seconds = (
+        rng.integers(9, 19, n) * 3600
+        + rng.integers(0, 60, n) * 60
+        + rng.integers(0, 60, n)
+    )
+    return seconds.astype('timedelta64[s]')
+
+
+def generate_creation_dates(n, start_date=None, end_date=None, rng=None):
+    """
+    Batch version of generate_creation_date.
+
+    Args:
+        n: Number of dates to draw
+        start_date: Start of range; datetime or datetime64 array broadcastable
+            to n (default: WORKSPACE_START_DATE)
+        end_date: End of range, same forms (default: CURRENT_DATE)
+        rng: numpy Generator to draw from
+
+    Returns:
+        ndarray: datetime64[s] creation timestamps
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    if start_date is None:
+        start_date = WORKSPACE_START_DATE
+    if end_date is None:
+        end_date = CURRENT_DATE
+
+    start = np.broadcast_to(_as_datetime64(start_date), (n,))
+    end = np.broadcast_to(_as_datetime64(end_date), (n,))
+    # End-exclusive day range, as in generate_creation_date
+    last_day = (end - np.timedelta64(1, 's')).astype('datetime64[D]')
+    days_between = np.maximum((last_day - start.astype('datetime64[D]')) // ONE_DAY, 0)
+
+    # Exponential bias toward recent dates, clipped to the range
+    random_days = rng.exponential(days_between / 2).astype(np.int64)
+    random_days = np.minimum(random_days, days_between)
+
+    first_day = start.astype('datetime64[D]')
+    days = first_day + random_days
+
+    # Weekend dates random-walk a day at a time until they hit a weekday,
+    # stepping inward at the ends of the range (ranges of only weekend
+    # days keep their weekend date)
+    has_weekday = (days_between >= 2) | (weekdays(first_day) < 5) | (weekdays(last_day) < 5)
+    weekend = has_weekday & (weekdays(days) >= 5)
+    while weekend.any():
+        steps = np.where(rng.random(weekend.sum()) < 0.5, -1, 1)
+        steps = np.where(days[weekend] >= last_day[weekend], -1, steps)
+        steps = np.where(days[weekend] <= first_day[weekend], 1, steps)
+        days[weekend] += steps
+        weekend = has_weekday & (weekdays(days) >= 5)
+
+    return np.clip(days.astype('datetime64[s]') + random_workday_times(n, rng), start, end)
+
+
+def avoid_weekends(dates):
+    """
+    Batch version of avoid_weekend: shift Saturdays and Sundays to Friday.
+
+    Args:
+        dates: datetime64 array (NaT is passed through)
+
+    Returns:
+        ndarray: Adjusted datetime64[s] array
+    """
+    dates = _as_datetime64(dates)
+    shift = np.select([weekdays(dates) == 5, weekdays(dates) == 6], [1, 2], 0)
+    return dates - shift.astype('timedelta64[D]')
+
+
+def align_to_sprint_boundaries(dates):
+    """
+    Batch version of align_to_sprint_boundary.
+
+    Args:
+        dates: datetime64 array (NaT is passed through)
+
+    Returns:
+        ndarray: datetime64[s] array snapped to sprint ends where within 3 days
+    """
+    dates = _as_datetime64(dates)
+    days_since_start = (dates - np.datetime64(WORKSPACE_START_DATE, 's')) // ONE_DAY
+    days_to_next_boundary = SPRINT_DURATION_DAYS - (days_since_start % SPRINT_DURATION_DAYS)
+    snap = days_to_next_boundary <= 3
+    return dates + np.where(snap, days_to_next_boundary, 0).astype('timedelta64[D]')
+
+
+def generate_due_dates(created_at, project_type='sprint', rng=None):
+    """
+    Batch version of generate_due_date, with the same due date buckets.
+
+    Args:
+        created_at: datetime64 array of creation timestamps
+        project_type: Project type, or an array of them (one per date)
+        rng: numpy Generator to draw from
+
+    Returns:
+        ndarray: datetime64[s] due dates, NaT where there is no due date
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    created_at = _as_datetime64(created_at)
+    n = created_at.shape[0]
+
+    overdue = DUE_DATE_DISTRIBUTION['overdue']
+    week_1 = overdue + DUE_DATE_DISTRIBUTION['week_1']
+    month_1 = week_1 + DUE_DATE_DISTRIBUTION['month_1']
+    months_1_3 = month_1 + DUE_DATE_DISTRIBUTION['months_1_3']
+
+    rand = rng.random(n)
+    conditions = [rand < overdue, rand < week_1, rand < month_1, rand < months_1_3]
+    days_offset = np.select(
+        conditions,
+        [
+            -rng.integers(1, 31, n),
+            rng.integers(1, 8, n),
+            rng.integers(8, 31, n),
+            rng.integers(31, 91, n)
+        ],
+        0
+    )
+    has_due_date = np.logical_or.reduce(conditions)
+
+    due_dates = created_at + days_offset.astype('timedelta64[D]')
+
+    avoid = rng.random(n) < AVOID_WEEKEND_DUE_DATES
+    due_dates = np.where(avoid, avoid_weekends(due_dates), due_dates)
+
+    is_sprint = np.broadcast_to(np.asarray(project_type) == 'sprint', (n,))
+    due_dates = np.where(is_sprint, align_to_sprint_boundaries(due_dates), due_dates)
+
+    return np.where(has_due_date, due_dates, np.datetime64('NaT', 's'))
+
+
+def generate_completion_dates(
+    created_at,
+    due_dates=None,
+    rng=None,
+    current_date=None,
+    open_past_current=False
+):
+    """
+    Batch version of generate_completion_date (log-normal cycle times).
+
+    Args:
+        created_at: datetime64 array of creation timestamps
+        due_dates: datetime64 array of due dates, NaT where there is none
+        rng: numpy Generator to draw from
+        current_date: Latest possible completion (default: CURRENT_DATE)
+        open_past_current: Return NaT (task still open) for completions
+            that would land after current_date, instead of pulling them
+            back before it
+
+    Returns:
+        ndarray: datetime64[s] completion timestamps
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    created_at = _as_datetime64(created_at)
+    n = created_at.shape[0]
+
+    days_to_complete = rng.lognormal(
+        mean=COMPLETION_TIME_MEAN / 3,
+        sigma=COMPLETION_TIME_STDDEV / 5,
+        size=n
+    )
+    days_to_complete = np.clip(days_to_complete.astype(np.int64), 1, 30)
+    completed_at = created_at + days_to_complete.astype('timedelta64[D]')
+
+    # Ensure completion is before current date
+    current = np.datetime64(CURRENT_DATE if current_date is None else current_date, 's')
+    pulled_back = np.maximum(created_at, current - rng.integers(1, 8, n).astype('timedelta64[D]'))
+    if not open_past_current:
+        completed_at = np.where(completed_at > current, pulled_back, completed_at)
+
+    # 80% of tasks with a due date finish before it
+    if due_dates is not None:
+        due_dates = _as_datetime64(due_dates)
+        before_due = (
+            ~np.isnat(due_dates)
+            & (rng.random(n) < 0.8)
+            & (completed_at > due_dates)
+            & (due_dates > created_at)
+        )
+        seconds_before_due = np.where(
+            np.isnat(due_dates),
+            0,
+            (due_dates - created_at).astype(np.int64)
+        )
+        random_seconds = rng.random(n) * seconds_before_due
+        adjusted = created_at + random_seconds.astype('timedelta64[s]')
+        completed_at = np.where(before_due, adjusted, completed_at)
+
+    completed_at = completed_at.astype('datetime64[D]').astype('datetime64[s]') + random_workday_times(n, rng)
+    # The time of day can put a same-day completion before its creation
+    completed_at = np.maximum(completed_at, created_at)
+
+    if open_past_current:
+        completed_at = np.where(completed_at > current, np.datetime64('NaT', 's'), completed_at)
+    else:
+        completed_at = np.minimum(completed_at, np.maximum(created_at, current))
+    return completed_at
+
+
+def random_datetimes_between(start, end, n, rng=None):
+    """
+    Draw n timestamps uniformly between start and end.
+
+    Args:
+        start: datetime or datetime64 array broadcastable to n
+        end: Same forms; must not be before start
+        n: Number of draws
+        rng: numpy Generator to draw from
+
+    Returns:
+        ndarray: datetime64[s] timestamps
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    start = np.broadcast_to(_as_datetime64(start), (n,))
+    seconds = (np.broadcast_to(_as_datetime64(end), (n,)) - start).astype(np.int64)
+    return start + (rng.random(n) * seconds).astype('timedelta64[s]')
+
+
+def to_datetimes(dates):
+    """
+    Convert a datetime64 array to a list of datetime objects (None for NaT),
+    the form the database writer binds.
+
+    Args:
+        dates: datetime64 array
+
+    Returns:
+        list: datetime or None per element
+    """
+    return _as_datetime64(dates).tolist()
@@ -1,29 +1,446 @@
 """
 Database utility functions for SQLite operations.
+
+The storage backend is pluggable: every function that opens, creates or
+loads a database takes backend="sqlite" (default) or "duckdb". DuckDB
+uses the same schema.sql and is loaded through Arrow (see
+duckdb_utils.py); its module is only imported when it is selected.
 """
 
+import re
 import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from src.config import DATABASE_PATH
+from src.config import (
+    DATABASE_PATH,
+    DATABASE_BACKEND,
+    SCHEMA_PATH,
+    INDEXES_PATH,
+    UNIQUE_INDEXES_PATH,
+    DEFERRED_UNIQUE_TABLES,
+    BULK_INSERT_BATCH_SIZE,
+    LOAD_PRAGMAS
+)
+
 
+BACKENDS = ("sqlite", "duckdb")
 
-def get_connection():
+
+def get_connection(path=DATABASE_PATH, backend=DATABASE_BACKEND):
     """
-    Create and return a SQLite database connection.
+    Create and return a database connection.
+
+    Args:
+        path: Database file
+        backend: One of BACKENDS
     """
-    Path("output").mkdir(exist_ok=True)
-    return sqlite3.connect(DATABASE_PATH)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
 
+    if backend == "duckdb":
+        from src.utils import duckdb_utils
+        return duckdb_utils.connect(path)
+    if backend != "sqlite":
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
+    return sqlite3.connect(path)
 
-def initialize_database():
+
+def initialize_database(path=DATABASE_PATH, defer_unique=False, backend=DATABASE_BACKEND):
     """
     Initialize database by executing schema.sql.
+
+    Any existing database at the path is replaced, so every run starts
+    from an empty workspace.
+
+    Args:
+        path: Database file
+        defer_unique: Create DEFERRED_UNIQUE_TABLES without their UNIQUE
+            constraints; finalize_database(defer_unique=True) builds them
+            as unique indexes after the load
+        backend: One of BACKENDS
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    Path(path).unlink(missing_ok=True)
+    if backend == "duckdb":
+        Path(f"{path}.wal").unlink(missing_ok=True)
+
+    conn = get_connection(path, backend)
 
-    with open("schema.sql", "r") as f:
-        cursor.executescript(f.read())
+    with open(SCHEMA_PATH, "r") as f:
+        sql = f.read()
+
+    if defer_unique:
+        sql = strip_unique_constraints(sql, DEFERRED_UNIQUE_TABLES)
+
+    execute_script(conn, sql)
 
     conn.commit()
     return conn
+
+
+def open_database(path=DATABASE_PATH, backend=DATABASE_BACKEND):
+    """
+    Open an existing generated database without touching its contents.
+
+    Args:
+        path: Database file
+        backend: One of BACKENDS
+
+    Raises:
+        FileNotFoundError: If there is no database at the path
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(f"{path} not found; build it first with python -m src.main")
+    return get_connection(path, backend)
+
+
+def fetch_rows(conn, sql, params=()):
+    """
+    Run a query on either backend and return its rows as dicts.
+
+    Args:
+        conn: Database connection
+        sql: SELECT statement
+        params: Query parameters
+
+    Returns:
+        list: {column_name: value} per row
+    """
+    cursor = conn.execute(sql, params)
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def execute_script(conn, sql):
+    """
+    Run a multi-statement SQL script on either backend.
+    """
+    if isinstance(conn, sqlite3.Connection):
+        conn.executescript(sql)
+    else:
+        conn.execute(sql)
+
+
+def create_writer(conn, batch_size=BULK_INSERT_BATCH_SIZE):
+    """
+    Return the bulk writer for a connection's backend: a BulkWriter for
+    SQLite, a duckdb_utils.DuckDBWriter (Arrow ingestion) for DuckDB.
+    """
+    if isinstance(conn, sqlite3.Connection):
+        return BulkWriter(conn, batch_size)
+
+    from src.utils.duckdb_utils import DuckDBWriter
+    return DuckDBWriter(conn)
+
+
+def strip_unique_constraints(sql, tables):
+    """
+    Remove the table-level UNIQUE(...) constraints of some tables from a
+    schema script.
+
+    Args:
+        sql: Schema script
+        tables: Table names
+
+    Returns:
+        str: The script without those constraints
+    """
+    for table in tables:
+        sql = re.sub(
+            rf"(CREATE TABLE IF NOT EXISTS {table}\s*\((?:(?!\);).)*?),\s*UNIQUE\s*\([^)]*\)\s*(\);)",
+            r"\1\n\2",
+            sql,
+            flags=re.DOTALL | re.IGNORECASE
+        )
+    return sql
+
+
+def finalize_database(conn, defer_unique=False):
+    """
+    Build the secondary indexes (indexes.sql) after the bulk load, plus
+    the deferred UNIQUE indexes (unique_indexes.sql) if the schema was
+    created with defer_unique, then ANALYZE so the planner has statistics.
+
+    Args:
+        conn: SQLite connection
+        defer_unique: Also run unique_indexes.sql
+
+    Raises:
+        sqlite3.IntegrityError: If a deferred UNIQUE constraint is violated
+    """
+    scripts = [UNIQUE_INDEXES_PATH, INDEXES_PATH] if defer_unique else [INDEXES_PATH]
+
+    for script in scripts:
+        with open(script, "r") as f:
+            execute_script(conn, f.read())
+
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+# -----------------------------------------------------------------------------
+# SCHEMA INTROSPECTION
+# -----------------------------------------------------------------------------
+
+_CREATE_TABLE_RE = re.compile(
+    r"CREATE TABLE IF NOT EXISTS (\w+)\s*\((.*?)\);",
+    re.DOTALL | re.IGNORECASE
+)
+
+_TABLE_CONSTRAINT_PREFIXES = ("FOREIGN", "UNIQUE", "PRIMARY", "CHECK", "CONSTRAINT")
+
+
+@lru_cache(maxsize=None)
+def load_schema(schema_path=SCHEMA_PATH):
+    """
+    Parse schema.sql into column definitions.
+
+    Args:
+        schema_path: Path to the schema file
+
+    Returns:
+        dict: {table_name: ((column_name, column_type), ...)} in declaration order
+    """
+    with open(schema_path, "r") as f:
+        sql = f.read()
+
+    schema = {}
+    for table, body in _CREATE_TABLE_RE.findall(sql):
+        columns = []
+        for line in body.splitlines():
+            line = line.strip().rstrip(",")
+            if not line or line.upper().startswith(_TABLE_CONSTRAINT_PREFIXES):
+                continue
+            parts = line.split()
+            columns.append((parts[0], parts[1].upper()))
+        schema[table] = tuple(columns)
+
+    return schema
+
+
+def get_table_columns(table):
+    """
+    Return the column names of a table, in schema order.
+
+    Args:
+        table: Table name as declared in schema.sql
+
+    Returns:
+        tuple: Column names
+    """
+    return tuple(name for name, _ in load_schema()[table])
+
+
+# -----------------------------------------------------------------------------
+# BULK LOADING
+# -----------------------------------------------------------------------------
+
+def iter_batches(rows, batch_size):
+    """
+    Split an iterable into lists of at most batch_size items.
+
+    Args:
+        rows: Any iterable (lists and generators alike)
+        batch_size: Maximum items per batch
+
+    Yields:
+        list: The next batch
+    """
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+@contextmanager
+def load_pragmas(conn, pragmas=None):
+    """
+    Apply load-time PRAGMAs and restore the previous values on exit.
+
+    The pending transaction is committed before the PRAGMAs are restored,
+    since journal_mode cannot change inside a transaction. PRAGMAs are
+    SQLite-only; other backends just commit on exit.
+
+    Args:
+        conn: SQLite connection
+        pragmas: {pragma: value} (default: LOAD_PRAGMAS)
+    """
+    if not isinstance(conn, sqlite3.Connection):
+        try:
+            yield conn
+        finally:
+            conn.commit()
+        return
+
+    if pragmas is None:
+        pragmas = LOAD_PRAGMAS
+
+    previous = {
+        name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+        for name in pragmas
+    }
+
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+    try:
+        yield conn
+    finally:
+        conn.commit()
+        for name, value in previous.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+
+def report_write_stats(stats):
+    """
+    Print rows written and write throughput per table.
+
+    Args:
+        stats: A writer's {table: {"rows", "seconds"}}
+    """
+    print("Rows written:")
+    for table, table_stats in stats.items():
+        rows = table_stats["rows"]
+        rate = rows / table_stats["seconds"] if table_stats["seconds"] else 0.0
+        print(f"  {table:<26} {rows:>10,} rows  {rate:>12,.0f} rows/s")
+
+
+class BulkWriter:
+    """
+    Table-aware bulk writer.
+
+    Rows for a table are given as dicts (keyed by column name) or tuples
+    (in column order), split into batches and inserted with executemany.
+    The INSERT statement for each (table, columns) pair is built once and
+    reused, so SQLite's statement cache keeps it prepared across batches.
+    """
+
+    def __init__(self, conn, batch_size=BULK_INSERT_BATCH_SIZE):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.stats = {}
+        self._statements = {}
+
+    def _statement(self, table, columns):
+        key = (table, columns)
+        if key not in self._statements:
+            placeholders = ", ".join("?" * len(columns))
+            self._statements[key] = (
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({placeholders})"
+            )
+        return self._statements[key]
+
+    def write(self, table, rows, columns=None):
+        """
+        Insert rows into a table.
+
+        Args:
+            table: Table name
+            rows: Iterable of dicts or tuples
+            columns: Column names for tuple rows, or the subset to take
+                from dict rows (default: every column in the schema)
+
+        Returns:
+            int: Number of rows written
+        """
+        columns = tuple(columns) if columns else get_table_columns(table)
+        sql = self._statement(table, columns)
+        cursor = self.conn.cursor()
+
+        written = 0
+        for batch in iter_batches(rows, self.batch_size):
+            if isinstance(batch[0], dict):
+                batch = [tuple(map(row.get, columns)) for row in batch]
+
+            start = time.perf_counter()
+            cursor.executemany(sql, batch)
+            self._record(table, len(batch), time.perf_counter() - start)
+            written += len(batch)
+
+        return written
+
+    def write_columns(self, table, columns):
+        """
+        Insert a columnar batch into a table.
+
+        Args:
+            table: Table name
+            columns: {column_name: ndarray or list}; columns of the table
+                missing from the batch are written as NULL
+
+        Returns:
+            int: Number of rows written
+        """
+        names = [c for c in get_table_columns(table) if c in columns]
+        values = [
+            columns[c].tolist() if hasattr(columns[c], "tolist") else columns[c]
+            for c in names
+        ]
+        return self.write(table, zip(*values), columns=names)
+
+    def _record(self, table, rows, seconds):
+        table_stats = self.stats.setdefault(table, {"rows": 0, "seconds": 0.0})
+        table_stats["rows"] += rows
+        table_stats["seconds"] += seconds
+
+    def report(self):
+        """
+        Print rows written and insert throughput per table.
+        """
+        report_write_stats(self.stats)
+
+
+class MultiWriter:
+    """
+    Sends every write to several writers, e.g. a BulkWriter for SQLite and
+    a parquet_utils.ParquetWriter, so one pass over the generators fills
+    all outputs. Streamed rows are split into batches once and each batch
+    is handed to every writer.
+
+    stats reports the first writer's row counts, with the time spent in
+    all writers.
+    """
+
+    def __init__(self, *writers, batch_size=BULK_INSERT_BATCH_SIZE):
+        self.writers = writers
+        self.batch_size = batch_size
+
+    def write(self, table, rows, columns=None):
+        written = 0
+        for batch in iter_batches(rows, self.batch_size):
+            for writer in self.writers:
+                writer.write(table, batch, columns)
+            written += len(batch)
+        return written
+
+    def write_columns(self, table, columns):
+        for writer in self.writers:
+            written = writer.write_columns(table, columns)
+        return written
+
+    @property
+    def stats(self):
+        merged = {}
+        for table, table_stats in self.writers[0].stats.items():
+            merged[table] = {
+                "rows": table_stats["rows"],
+                "seconds": sum(
+                    w.stats.get(table, {}).get("seconds", 0.0) for w in self.writers
+                )
+            }
+        return merged
+
+    def report(self):
+        report_write_stats(self.stats)
+
+    def close(self):
+        """
+        Close every writer that needs it (flushing buffered output).
+        """
+        for writer in self.writers:
+            if hasattr(writer, "close"):
+                writer.close()
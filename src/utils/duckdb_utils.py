@@ -0,0 +1,100 @@
+"""
+DuckDB storage backend.
+
+Same schema.sql as SQLite; rows are loaded through Arrow: each table is
+buffered as record batches (see arrow_utils.py) and ingested with
+INSERT ... BY NAME SELECT from the registered Arrow table, instead of
+row-by-row inserts. Selected with --backend duckdb (see db_utils).
+
+Requires duckdb and pyarrow (optional dependencies).
+"""
+
+import re
+import time
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+from src.utils.db_utils import load_schema
+from src.utils.arrow_utils import ArrowBatchWriter
+from src.config import DUCKDB_FLUSH_ROWS
+
+
+# Self-referencing foreign keys: DuckDB checks them per statement, so rows
+# without a parent are inserted before the rows that point at them
+SELF_REFERENCES = {"tasks": "parent_task_id"}
+
+
+def connect(path):
+    """
+    Open a DuckDB database file.
+    """
+    if duckdb is None:
+        raise ImportError("The DuckDB backend requires duckdb (pip install duckdb)")
+    return duckdb.connect(str(path))
+
+
+def drop_indexes_covering(conn, table, columns):
+    """
+    Drop a table's secondary indexes that include any of the given columns.
+
+    DuckDB runs an UPDATE of an indexed column as a delete plus insert,
+    which fails for rows other tables reference by foreign key; with the
+    covering indexes gone the update happens in place. finalize_database
+    recreates them (indexes.sql uses IF NOT EXISTS).
+
+    Returns:
+        list: Names of the dropped indexes
+    """
+    pattern = re.compile(rf"\b({'|'.join(map(re.escape, columns))})\b")
+    dropped = []
+    for name, sql in conn.execute(
+        "SELECT index_name, sql FROM duckdb_indexes() WHERE table_name = ?", [table]
+    ).fetchall():
+        if sql and pattern.search(sql.split("(", 1)[-1]):
+            conn.execute(f"DROP INDEX {name}")
+            dropped.append(name)
+    return dropped
+
+
+class DuckDBWriter(ArrowBatchWriter):
+    """
+    Arrow bulk loader for a DuckDB connection.
+
+    Tables are flushed together, parents before children (schema order),
+    whenever one table's buffer reaches flush_rows, so foreign keys always
+    point at rows that are already loaded.
+    """
+
+    def __init__(self, conn, flush_rows=DUCKDB_FLUSH_ROWS):
+        super().__init__(flush_rows=flush_rows)
+        self.conn = conn
+
+    def _flush(self, table=None):
+        for name in load_schema():
+            data = self._take_buffer(name)
+            if data is None:
+                continue
+
+            if name in SELF_REFERENCES:
+                parent = SELF_REFERENCES[name]
+                filters = [f"WHERE {parent} IS NULL", f"WHERE {parent} IS NOT NULL"]
+            else:
+                filters = [""]
+
+            start = time.perf_counter()
+            self.conn.register("arrow_batch", data)
+            try:
+                for where in filters:
+                    self.conn.execute(f"INSERT INTO {name} BY NAME SELECT * FROM arrow_batch {where}")
+            finally:
+                self.conn.unregister("arrow_batch")
+            self._record(name, 0, time.perf_counter() - start)
+
+    def close(self):
+        """
+        Load everything still buffered.
+        """
+        self._flush()
@@ -0,0 +1,320 @@
+"""
+Copy-on-write episode sessions over a shared, read-only base database.
+
+Most agent episodes change only a handful of rows (complete a task, add a
+comment), so copying the whole database per episode (see
+snapshot_utils.SnapshotPool) is wasted I/O. An EpisodeSession instead
+opens an in-memory database, ATTACHes the generated database read-only
+as "base", and puts a view named after every table in front of it.
+INSTEAD OF triggers on the views send the episode's INSERT / UPDATE /
+DELETE statements to in-memory overlay tables: <table>_added holds new
+and changed rows, <table>_deleted the primary keys of hidden base rows.
+The agent reads and writes the usual table names.
+
+A table's view stays a plain SELECT from the base until the episode
+may write to it, so reads use the base indexes at full speed. Before
+running SQL that may write (an INSERT / UPDATE / DELETE / REPLACE
+statement, or a script containing one), the session switches the views
+of the tables the SQL names to
+
+    base.<table> minus <table>_deleted  UNION ALL  <table>_added
+
+so later statements of the same executemany / executescript call see
+the earlier ones' writes. SQLite can't push join terms into a compound
+view, so only tables that may have been written pay for the union. reset() empties the overlay and restores the
+plain views: its cost is the size of the episode's changes, not of the
+dataset, and the base file is never written, so any number of sessions
+(and processes) can share it at once.
+
+The overlay enforces primary keys; foreign keys are not checked (the
+generator doesn't enable them either). Omitted columns get the schema's
+default values.
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+from urllib.parse import quote
+
+from src.config import DATABASE_PATH
+
+
+# SQL that may write, and the identifiers it names
+_WRITE_KEYWORD = re.compile(r"\b(?:INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+_IDENTIFIER = re.compile(r"\w+")
+
+
+class OverlayCursor(sqlite3.Cursor):
+    """
+    Cursor that lets its session switch views before SQL that may write
+    to the overlay, and after statements that did.
+    """
+
+    def execute(self, sql, parameters=()):
+        self.connection._before_statement(sql)
+        result = super().execute(sql, parameters)
+        self.connection._after_statement()
+        return result
+
+    def executemany(self, sql, parameters):
+        self.connection._before_statement(sql)
+        result = super().executemany(sql, parameters)
+        self.connection._after_statement()
+        return result
+
+    def executescript(self, sql):
+        self.connection._before_statement(sql)
+        result = super().executescript(sql)
+        self.connection._after_statement()
+        return result
+
+
+class OverlayConnection(sqlite3.Connection):
+    """
+    Connection of an EpisodeSession. Every statement goes through an
+    OverlayCursor, so the views are current for the next read whichever
+    way the agent runs its SQL.
+    """
+
+    session = None
+
+    def cursor(self, factory=OverlayCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters):
+        return self.cursor().executemany(sql, parameters)
+
+    def executescript(self, sql):
+        return self.cursor().executescript(sql)
+
+    def _before_statement(self, sql):
+        if self.session is not None:
+            self.session._prepare_views(sql)
+
+    def _after_statement(self):
+        if self.session is not None and self.total_changes != self.session._seen_changes:
+            self.session._refresh_views()
+
+
+class EpisodeSession:
+    """
+    One agent's view of the workspace: the shared base plus its own
+    overlay of changes.
+
+    Usage:
+        with EpisodeSession("output/asana_simulation.sqlite") as session:
+            for _ in range(episodes):
+                run_episode(session.conn)
+                session.reset()
+    """
+
+    def __init__(self, db_path=DATABASE_PATH, immutable=True):
+        """
+        Args:
+            db_path: Generated database used as the read-only base
+            immutable: Open the base with immutable=1, skipping file locks
+                (only safe while nothing writes the base file)
+        """
+        db_path = Path(db_path)
+        if not db_path.exists():
+            raise FileNotFoundError(f"{db_path} not found; build it first with python -m src.main")
+
+        self.db_path = db_path
+        self.conn = sqlite3.connect(
+            "file::memory:",
+            uri=True,
+            check_same_thread=False,
+            factory=OverlayConnection
+        )
+
+        flags = "mode=ro&immutable=1" if immutable else "mode=ro"
+        self.conn.execute("ATTACH DATABASE ? AS base", (f"file:{quote(str(db_path.resolve()))}?{flags}",))
+        self.conn.execute("CREATE TABLE main.overlay_dirty (name TEXT PRIMARY KEY)")
+
+        self.tables = [
+            name for (name,) in self.conn.execute(
+                "SELECT name FROM base.sqlite_master "
+                "WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )
+        ]
+        self._table_names = {table.lower(): table for table in self.tables}
+        self._sql = {}
+        for table in self.tables:
+            self._create_overlay(table)
+        self.conn.commit()
+
+        self._seen_changes = self.conn.total_changes
+        self.conn.session = self
+
+    # -------------------------------------------------------------------------
+    # OVERLAY SCHEMA
+    # -------------------------------------------------------------------------
+
+    def _create_overlay(self, table):
+        columns = self.conn.execute(f"PRAGMA base.table_info({table})").fetchall()
+        keys = [name for _, name, _, _, _, pk in columns if pk]
+        if len(keys) != 1:
+            raise ValueError(f"{table} needs a single-column primary key for an overlay")
+        key = keys[0]
+
+        column_list = ", ".join(name for _, name, _, _, _, _ in columns)
+        definitions = ", ".join(
+            f"{name} {col_type}{' PRIMARY KEY' if pk else ''}"
+            for _, name, col_type, _, _, pk in columns
+        )
+        new_values = ", ".join(
+            f"COALESCE(NEW.{name}, {default})" if default is not None else f"NEW.{name}"
+            for _, name, _, _, default, _ in columns
+        )
+        duplicate = (
+            f"SELECT RAISE(ABORT, 'UNIQUE constraint failed: {table}.{key}') "
+            f"WHERE EXISTS (SELECT 1 FROM {table} WHERE {key} = NEW.{key})"
+        )
+        mark_dirty = f"INSERT OR IGNORE INTO overlay_dirty (name) VALUES ('{table}')"
+        # Only base rows need hiding; overlay-only rows just leave _added
+        hide_base_row = (
+            f"INSERT OR IGNORE INTO {table}_deleted ({key}) "
+            f"SELECT OLD.{key} WHERE EXISTS (SELECT 1 FROM base.{table} WHERE {key} = OLD.{key})"
+        )
+
+        self._sql[table] = {
+            "plain": f"CREATE TEMP VIEW {table} AS SELECT {column_list} FROM base.{table}",
+            "union": f"""
+                CREATE TEMP VIEW {table} AS
+                    SELECT {column_list} FROM base.{table}
+                    WHERE {key} NOT IN (SELECT {key} FROM main.{table}_deleted)
+                    UNION ALL
+                    SELECT {column_list} FROM main.{table}_added
+            """,
+            "triggers": [
+                f"""
+                CREATE TEMP TRIGGER {table}_insert INSTEAD OF INSERT ON {table}
+                BEGIN
+                    {duplicate};
+                    INSERT INTO {table}_added ({column_list}) VALUES ({new_values});
+                    {mark_dirty};
+                END
+                """,
+                f"""
+                CREATE TEMP TRIGGER {table}_update INSTEAD OF UPDATE ON {table}
+                BEGIN
+                    {duplicate} AND NEW.{key} IS NOT OLD.{key};
+                    {hide_base_row};
+                    DELETE FROM {table}_added WHERE {key} = OLD.{key};
+                    INSERT INTO {table}_added ({column_list}) VALUES ({new_values});
+                    {mark_dirty};
+                END
+                """,
+                f"""
+                CREATE TEMP TRIGGER {table}_delete INSTEAD OF DELETE ON {table}
+                BEGIN
+                    {hide_base_row};
+                    DELETE FROM {table}_added WHERE {key} = OLD.{key};
+                    {mark_dirty};
+                END
+                """
+            ]
+        }
+
+        self.conn.execute(f"CREATE TABLE main.{table}_added ({definitions})")
+        self.conn.execute(f"CREATE TABLE main.{table}_deleted ({key} PRIMARY KEY)")
+        self._set_view(table, "plain")
+
+    def _set_view(self, table, mode):
+        # A plain cursor: these statements must not re-enter _after_statement
+        cursor = sqlite3.Cursor(self.conn)
+        cursor.execute(f"DROP VIEW IF EXISTS temp.{table}")  # Drops its triggers too
+        cursor.execute(self._sql[table][mode])
+        for trigger in self._sql[table]["triggers"]:
+            cursor.execute(trigger)
+
+    def _union_views(self):
+        """
+        Tables whose view currently includes the overlay. Read from the
+        schema rather than tracked, since a rollback also undoes view
+        changes.
+        """
+        cursor = sqlite3.Cursor(self.conn)
+        return {
+            name for (name,) in cursor.execute(
+                "SELECT name FROM sqlite_temp_master WHERE type = 'view' AND sql LIKE '%UNION ALL%'"
+            )
+        }
+
+    def _prepare_views(self, sql):
+        """
+        Switch the views of the tables that SQL about to run may write to
+        the union form. Every overlay table the SQL names counts, which
+        can switch a table that is only read (costing read speed, never
+        correctness).
+        """
+        if not _WRITE_KEYWORD.search(sql):
+            return
+        named = {
+            self._table_names[word.lower()]
+            for word in _IDENTIFIER.findall(sql)
+            if word.lower() in self._table_names
+        }
+        for table in sorted(named - self._union_views()):
+            self._set_view(table, "union")
+
+    def _refresh_views(self):
+        """
+        Switch the views of tables written since the last check to the
+        union form (writes _prepare_views didn't foresee, e.g. by the
+        agent's own triggers).
+        """
+        cursor = sqlite3.Cursor(self.conn)
+        dirty = {name for (name,) in cursor.execute("SELECT name FROM main.overlay_dirty")}
+        for table in sorted(dirty - self._union_views()):
+            self._set_view(table, "union")
+        self._seen_changes = self.conn.total_changes
+
+    # -------------------------------------------------------------------------
+    # EPISODES
+    # -------------------------------------------------------------------------
+
+    def changes(self):
+        """
+        Count the episode's changes per table.
+
+        Returns:
+            dict: {table: {"written": rows added or changed,
+                "hidden": base rows changed or deleted}} for touched tables
+        """
+        cursor = sqlite3.Cursor(self.conn)
+        counts = {}
+        for table in sorted(self._union_views()):
+            written = cursor.execute(f"SELECT COUNT(*) FROM main.{table}_added").fetchone()[0]
+            hidden = cursor.execute(f"SELECT COUNT(*) FROM main.{table}_deleted").fetchone()[0]
+            if written or hidden:
+                counts[table] = {"written": written, "hidden": hidden}
+        return counts
+
+    def reset(self):
+        """
+        Discard the episode's changes, restoring the pristine workspace.
+        Only the tables the episode wrote are touched.
+        """
+        self.conn.commit()
+
+        cursor = sqlite3.Cursor(self.conn)
+        for table in sorted(self._union_views()):
+            cursor.execute(f"DELETE FROM main.{table}_added")
+            cursor.execute(f"DELETE FROM main.{table}_deleted")
+            self._set_view(table, "plain")
+        cursor.execute("DELETE FROM main.overlay_dirty")
+        self.conn.commit()
+        self._seen_changes = self.conn.total_changes
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,216 @@
+"""
+ID generation for every table.
+
+All generators get their primary keys from generate_id / generate_ids,
+which produce one of three formats (ID_FORMAT in config, or --id-format):
+
+- "uuid":    version-4 UUID strings, e.g. "0f8b6c1e-5a2d-4c3b-9e7f-1a2b3c4d5e6f"
+- "compact": the same 128 random bits as 32 hex characters, no dashes
+- "gid":     Asana-style numeric GIDs, e.g. "1204000000000137", taken from
+             a monotonic counter per kind of object
+
+UUIDs are drawn from the caller's seeded stream, so they are reproducible;
+batches are built from one buffer of random bytes and formatted with NumPy
+rather than one uuid.uuid4() (and one os.urandom call) per row.
+"""
+
+import os
+import numpy as np
+from src.config import ID_FORMAT
+
+
+ID_FORMATS = ("uuid", "compact", "gid")
+
+# Object kinds that get IDs. Each kind owns a block of GIDs so numeric IDs
+# are unique across kinds, as Asana GIDs are.
+ID_KINDS = (
+    "workspace",
+    "user",
+    "team",
+    "team_membership",
+    "project",
+    "section",
+    "task",
+    "comment",
+    "custom_field",
+    "custom_field_value",
+    "tag",
+    "task_tag",
+    "attachment"
+)
+
+GID_BASE = 1_200_000_000_000_000
+GID_BLOCK_SIZE = 1_000_000_000_000
+# Multi-workspace runs give workspace i the GIDs from i * GID_WORKSPACE_STRIDE
+# within each kind's block, so workspaces built in parallel never collide
+GID_WORKSPACE_STRIDE = 1_000_000_000
+
+_HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+# (start, end, offset into the 32 hex digits) of each group in the 36-char form
+_UUID_GROUPS = ((0, 8, 0), (9, 13, 8), (14, 18, 12), (19, 23, 16), (24, 36, 20))
+
+_id_format = ID_FORMAT
+_gid_counters = {}
+_gid_start = 0
+
+
+def set_id_format(id_format):
+    """
+    Select the ID format for subsequent calls.
+
+    Args:
+        id_format: One of ID_FORMATS
+    """
+    global _id_format
+    if id_format not in ID_FORMATS:
+        raise ValueError(f"Unknown ID format {id_format!r}; expected one of {ID_FORMATS}")
+    _id_format = id_format
+
+
+def get_id_format():
+    """
+    Return the current ID format.
+    """
+    return _id_format
+
+
+def reset_id_counters(start=0):
+    """
+    Restart every GID counter at the start of its block, or `start`
+    GIDs into it.
+    """
+    global _gid_start
+    _gid_start = start
+    _gid_counters.clear()
+
+
+def detect_id_format(sample_id):
+    """
+    Tell which format an existing ID was generated in.
+
+    Args:
+        sample_id: Any ID from a generated database
+
+    Returns:
+        str: One of ID_FORMATS
+    """
+    sample_id = str(sample_id)
+    if sample_id.isdigit():
+        return "gid"
+    if len(sample_id) == 32:
+        return "compact"
+    return "uuid"
+
+
+def advance_gid_counter(kind, last_gid):
+    """
+    Move a kind's GID counter past an existing GID, so new IDs continue
+    after the ones already in a database (see append.py).
+
+    Args:
+        kind: One of ID_KINDS
+        last_gid: Highest GID of that kind in use (None: nothing to skip)
+    """
+    if last_gid is None:
+        return
+    block_start = GID_BASE + ID_KINDS.index(kind) * GID_BLOCK_SIZE
+    _gid_counters[kind] = max(_gid_counters.get(kind, _gid_start), int(last_gid) - block_start + 1)
+
+
+def generate_ids(kind, n, rng=None):
+    """
+    Generate n IDs for a kind of object in the current format.
+
+    Args:
+        kind: One of ID_KINDS
+        n: Number of IDs
+        rng: random.Random or numpy Generator for UUID formats; ignored for
+            GIDs. Without one, UUIDs come from os.urandom.
+
+    Returns:
+        list: ID strings
+    """
+    if _id_format == "gid":
+        return gid_strings(kind, n)
+    return uuid_strings(n, rng, compact=_id_format == "compact")
+
+
+def generate_id(kind, rng=None):
+    """
+    Generate a single ID for a kind of object in the current format.
+
+    Args:
+        kind: One of ID_KINDS
+        rng: random.Random or numpy Generator (see generate_ids)
+
+    Returns:
+        str: ID
+    """
+    if _id_format == "gid":
+        return gid_strings(kind, 1)[0]
+
+    raw = bytearray(_random_bytes(rng, 16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # Version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.hex()
+
+    if _id_format == "compact":
+        return h
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def uuid_strings(n, rng=None, compact=False):
+    """
+    Generate n version-4 UUID strings from one buffer of random bytes.
+
+    Args:
+        n: Number of UUIDs
+        rng: random.Random or numpy Generator to draw from (default: os.urandom)
+        compact: Return 32 hex characters without dashes
+
+    Returns:
+        list: UUID strings
+    """
+    raw = np.frombuffer(_random_bytes(rng, 16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # Version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+
+    hex_chars = np.empty((n, 32), dtype=np.uint8)
+    hex_chars[:, 0::2] = _HEX_DIGITS[raw >> 4]
+    hex_chars[:, 1::2] = _HEX_DIGITS[raw & 0x0F]
+
+    if compact:
+        chars = hex_chars
+    else:
+        chars = np.full((n, 36), ord("-"), dtype=np.uint8)
+        for start, end, hex_start in _UUID_GROUPS:
+            chars[:, start:end] = hex_chars[:, hex_start:hex_start + end - start]
+
+    width = chars.shape[1]
+    return chars.view(f"S{width}").ravel().astype(f"U{width}").tolist()
+
+
+def gid_strings(kind, n):
+    """
+    Take the next n numeric GIDs from a kind's counter.
+
+    Args:
+        kind: One of ID_KINDS
+        n: Number of GIDs
+
+    Returns:
+        list: GID strings, increasing
+    """
+    start = _gid_counters.get(kind, _gid_start)
+    _gid_counters[kind] = start + n
+
+    first = GID_BASE + ID_KINDS.index(kind) * GID_BLOCK_SIZE + start
+    return [str(gid) for gid in range(first, first + n)]
+
+
+def _random_bytes(rng, nbytes):
+    if rng is None:
+        return os.urandom(nbytes)
+    if hasattr(rng, "bytes"):  # numpy Generator
+        return rng.bytes(nbytes)
+    return rng.getrandbits(8 * nbytes).to_bytes(nbytes, "little")
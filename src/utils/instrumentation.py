@@ -0,0 +1,211 @@
+"""
+Per-stage instrumentation for the generation pipeline.
+
+main() wraps each stage in RunReport.stage(). For every stage the report
+records total time split into generation and write time (the write time
+comes from the BulkWriter's executemany timings), rows written per table,
+rows/s and the process's peak RSS so far. With trace_memory it also
+records the tracemalloc peak and the top allocation sites of the stage;
+with profile_dir each stage is run under cProfile and its stats dumped to
+a .prof file. The finished report is written as JSON next to the
+database.
+
+Work done in --workers processes is timed as part of the stage that
+consumes it, but it is not seen by tracemalloc or cProfile.
+"""
+
+import cProfile
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+TOP_ALLOCATIONS = 5  # Allocation sites kept per stage
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process so far, in MB (None if unknown).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def report_path_for(db_path, kind="report"):
+    """
+    Path of the run report for a database, e.g. output/x.report.json
+    (or output/x.append-report.json with kind="append-report").
+    """
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}.{kind}.json")
+
+
+class RunReport:
+    """
+    Collects per-stage measurements for one run.
+    """
+
+    def __init__(self, writer, trace_memory=False, profile_dir=None, meta=None):
+        self.writer = writer
+        self.trace_memory = trace_memory
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.meta = dict(meta or {})
+        self.stages = []
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+
+        self._started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        if self.profile_dir:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+
+    def _writer_totals(self):
+        return {
+            table: (table_stats["rows"], table_stats["seconds"])
+            for table, table_stats in self.writer.stats.items()
+        }
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measure the enclosed block as one pipeline stage.
+
+        Args:
+            name: Stage name used in the report (and .prof file name)
+        """
+        before = self._writer_totals()
+        snapshot = None
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot()
+
+        profiler = cProfile.Profile() if self.profile_dir else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            seconds = time.perf_counter() - start
+
+            after = self._writer_totals()
+            tables = {}
+            write_seconds = 0.0
+            for table, (rows, table_seconds) in after.items():
+                rows_before, seconds_before = before.get(table, (0, 0.0))
+                if rows > rows_before:
+                    tables[table] = rows - rows_before
+                write_seconds += table_seconds - seconds_before
+
+            rows = sum(tables.values())
+            record = {
+                "name": name,
+                "seconds": seconds,
+                "generation_seconds": max(seconds - write_seconds, 0.0),
+                "write_seconds": write_seconds,
+                "rows": rows,
+                "rows_per_sec": rows / seconds if seconds else None,
+                "tables": tables,
+                "peak_rss_mb": peak_rss_mb()
+            }
+
+            if snapshot is not None:
+                record["tracemalloc_peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+                record["top_allocations"] = _top_allocations(snapshot)
+
+            if profiler:
+                profile_path = self.profile_dir / f"{name}.prof"
+                profiler.dump_stats(profile_path)
+                record["profile"] = str(profile_path)
+
+            self.stages.append(record)
+
+    def to_dict(self):
+        seconds = time.perf_counter() - self._start
+        rows = sum(stage["rows"] for stage in self.stages)
+        return {
+            "meta": {
+                **self.meta,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform()
+            },
+            "totals": {
+                "seconds": seconds,
+                "rows": rows,
+                "rows_per_sec": rows / seconds if seconds else None,
+                "peak_rss_mb": peak_rss_mb()
+            },
+            "tables": {
+                table: {
+                    "rows": table_stats["rows"],
+                    "write_seconds": table_stats["seconds"],
+                    "write_rows_per_sec": (
+                        table_stats["rows"] / table_stats["seconds"]
+                        if table_stats["seconds"] else None
+                    )
+                }
+                for table, table_stats in self.writer.stats.items()
+            },
+            "stages": self.stages
+        }
+
+    def write(self, path):
+        """
+        Write the report as JSON and stop tracemalloc if this report started it.
+
+        Args:
+            path: Output file
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def print_summary(self):
+        """
+        Print one line per stage.
+        """
+        print("Stages:")
+        for stage in self.stages:
+            rate = f"{stage['rows_per_sec']:>12,.0f} rows/s" if stage["rows_per_sec"] else ""
+            print(
+                f"  {stage['name']:<26} {stage['rows']:>10,} rows "
+                f"{stage['generation_seconds']:>8.3f} s gen "
+                f"{stage['write_seconds']:>8.3f} s write {rate}"
+            )
+
+
+def _top_allocations(snapshot_before):
+    """
+    Largest net allocation sites since snapshot_before.
+    """
+    snapshot = tracemalloc.take_snapshot()
+    diff = snapshot.compare_to(snapshot_before, "lineno")
+    return [
+        {
+            "location": str(stat.traceback[0]),
+            "size_diff_kb": stat.size_diff / 1024,
+            "count_diff": stat.count_diff
+        }
+        for stat in diff[:TOP_ALLOCATIONS]
+    ]
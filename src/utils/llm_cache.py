@@ -0,0 +1,158 @@
+"""
+Persistent cache for LLM responses.
+
+Responses are stored in a small SQLite database keyed by a hash of
+(model, temperature, prompt, expect_json), so re-running a build with the
+same configuration reuses every response it has already paid for. Failed
+requests (None) are never cached, nor are responses the caller rejects
+(e.g. incomplete item batches, see llm_utils.generate_items_with_llm).
+
+Entries older than max_age_days are dropped, and beyond max_entries the
+least recently used ones are evicted. Concurrent requests for the same key
+are coalesced by the async client (see AsyncLLMClient.generate).
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from src.config import (
+    LLM_CACHE_PATH,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_MAX_AGE_DAYS
+)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used_at);
+"""
+
+
+def cache_key(model, temperature, prompt, expect_json):
+    """
+    Hash the request parameters that determine a response.
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        prompt: Prompt text
+        expect_json: Whether the response is parsed as JSON
+
+    Returns:
+        str: Hex digest
+    """
+    material = json.dumps([model, temperature, prompt, bool(expect_json)])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite-backed response cache with age and size eviction.
+    """
+
+    def __init__(
+        self,
+        path=LLM_CACHE_PATH,
+        max_entries=LLM_CACHE_MAX_ENTRIES,
+        max_age_days=LLM_CACHE_MAX_AGE_DAYS
+    ):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "stores": 0, "evictions": 0}
+
+        self.conn = sqlite3.connect(self.path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+        self.evict()
+
+    def get(self, key):
+        """
+        Look up a response.
+
+        Args:
+            key: Key from cache_key
+
+        Returns:
+            str | dict | None: Cached response, or None on a miss
+        """
+        row = self.conn.execute(
+            "SELECT response FROM llm_cache WHERE cache_key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        self.conn.execute(
+            "UPDATE llm_cache SET last_used_at = ? WHERE cache_key = ?",
+            (time.time(), key)
+        )
+        return json.loads(row[0])
+
+    def put(self, key, response):
+        """
+        Store a response (None is ignored).
+
+        Args:
+            key: Key from cache_key
+            response: str or dict returned by the LLM
+        """
+        if response is None:
+            return
+
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)",
+            (key, json.dumps(response), now, now)
+        )
+        self.stats["stores"] += 1
+
+        if self.max_entries and self.stats["stores"] % 1000 == 0:
+            self.evict()
+
+    def evict(self):
+        """
+        Drop expired entries, then the least recently used beyond max_entries.
+
+        Returns:
+            int: Entries removed
+        """
+        removed = 0
+
+        if self.max_age_days:
+            cutoff = time.time() - self.max_age_days * 86400
+            removed += self.conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (cutoff,)
+            ).rowcount
+
+        if self.max_entries:
+            removed += self.conn.execute(
+                """
+                DELETE FROM llm_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_cache
+                    ORDER BY last_used_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            ).rowcount
+
+        self.stats["evictions"] += removed
+        return removed
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def close(self):
+        self.evict()
+        self.conn.close()
@@ -5,24 +5,49 @@ This module provides optional integration with an LLM (Claude)
 to generate realistic task names, descriptions, and comments.
 If no API key is provided, the pipeline safely falls back to
 template-based generation.
+
+Single prompts go through generate_with_llm. Many prompts at once go
+through generate_many_with_llm, which runs them on an asyncio client with
+a concurrency limit, a token-bucket rate limiter and jittered exponential
+backoff, and returns the results in prompt order.
+
+Rows that need many similar strings (task names, descriptions, comments)
+should use generate_items_with_llm, which asks for up to LLM_BATCH_ITEMS
+items per JSON-mode request and re-requests only the items missing from
+a response, with a fresh prompt per batch and round.
+
+All paths read through a persistent SQLite cache (see llm_cache.py), so
+a prompt that was answered in an earlier run costs no request.
 """
 
+import asyncio
 import json
+import random
 import time
-from typing import Optional, Union
+from typing import Callable, List, Optional, Union
 
 try:
-    from anthropic import Anthropic
+    from anthropic import Anthropic, AsyncAnthropic
 except ImportError:
     Anthropic = None
+    AsyncAnthropic = None
 
 from src.config import (
     ANTHROPIC_API_KEY,
     USE_LLM_GENERATION,
     LLM_MODEL,
     LLM_MAX_TOKENS,
-    LLM_TEMPERATURE
+    LLM_TEMPERATURE,
+    LLM_MAX_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX,
+    LLM_BATCH_ITEMS,
+    LLM_BATCH_MAX_ROUNDS,
+    LLM_CACHE_ENABLED
 )
+from src.utils.llm_cache import LLMCache, cache_key
 
 # -----------------------------------------------------------------------------
 # CLIENT INITIALIZATION
@@ -33,6 +58,20 @@ client = None
 if USE_LLM_GENERATION and Anthropic is not None:
     client = Anthropic(api_key=ANTHROPIC_API_KEY)
 
+_cache = None
+
+
+def get_cache() -> Optional[LLMCache]:
+    """
+    Return the shared response cache, opening it on first use.
+
+    Returns None if caching is disabled (LLM_CACHE_ENABLED=0).
+    """
+    global _cache
+    if _cache is None and LLM_CACHE_ENABLED:
+        _cache = LLMCache()
+    return _cache
+
 
 # -----------------------------------------------------------------------------
 # CORE GENERATION FUNCTION
@@ -51,7 +90,8 @@ def generate_with_llm(
         prompt (str): Prompt sent to the LLM.
         expect_json (bool): Whether output should be parsed as JSON.
         retries (int): Number of retry attempts on failure.
-        retry_delay (float): Delay between retries in seconds.
+        retry_delay (float): Base delay between retries in seconds; doubled
+            on every attempt, with jitter.
 
     Returns:
         str | dict | None:
@@ -63,38 +103,263 @@ def generate_with_llm(
     if not USE_LLM_GENERATION or client is None:
         return None
 
+    cache = get_cache()
+    key = _cache_key(prompt, expect_json)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     for attempt in range(retries):
         try:
-            response = client.messages.create(
-                model=LLM_MODEL,
-                max_tokens=LLM_MAX_TOKENS,
-                temperature=LLM_TEMPERATURE,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-
-            text = response.content[0].text.strip()
-
-            if expect_json:
-                text = _clean_json_response(text)
-                return json.loads(text)
-
-            return text
+            response = client.messages.create(**_request_args(prompt))
+            result = _parse_response(response, expect_json)
+            if cache is not None:
+                cache.put(key, result)
+            return result
 
         except Exception as e:
             if attempt == retries - 1:
                 print(f"[LLM ERROR] Failed after {retries} attempts: {e}")
                 return None
-            time.sleep(retry_delay)
+            time.sleep(_backoff_delay(attempt, retry_delay))
 
     return None
 
 
+# -----------------------------------------------------------------------------
+# CONCURRENT GENERATION
+# -----------------------------------------------------------------------------
+
+class TokenBucket:
+    """
+    Asyncio token bucket: at most `capacity` requests in a burst, refilled
+    at `rate` requests per second.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Wait until a token is available and take it.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncLLMClient:
+    """
+    Concurrent LLM client.
+
+    Requests share a semaphore (max_concurrency in flight) and a token bucket
+    (requests_per_minute). Failed requests are retried with full-jitter
+    exponential backoff; a request that still fails yields None.
+
+    Responses are read from and written to the persistent cache (only
+    those the caller accepts, see generate), and identical prompts in
+    flight at the same time share one request.
+    """
+
+    def __init__(
+        self,
+        api_client=None,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX,
+        cache: Optional[LLMCache] = None
+    ):
+        if api_client is None and AsyncAnthropic is not None:
+            api_client = AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+
+        self.api_client = api_client
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache if cache is not None else get_cache()
+        self._in_flight = {}
+
+    async def generate(
+        self,
+        prompt: str,
+        expect_json: bool = False,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        bucket: Optional[TokenBucket] = None,
+        accept: Optional[Callable] = None
+    ) -> Optional[Union[str, dict]]:
+        """
+        Generate one completion.
+
+        Args:
+            prompt (str): Prompt sent to the LLM.
+            expect_json (bool): Whether output should be parsed as JSON.
+            semaphore: Concurrency limit shared by a batch (default: none)
+            bucket: Rate limiter shared by a batch (default: none)
+            accept: Check a response must pass to be cached (default: any);
+                rejected responses are still returned, but a later request
+                for the same prompt asks the LLM again
+
+        Returns:
+            str | dict | None: As generate_with_llm
+        """
+        if self.api_client is None:
+            return None
+
+        key = _cache_key(prompt, expect_json)
+
+        # Single flight: identical prompts wait for the first request
+        if key in self._in_flight:
+            if self.cache is not None:
+                self.cache.stats["coalesced"] += 1
+            return await asyncio.shield(self._in_flight[key])
+
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._request(prompt, expect_json, semaphore, bucket)
+            if self.cache is not None and (accept is None or accept(result)):
+                self.cache.put(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _request(self, prompt, expect_json, semaphore, bucket):
+        for attempt in range(self.retries):
+            if bucket is not None:
+                await bucket.acquire()
+            try:
+                if semaphore is not None:
+                    async with semaphore:
+                        response = await self.api_client.messages.create(**_request_args(prompt))
+                else:
+                    response = await self.api_client.messages.create(**_request_args(prompt))
+                return _parse_response(response, expect_json)
+
+            except Exception as e:
+                if attempt == self.retries - 1:
+                    print(f"[LLM ERROR] Failed after {self.retries} attempts: {e}")
+                    return None
+                await asyncio.sleep(_backoff_delay(attempt, self.backoff_base, self.backoff_max))
+
+        return None
+
+    async def generate_many(
+        self,
+        prompts: List[str],
+        expect_json: bool = False,
+        accept: Optional[List[Callable]] = None
+    ) -> List[Optional[Union[str, dict]]]:
+        """
+        Generate completions for many prompts concurrently.
+
+        Args:
+            prompts (list): Prompts sent to the LLM.
+            expect_json (bool): Whether outputs should be parsed as JSON.
+            accept (list): Optional cache check per prompt (see generate)
+
+        Returns:
+            list: One result (or None) per prompt, in prompt order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        bucket = TokenBucket(self.requests_per_minute / 60.0, capacity=self.max_concurrency)
+        accept = accept if accept is not None else [None] * len(prompts)
+
+        return await asyncio.gather(*(
+            self.generate(prompt, expect_json, semaphore, bucket, check)
+            for prompt, check in zip(prompts, accept)
+        ))
+
+
+def generate_many_with_llm(
+    prompts: List[str],
+    expect_json: bool = False,
+    max_concurrency: int = LLM_MAX_CONCURRENCY,
+    accept: Optional[List[Callable]] = None
+) -> List[Optional[Union[str, dict]]]:
+    """
+    Generate completions for many prompts concurrently (blocking).
+
+    Args:
+        prompts (list): Prompts sent to the LLM.
+        expect_json (bool): Whether outputs should be parsed as JSON.
+        max_concurrency (int): Requests in flight at once.
+        accept (list): Optional cache check per prompt (see
+            AsyncLLMClient.generate)
+
+    Returns:
+        list: One result per prompt, in prompt order; all None if LLM
+            generation is disabled
+    """
+    prompts = list(prompts)
+
+    if not USE_LLM_GENERATION or AsyncAnthropic is None:
+        return [None] * len(prompts)
+
+    async_client = AsyncLLMClient(max_concurrency=max_concurrency)
+    return asyncio.run(async_client.generate_many(prompts, expect_json, accept))
+
+
 # -----------------------------------------------------------------------------
 # HELPER FUNCTIONS
 # -----------------------------------------------------------------------------
 
+def _cache_key(prompt: str, expect_json: bool) -> str:
+    return cache_key(LLM_MODEL, LLM_TEMPERATURE, prompt, expect_json)
+
+
+def _request_args(prompt: str) -> dict:
+    return {
+        "model": LLM_MODEL,
+        "max_tokens": LLM_MAX_TOKENS,
+        "temperature": LLM_TEMPERATURE,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
+    }
+
+
+def _parse_response(response, expect_json: bool) -> Union[str, dict]:
+    text = response.content[0].text.strip()
+
+    if expect_json:
+        text = _clean_json_response(text)
+        return json.loads(text)
+
+    return text
+
+
+def _backoff_delay(attempt: int, base: float, cap: float = LLM_BACKOFF_MAX) -> float:
+    """
+    Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)].
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
 def _clean_json_response(text: str) -> str:
     """
     Clean JSON output from LLM by removing markdown fences.
@@ -118,6 +383,158 @@ def _clean_json_response(text: str) -> str:
     return text.strip()
 
 
+# -----------------------------------------------------------------------------
+# BATCHED ITEM GENERATION
+# -----------------------------------------------------------------------------
+
+# kind: (what one item is, maximum characters per item)
+ITEM_KINDS = {
+    "task_name": ("a short, action-oriented task name (3-10 words)", 120),
+    "task_description": ("a task description of 1-3 sentences", 1000),
+    "comment": ("a brief comment a teammate would leave on the task", 500)
+}
+
+
+def build_items_prompt(
+    kind: str,
+    ids: List[int],
+    context: Optional[dict] = None,
+    batch: int = 0,
+    round_number: int = 0
+) -> str:
+    """
+    Build a JSON-mode prompt asking for one item per id.
+
+    Args:
+        kind (str): One of ITEM_KINDS
+        ids (list): Item ids the response must contain
+        context (dict): Optional team_type, project_type and section
+        batch (int): Request the items belong to; requests with the same
+            count and context get different prompts (and items)
+        round_number (int): Retry round, so a retry is not answered from
+            the cache with the response it is retrying
+
+    Returns:
+        str: Prompt
+    """
+    description, max_chars = ITEM_KINDS[kind]
+    context = context or {}
+
+    setting = []
+    if context.get("team_type"):
+        setting.append(f"the {context['team_type']} team")
+    if context.get("project_type"):
+        setting.append(f"a project of type {context['project_type']}")
+    if context.get("section"):
+        setting.append(f"the \"{context['section']}\" section")
+    where = f" in {', '.join(setting)}" if setting else ""
+
+    return (
+        f"Generate {len(ids)} distinct items for an Asana workspace{where}. "
+        f"Each item is {description}, at most {max_chars} characters.\n"
+        f"Return only JSON of the form "
+        f"{{\"items\": [{{\"id\": <id>, \"text\": \"...\"}}, ...]}} "
+        f"with exactly one entry for each of these ids: {ids}.\n"
+        f"(Batch {batch}, round {round_number + 1}: make the items different "
+        f"from those of other batches.)"
+    )
+
+
+def validate_items(response, ids: List[int], kind: str) -> dict:
+    """
+    Extract the valid items for the requested ids from a JSON response.
+
+    Args:
+        response: Parsed JSON (or None)
+        ids (list): Requested ids
+        kind (str): One of ITEM_KINDS
+
+    Returns:
+        dict: {id: text} for every id that came back with usable text
+    """
+    if not isinstance(response, dict) or not isinstance(response.get("items"), list):
+        return {}
+
+    max_chars = ITEM_KINDS[kind][1]
+    wanted = set(ids)
+    items = {}
+
+    for item in response["items"]:
+        if not isinstance(item, dict):
+            continue
+        item_id, text = item.get("id"), item.get("text")
+        if isinstance(item_id, str) and item_id.isdigit():
+            item_id = int(item_id)
+        if item_id not in wanted or item_id in items:
+            continue
+        if isinstance(text, str) and text.strip() and len(text) <= max_chars:
+            items[item_id] = text.strip()
+
+    return items
+
+
+def generate_items_with_llm(
+    kind: str,
+    requests: List[tuple],
+    max_rounds: int = LLM_BATCH_MAX_ROUNDS
+) -> List[List[Optional[str]]]:
+    """
+    Generate many items per request with batched JSON-mode prompts.
+
+    Each (count, context) request is split into chunks of LLM_BATCH_ITEMS[kind]
+    items; all chunks of a round run concurrently. Items missing or invalid
+    in a response are asked for again with a new prompt, up to max_rounds
+    requests in total. Only responses with every requested item are cached.
+
+    Args:
+        kind (str): One of ITEM_KINDS
+        requests (list): (count, context) pairs; context as in build_items_prompt
+        max_rounds (int): Request rounds before giving up on missing items
+
+    Returns:
+        list: One list of `count` strings per request; items that could not
+            be generated (or all of them, if LLM is disabled) are None
+    """
+    results = [[None] * count for count, _ in requests]
+    chunk_size = LLM_BATCH_ITEMS[kind]
+
+    # (request index, item ids) still to fill
+    pending = [
+        (index, list(range(start, min(start + chunk_size, count))))
+        for index, (count, _) in enumerate(requests)
+        for start in range(0, count, chunk_size)
+    ]
+
+    for round_number in range(max_rounds):
+        if not pending:
+            break
+
+        prompts = [
+            build_items_prompt(kind, ids, requests[index][1], index, round_number)
+            for index, ids in pending
+        ]
+        # Only complete responses are cached
+        accept = [
+            lambda response, ids=ids: len(validate_items(response, ids, kind)) == len(ids)
+            for _, ids in pending
+        ]
+        responses = generate_many_with_llm(prompts, expect_json=True, accept=accept)
+        if all(response is None for response in responses):
+            break  # LLM disabled or unavailable
+
+        still_missing = []
+        for (index, ids), response in zip(pending, responses):
+            items = validate_items(response, ids, kind)
+            for item_id, text in items.items():
+                results[index][item_id] = text
+            missing = [item_id for item_id in ids if item_id not in items]
+            if missing:
+                still_missing.append((index, missing))
+        pending = still_missing
+
+    return results
+
+
 # -----------------------------------------------------------------------------
 # HIGH-LEVEL CONTENT HELPERS (OPTIONAL)
 # -----------------------------------------------------------------------------
@@ -147,3 +564,57 @@ def generate_comment(prompt: str) -> Optional[str]:
     Returns None if LLM is disabled.
     """
     return generate_with_llm(prompt)
+
+
+def generate_task_names(prompts: List[str]) -> List[Optional[str]]:
+    """
+    Generate task names for many prompts concurrently, in prompt order.
+
+    Returns a list of None if LLM is disabled.
+    """
+    return generate_many_with_llm(prompts)
+
+
+def generate_task_descriptions(prompts: List[str]) -> List[Optional[str]]:
+    """
+    Generate task descriptions for many prompts concurrently, in prompt order.
+
+    Returns a list of None if LLM is disabled.
+    """
+    return generate_many_with_llm(prompts)
+
+
+def generate_comments(prompts: List[str]) -> List[Optional[str]]:
+    """
+    Generate task comments for many prompts concurrently, in prompt order.
+
+    Returns a list of None if LLM is disabled.
+    """
+    return generate_many_with_llm(prompts)
+
+
+def generate_task_name_batch(count: int, context: Optional[dict] = None) -> List[Optional[str]]:
+    """
+    Generate `count` task names for one team/project/section context.
+
+    Returns a list of None if LLM is disabled.
+    """
+    return generate_items_with_llm("task_name", [(count, context)])[0]
+
+
+def generate_task_description_batch(count: int, context: Optional[dict] = None) -> List[Optional[str]]:
+    """
+    Generate `count` task descriptions for one team/project/section context.
+
+    Returns a list of None if LLM is disabled.
+    """
+    return generate_items_with_llm("task_description", [(count, context)])[0]
+
+
+def generate_comment_batch(count: int, context: Optional[dict] = None) -> List[Optional[str]]:
+    """
+    Generate `count` comments for one team/project/section context.
+
+    Returns a list of None if LLM is disabled.
+    """
+    return generate_items_with_llm("comment", [(count, context)])[0]
@@ -0,0 +1,71 @@
+"""
+Streaming Parquet export.
+
+ParquetWriter has the same write / write_columns interface as
+db_utils.BulkWriter, so the pipeline can send every table to Parquet as
+it is generated (usually alongside SQLite, through db_utils.MultiWriter).
+Rows are buffered per table and flushed as one row group every
+PARQUET_ROW_GROUP_SIZE rows, so no table is ever held in memory whole.
+
+Column types follow schema.sql (see arrow_utils.py); the enum-like
+columns in PARQUET_DICTIONARY_COLUMNS are dictionary-encoded.
+
+Requires pyarrow (optional dependency).
+"""
+
+import time
+from pathlib import Path
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+from src.utils.db_utils import load_schema
+from src.utils.arrow_utils import ArrowBatchWriter, arrow_schema
+from src.config import (
+    PARQUET_ROW_GROUP_SIZE,
+    PARQUET_COMPRESSION
+)
+
+
+class ParquetWriter(ArrowBatchWriter):
+    """
+    Streams tables to <directory>/<table>.parquet in row groups.
+    """
+
+    def __init__(
+        self,
+        directory,
+        row_group_size=PARQUET_ROW_GROUP_SIZE,
+        compression=PARQUET_COMPRESSION
+    ):
+        super().__init__(flush_rows=row_group_size)
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self._writers = {}
+
+    def _flush(self, table):
+        if table not in self._writers:
+            self._writers[table] = pq.ParquetWriter(
+                self.directory / f"{table}.parquet",
+                arrow_schema(table),
+                compression=self.compression
+            )
+        data = self._take_buffer(table)
+        if data is not None:
+            start = time.perf_counter()
+            self._writers[table].write_table(data, row_group_size=self.row_group_size)
+            self._record(table, 0, time.perf_counter() - start)
+
+    def close(self):
+        """
+        Flush every buffer and close the files. Tables that received no
+        rows are written as empty files, so every schema table exists.
+        """
+        for table in load_schema():
+            self._flush(table)
+            self._writers.pop(table).close()
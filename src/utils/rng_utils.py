@@ -0,0 +1,79 @@
+"""
+Deterministic random streams derived from a single master seed.
+
+Each generator asks for its own stream, keyed by the stage and the entity
+it is working on, e.g. get_rng("tasks", project_id). A stream depends only
+on the master seed and its key, never on how many numbers other stages
+drew before it, so serial, parallel (--workers) and partial runs produce
+identical rows.
+"""
+
+import hashlib
+import random
+import numpy as np
+from src.config import RANDOM_SEED
+
+
+_master_seed = RANDOM_SEED
+
+
+def set_master_seed(seed):
+    """
+    Set the master seed every stream is derived from.
+
+    Args:
+        seed: Integer seed
+    """
+    global _master_seed
+    _master_seed = int(seed)
+
+
+def get_master_seed():
+    """
+    Return the current master seed.
+    """
+    return _master_seed
+
+
+def derive_seed(*key):
+    """
+    Derive a 64-bit seed for a stream key.
+
+    Args:
+        *key: Parts naming the stream, e.g. ("comments", task_id)
+
+    Returns:
+        int: Seed that is stable across runs, processes and platforms
+    """
+    material = "\x1f".join([str(_master_seed), *map(str, key)]).encode()
+    digest = hashlib.blake2b(material, digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def get_rng(*key):
+    """
+    Return an independent random.Random stream for a key.
+
+    Args:
+        *key: Parts naming the stream, e.g. ("tasks", project_id)
+
+    Returns:
+        random.Random: Seeded stream
+    """
+    return random.Random(derive_seed(*key))
+
+
+def get_np_rng(*key):
+    """
+    Return an independent NumPy Generator for a key.
+
+    Used by the vectorized generators; the same key always yields the same
+    stream, but it is distinct from the random.Random stream of that key.
+
+    Args:
+        *key: Parts naming the stream, e.g. ("tasks", project_id)
+
+    Returns:
+        numpy.random.Generator: Seeded generator
+    """
+    return np.random.default_rng(derive_seed("numpy", *key))
@@ -0,0 +1,88 @@
+"""
+Workspace scale settings.
+
+The config values describe the reference ("medium") workspace. A scale
+factor multiplies the number of users and teams (see scale_team_types);
+projects and tasks follow, because they are generated per team and per
+project from the unchanged per-team and per-project ranges. Ratios such as users
+per team, projects per team, tasks per project and tasks per user stay
+the same at every size.
+"""
+
+from src.config import (
+    NUM_USERS,
+    TEAM_TYPES,
+    PROJECTS_PER_TEAM_MIN,
+    PROJECTS_PER_TEAM_MAX,
+    TASKS_PER_PROJECT_MIN,
+    TASKS_PER_PROJECT_MAX,
+    SCALE_PROFILES
+)
+
+
+def resolve_scale(value):
+    """
+    Turn a profile name or a number into a scale factor.
+
+    Args:
+        value: A key of SCALE_PROFILES (e.g. "large") or a positive number
+
+    Returns:
+        float: Scale factor
+    """
+    if value in SCALE_PROFILES:
+        return SCALE_PROFILES[value]
+
+    try:
+        scale = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"Unknown scale {value!r}; expected a number or one of {list(SCALE_PROFILES)}"
+        )
+    if scale <= 0:
+        raise ValueError(f"Scale must be positive, got {scale}")
+    return scale
+
+
+def get_scale_settings(scale=1.0):
+    """
+    Compute workspace sizes for a scale factor.
+
+    Args:
+        scale: Scale factor (1.0 = the config defaults)
+
+    Returns:
+        dict: num_users, team_types, projects_per_team and tasks_per_project,
+            in the form the generators take them
+    """
+    return {
+        "num_users": max(1, round(NUM_USERS * scale)),
+        "team_types": scale_team_types(scale),
+        "projects_per_team": (PROJECTS_PER_TEAM_MIN, PROJECTS_PER_TEAM_MAX),
+        "tasks_per_project": (TASKS_PER_PROJECT_MIN, TASKS_PER_PROJECT_MAX)
+    }
+
+
+def scale_team_types(scale=1.0):
+    """
+    Scale the number of teams of each type.
+
+    The total is scaled once (at least one team) and split across the types
+    by largest remainder, so small scales keep the users-per-team ratio
+    instead of rounding every type up to one team; types can end up with
+    no teams.
+
+    Args:
+        scale: Scale factor
+
+    Returns:
+        dict: {team_type: count}, in TEAM_TYPES order
+    """
+    shares = {team_type: count * scale for team_type, count in TEAM_TYPES.items()}
+    total = max(1, round(sum(shares.values())))
+
+    counts = {team_type: int(share) for team_type, share in shares.items()}
+    by_remainder = sorted(shares, key=lambda t: shares[t] - counts[t], reverse=True)
+    for team_type in by_remainder[:total - sum(counts.values())]:
+        counts[team_type] += 1
+    return counts
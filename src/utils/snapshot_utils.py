@@ -0,0 +1,272 @@
+"""
+Snapshot pool for fast episode resets.
+
+An agent episode needs a pristine copy of the workspace. Instead of
+copying the database file or rerunning the generator per episode, a
+SnapshotPool builds the database once and hands out fresh copies of it,
+made ahead of time by a background thread, so a reset only takes a ready
+copy off a queue. Three ways to make a copy (SNAPSHOT_METHODS):
+
+- "memory":  the base is serialized into bytes once; each copy is an
+             in-memory database loaded with Connection.deserialize
+- "backup":  each copy is a file written with the SQLite online backup API
+- "reflink": each copy is a copy-on-write clone of the file (FICLONE, e.g.
+             on Btrfs or XFS); falls back to a plain copy where the file
+             system can't clone
+
+Usage:
+    with SnapshotPool("output/asana_simulation.sqlite") as pool:
+        for _ in range(episodes):
+            with pool.acquire() as episode:
+                run_episode(episode.conn)
+"""
+
+import itertools
+import os
+import queue
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from src.config import (
+    DATABASE_PATH,
+    SNAPSHOT_METHOD,
+    SNAPSHOT_POOL_SIZE,
+    SNAPSHOT_DIR
+)
+
+
+SNAPSHOT_METHODS = ("memory", "backup", "reflink")
+
+FICLONE = 0x40049409  # ioctl request from linux/fs.h
+
+
+def ensure_database(path=DATABASE_PATH, build_args=()):
+    """
+    Build the database with the generator if it doesn't exist yet.
+
+    Args:
+        path: Database file
+        build_args: Extra command line arguments for src.main (e.g.
+            ["--scale", "small"])
+
+    Returns:
+        Path: The database file
+    """
+    path = Path(path)
+    if not path.exists():
+        from src.main import main
+        main(["--db-path", str(path), *build_args])
+    return path
+
+
+def clone_file(source, destination):
+    """
+    Copy a file as a copy-on-write clone where the file system supports
+    it, otherwise as a regular copy.
+
+    Returns:
+        bool: True if the file was cloned
+    """
+    if fcntl is not None:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return True
+            except OSError:
+                pass
+    shutil.copyfile(source, destination)
+    return False
+
+
+class EpisodeCopy:
+    """
+    One episode's private copy of the database.
+
+    Attributes:
+        conn: Writable connection to the copy
+        path: File of the copy (None for in-memory copies)
+    """
+
+    def __init__(self, conn, path=None):
+        self.conn = conn
+        self.path = path
+
+    def close(self):
+        """
+        Close the connection and delete the copy's file.
+        """
+        self.conn.close()
+        if self.path is not None:
+            Path(self.path).unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SnapshotPool:
+    """
+    Keeps `size` fresh copies of a database ready for acquire().
+
+    A background thread makes copies until the pool is full and makes a
+    new one whenever a copy is taken, so resets cost a queue pop as long
+    as episodes run longer than one copy takes to make.
+    """
+
+    def __init__(
+        self,
+        db_path=DATABASE_PATH,
+        method=SNAPSHOT_METHOD,
+        size=SNAPSHOT_POOL_SIZE,
+        snapshot_dir=SNAPSHOT_DIR,
+        build_args=()
+    ):
+        """
+        Args:
+            db_path: Base database, built first if missing (see ensure_database)
+            method: One of SNAPSHOT_METHODS
+            size: Ready copies kept in the pool
+            snapshot_dir: Directory for file copies ("backup", "reflink")
+            build_args: Generator arguments used if the base must be built
+        """
+        if method not in SNAPSHOT_METHODS:
+            raise ValueError(f"Unknown snapshot method {method!r}; expected one of {SNAPSHOT_METHODS}")
+
+        self.db_path = ensure_database(db_path, build_args)
+        self.method = method
+        self.snapshot_dir = Path(snapshot_dir)
+        self.latencies = []  # Seconds each acquire() waited
+
+        self._image = None
+        if method == "memory":
+            source = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self._image = source.serialize()
+            source.close()
+        else:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+        self._names = itertools.count()
+        self._ready = queue.Queue(maxsize=size)
+        self._stopped = threading.Event()
+        self._filler = threading.Thread(target=self._fill, daemon=True)
+        self._filler.start()
+
+    # -------------------------------------------------------------------------
+    # COPIES
+    # -------------------------------------------------------------------------
+
+    def make_copy(self):
+        """
+        Make one fresh copy of the base database (without the pool).
+
+        Returns:
+            EpisodeCopy: The copy
+        """
+        if self.method == "memory":
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            conn.deserialize(self._image)
+            return EpisodeCopy(conn)
+
+        path = self.snapshot_dir / f"{self.db_path.stem}.{os.getpid()}.{next(self._names)}.sqlite"
+        if self.method == "backup":
+            source = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            source.backup(conn)
+            source.close()
+        else:
+            clone_file(self.db_path, path)
+            conn = sqlite3.connect(path, check_same_thread=False)
+        return EpisodeCopy(conn, path)
+
+    def _fill(self):
+        while not self._stopped.is_set():
+            copy = self.make_copy()
+            while not self._stopped.is_set():
+                try:
+                    self._ready.put(copy, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            else:
+                copy.close()
+
+    # -------------------------------------------------------------------------
+    # EPISODES
+    # -------------------------------------------------------------------------
+
+    def acquire(self):
+        """
+        Take a fresh copy for a new episode. Close it (or use it as a
+        context manager) when the episode ends.
+
+        Returns:
+            EpisodeCopy: The copy
+        """
+        start = time.perf_counter()
+        copy = self._ready.get()
+        self.latencies.append(time.perf_counter() - start)
+        return copy
+
+    def wait_ready(self, timeout=None):
+        """
+        Block until the pool is full, e.g. before timing resets.
+
+        Returns:
+            bool: True if the pool filled up within the timeout
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self._ready.full():
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def latency_summary(self):
+        """
+        Summarize the reset latencies seen so far.
+
+        Returns:
+            dict: resets, mean_ms, p50_ms, p95_ms, p99_ms, max_ms
+        """
+        if not self.latencies:
+            return {"resets": 0}
+        latencies = np.array(self.latencies) * 1000
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return {
+            "resets": len(latencies),
+            "mean_ms": float(latencies.mean()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(latencies.max())
+        }
+
+    def close(self):
+        """
+        Stop the background thread and discard the ready copies.
+        """
+        self._stopped.set()
+        self._filler.join()
+        while True:
+            try:
+                self._ready.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -3,22 +3,104 @@ String generation utilities for creating realistic text content.
 """
 
 import random
+import re
+import unicodedata
 import uuid
 
 
-def generate_uuid():
+def generate_uuid(rng=None):
     """
     Generate a UUID (Universally Unique Identifier).
     
     Asana uses GIDs (Global IDs) which are similar to UUIDs.
     
+    Args:
+        rng: random.Random stream to draw the 128 bits from. Without one,
+            a non-reproducible uuid4 is returned.
+    
     Returns:
         str: A UUID string
     """
-    return str(uuid.uuid4())
+    if rng is None:
+        return str(uuid.uuid4())
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+# Local parts of the email patterns generate_email picks from
+EMAIL_PATTERNS = (
+    "{first}.{last}",    # john.doe@company.com
+    "{first}{last}",     # johndoe@company.com
+    "{initial}{last}",   # jdoe@company.com
+    "{first}_{last}",    # john_doe@company.com
+)
+
+
+def email_name(name):
+    """
+    Reduce a name to the lowercase ASCII letters used in email addresses
+    ("José María" -> "josemaria", "O'Neil" -> "oneil").
+
+    Names with no Latin letters at all are spelled out character by
+    character instead (see _spell_letter), so they never come out empty
+    ("さくら" -> "sakura", "김" -> "gim").
+
+    Args:
+        name: First or last name
+
+    Returns:
+        str: Email-safe name
+    """
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    letters = re.sub(r"[^a-z]", "", ascii_name.lower())
+    if letters:
+        return letters
+    return "".join(_spell_letter(c) for c in name if c.isalpha())
+
+
+def _spell_letter(char):
+    """
+    Spell a non-Latin letter in ASCII letters: by the sound in its Unicode
+    name where it has one ("CYRILLIC SMALL LETTER ZHE" -> "zhe",
+    "HANGUL SYLLABLE GIM" -> "gim"), otherwise by its code point written
+    in base 26 with a-z (ideographs).
+    """
+    words = unicodedata.name(char, "").split()
+    for keyword in ("LETTER", "SYLLABLE"):
+        if keyword in words:
+            sound = [
+                w for w in words[words.index(keyword) + 1:]
+                if w not in ("SMALL", "CAPITAL", "FINAL")
+            ]
+            spelled = re.sub(r"[^a-z]", "", sound[0].lower()) if sound else ""
+            if spelled:
+                return spelled
 
+    code, spelled = ord(char), ""
+    while True:
+        code, digit = divmod(code, 26)
+        spelled = chr(ord("a") + digit) + spelled
+        if not code:
+            return spelled
 
-def generate_email(first_name, last_name, domain):
+
+def email_local_part(first_name, last_name, pattern):
+    """
+    Build the part before the @ of an email address.
+
+    Args:
+        first_name: Person's first name
+        last_name: Person's last name
+        pattern: Index into EMAIL_PATTERNS
+
+    Returns:
+        str: Local part, e.g. "john.doe"
+    """
+    first = email_name(first_name)
+    last = email_name(last_name)
+    return EMAIL_PATTERNS[pattern].format(first=first, last=last, initial=first[:1])
+
+
+def generate_email(first_name, last_name, domain, rng=None):
     """
     Generate a realistic email address.
     
@@ -26,23 +108,13 @@ def generate_email(first_name, last_name, domain):
         first_name: Person's first name
         last_name: Person's last name
         domain: Company domain
+        rng: random.Random stream to draw from (default: global random)
     
     Returns:
         str: Email address
     """
-    # Convert to lowercase, remove spaces
-    first = first_name.lower().replace(' ', '')
-    last = last_name.lower().replace(' ', '')
-    
-    # Common email patterns
-    patterns = [
-        f"{first}.{last}@{domain}",           # john.doe@company.com
-        f"{first}{last}@{domain}",            # johndoe@company.com
-        f"{first[0]}{last}@{domain}",         # jdoe@company.com
-        f"{first}_{last}@{domain}",           # john_doe@company.com
-    ]
-    
-    return random.choice(patterns)
+    pattern = (rng or random).randrange(len(EMAIL_PATTERNS))
+    return f"{email_local_part(first_name, last_name, pattern)}@{domain}"
 
 
 def truncate_string(text, max_length):
@@ -0,0 +1,159 @@
+"""
+Memory-mapped string pools.
+
+A pool is a single file holding many UTF-8 strings back to back, with an
+offsets index so string i is bytes[offsets[i]:offsets[i + 1]]. Strings can
+be split into named groups (contiguous index ranges), e.g. task names per
+team type.
+
+Generators sample strings by integer index: drawing indices is one NumPy
+call, and only the strings that are actually written get decoded. The file
+is opened with mmap, so worker processes that open the same pool share its
+pages through the OS page cache instead of each holding a copy; a pickled
+TextPool carries only its path.
+
+File layout:
+    MAGIC (8 bytes) | header length (uint64) | JSON header
+    | offsets (uint64, count + 1) | string data
+"""
+
+import json
+import mmap
+import numpy as np
+from pathlib import Path
+
+
+MAGIC = b"TXTPOOL1"
+
+
+def write_pool(path, groups, meta=None):
+    """
+    Write a pool file.
+
+    Args:
+        path: Output file
+        groups: {group_name: [strings]}; groups are stored in this order
+        meta: Extra JSON-serializable header fields (e.g. a fingerprint)
+
+    Returns:
+        int: Number of strings written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    encoded = []
+    ranges = {}
+    for name, strings in groups.items():
+        start = len(encoded)
+        encoded.extend(s.encode("utf-8") for s in strings)
+        ranges[name] = [start, len(encoded)]
+
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.uint64, count=len(encoded))
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    header = json.dumps({
+        "count": len(encoded),
+        "groups": ranges,
+        "meta": meta or {}
+    }).encode()
+    # Pad so the offsets array starts 8-byte aligned
+    header += b" " * (-(len(MAGIC) + 8 + len(header)) % 8)
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        f.write(offsets.tobytes())
+        f.write(b"".join(encoded))
+    tmp_path.replace(path)
+
+    return len(encoded)
+
+
+def read_pool_header(path):
+    """
+    Read a pool's JSON header without mapping its data.
+
+    Returns:
+        dict: {"count", "groups", "meta"}
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a text pool")
+        header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        return json.loads(f.read(header_length))
+
+
+class TextPool:
+    """
+    Read-only, memory-mapped view of a pool file.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        header = read_pool_header(self.path)
+        self.count = header["count"]
+        self.groups = {name: tuple(bounds) for name, bounds in header["groups"].items()}
+        self.meta = header["meta"]
+
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header_length = int(np.frombuffer(self._mmap, np.uint64, 1, len(MAGIC))[0])
+        start = len(MAGIC) + 8 + header_length
+        self._offsets = np.frombuffer(self._mmap, np.uint64, self.count + 1, start)
+        self._data_start = start + 8 * (self.count + 1)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        start = self._data_start + int(self._offsets[index])
+        end = self._data_start + int(self._offsets[index + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def __reduce__(self):
+        # Pickle by path: each process maps the same file
+        return (TextPool, (self.path,))
+
+    def group_range(self, group=None):
+        """
+        Return the (start, end) index range of a group, or of the whole pool.
+        """
+        if group is None:
+            return 0, self.count
+        return self.groups[group]
+
+    def sample(self, n, rng, group=None):
+        """
+        Draw n string indices uniformly from a group (or the whole pool).
+
+        Args:
+            n: Number of indices
+            rng: numpy Generator
+            group: Group name (default: whole pool)
+
+        Returns:
+            ndarray: int64 indices into the pool
+        """
+        start, end = self.group_range(group)
+        return rng.integers(start, end, n)
+
+    def take(self, indices):
+        """
+        Decode the strings at the given indices.
+
+        Args:
+            indices: Iterable of int indices
+
+        Returns:
+            list: Strings
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = (self._offsets[indices].astype(np.int64) + self._data_start).tolist()
+        ends = (self._offsets[indices + 1].astype(np.int64) + self._data_start).tolist()
+
+        buffer = self._mmap
+        return [buffer[start:end].decode("utf-8") for start, end in zip(starts, ends)]
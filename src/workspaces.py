@@ -0,0 +1,470 @@
+"""
+Workspace builds: one workspace, or many in one run.
+
+build_workspace generates a single workspace (users, teams, projects,
+tasks and everything under them) through a writer; src.main uses it for
+the default single-workspace build.
+
+Multi-workspace mode (python -m src.main --workspaces N, or
+--workspace-spec FILE) builds N independent workspaces, each with its own
+company name, email domain, scale and seed, one per process (--workers at
+a time). Each workspace is built into its own SQLite file, so builds
+never contend for a writer. With --split-workspaces those files are the
+output (<db stem>.<workspace_id>.sqlite, each indexed and with its own
+run report); otherwise they are merged into the one database, where every
+table is partitioned by workspace_id through its parent rows, and indexed
+once after the merge. The run report lists each workspace's rows, time
+and throughput.
+
+Workspaces draw from their own master seed and, for GIDs, their own range
+within each kind's block (id_utils.GID_WORKSPACE_STRIDE), so merged
+workspaces never share ids.
+"""
+
+import json
+import random
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from pathlib import Path
+from src.utils.db_utils import (
+    initialize_database,
+    finalize_database,
+    load_pragmas,
+    load_schema,
+    create_writer,
+    report_write_stats
+)
+from src.utils.rng_utils import set_master_seed
+from src.utils.id_utils import set_id_format, reset_id_counters, GID_WORKSPACE_STRIDE
+from src.utils.scale_utils import resolve_scale, get_scale_settings
+from src.utils.instrumentation import RunReport, report_path_for
+from src.generators.users import generate_users
+from src.generators.tasks import iter_task_batches, iter_task_refs
+from src.generators.projects import generate_projects
+from src.generators.comments import generate_comment_columns
+from src.generators.sections import generate_sections
+from src.generators.teams import generate_teams
+from src.generators.team_memberships import (
+    assign_team_members,
+    generate_team_memberships,
+    project_teams
+)
+from src.generators.tags_attachments import (
+    generate_tags,
+    iter_task_tags,
+    iter_attachments
+)
+from src.generators.custom_fields import (
+    generate_custom_field_definitions,
+    iter_custom_field_values
+)
+from src.config import (
+    COMPANY_NAME,
+    COMPANY_DOMAIN,
+    COMPANY_NAME_PREFIXES,
+    COMPANY_NAME_SUFFIXES,
+    CURRENT_DATE
+)
+
+
+DEFAULT_WORKSPACE = {
+    "workspace_id": "workspace-001",
+    "name": COMPANY_NAME,
+    "domain": COMPANY_DOMAIN
+}
+
+
+# -----------------------------------------------------------------------------
+# ONE WORKSPACE
+# -----------------------------------------------------------------------------
+
+def build_workspace(writer, run, scale, text_pools, workspace=None, workers=1, log=print):
+    """
+    Generate one whole workspace, stage by stage, through a writer.
+
+    Args:
+        writer: Bulk writer (see db_utils.create_writer)
+        run: RunReport the stages are recorded in
+        scale: Workspace sizes (see scale_utils.get_scale_settings)
+        text_pools: {pool_name: TextPool} (see text_corpus.load_text_pools)
+        workspace: {"workspace_id", "name", "domain"} (default: DEFAULT_WORKSPACE)
+        workers: Processes used to generate tasks
+        log: Progress printer (a no-op silences the stage messages)
+    """
+    workspace = workspace or DEFAULT_WORKSPACE
+    # -------------------------------------------------
+    # WORKSPACE
+    # -------------------------------------------------
+    log("Creating workspace...")
+    workspace_id = workspace["workspace_id"]
+
+    with run.stage("workspace"):
+        writer.write("workspaces", [{
+            "workspace_id": workspace_id,
+            "name": workspace["name"],
+            "domain": workspace["domain"],
+            "workspace_type": "organization",
+            "created_at": CURRENT_DATE,
+            "is_active": 1
+        }])
+
+    # -------------------------------------------------
+    # USERS
+    # -------------------------------------------------
+    log("Generating users...")
+    with run.stage("users"):
+        users = generate_users(
+            workspace_id,
+            scale["num_users"],
+            workspace["domain"],
+            text_pools["person_names"]
+        )
+        writer.write("users", users)
+
+    # -------------------------------------------------
+    # TEAMS
+    # -------------------------------------------------
+    log("Generating teams...")
+    with run.stage("teams"):
+        teams = generate_teams(workspace_id, scale["team_types"])
+        writer.write("teams", teams)
+
+    # -------------------------------------------------
+    # TEAM MEMBERSHIPS  (RUNS ONCE — ONLY HERE)
+    # -------------------------------------------------
+    log("Generating team memberships...")
+    with run.stage("team_memberships"):
+        team_members = assign_team_members(users, teams)
+        memberships = generate_team_memberships(users, teams, team_members)
+        writer.write("team_memberships", memberships)
+
+    # -------------------------------------------------
+    # PROJECTS
+    # -------------------------------------------------
+    log("Generating projects...")
+    with run.stage("projects"):
+        projects = generate_projects(
+            workspace_id,
+            teams,
+            users,
+            scale["projects_per_team"],
+            team_members
+        )
+        writer.write("projects", projects)
+
+    # -------------------------------------------------
+    # SECTIONS
+    # -------------------------------------------------
+    log("Generating sections...")
+    with run.stage("sections"):
+        sections = generate_sections(projects)
+        writer.write("sections", sections)
+
+    # -------------------------------------------------
+    # CUSTOM FIELD DEFINITIONS + TAGS
+    # -------------------------------------------------
+    # Written before tasks so per-task rows can stream alongside them
+    log("Generating custom fields...")
+    with run.stage("custom_field_definitions"):
+        field_defs = generate_custom_field_definitions(projects)
+        writer.write("custom_field_definitions", field_defs)
+
+    log("Generating tags...")
+    with run.stage("tags"):
+        tags = generate_tags(workspace_id)
+        writer.write("tags", tags)
+
+    # -------------------------------------------------
+    # TASKS + SUBTASKS AND PER-TASK ROWS (STREAMED)
+    # -------------------------------------------------
+    # Tasks are produced as columnar batches (one per shard of
+    # TASK_SHARD_SIZE projects); each batch is written together with its
+    # comments, custom field values, tags and attachments and then
+    # dropped, so memory stays bounded by the shard size.
+    log("Generating tasks, comments, custom field values, task tags and attachments...")
+    with run.stage("tasks_and_activity"):
+        teams_of_projects = project_teams(team_members, projects)
+        task_batches = iter_task_batches(
+            projects,
+            sections,
+            teams,
+            users,
+            workers=workers,
+            tasks_per_project=scale["tasks_per_project"],
+            name_pool=text_pools["task_names"],
+            team_members=team_members
+        )
+
+        for batch in task_batches:
+            writer.write_columns("tasks", batch)
+            writer.write_columns("comments", generate_comment_columns(
+                batch,
+                users,
+                text_pools["comments"],
+                team_members=team_members,
+                project_teams=teams_of_projects
+            ))
+            writer.write(
+                "custom_field_values",
+                iter_custom_field_values(iter_task_refs(batch), field_defs)
+            )
+            writer.write("task_tags", iter_task_tags(iter_task_refs(batch), tags))
+            writer.write("attachments", iter_attachments(iter_task_refs(batch), users))
+
+
+
+# -----------------------------------------------------------------------------
+# WORKSPACE SPECS
+# -----------------------------------------------------------------------------
+
+def company_domain(name):
+    """
+    Email domain for a company name, e.g. "Acme Labs 2" -> "acme-labs-2.com".
+    """
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") + ".com"
+
+
+def plan_workspaces(count, scales=("medium",), seed=0):
+    """
+    Describe `count` distinct workspaces.
+
+    Company names combine COMPANY_NAME_PREFIXES and COMPANY_NAME_SUFFIXES
+    in a seeded order and are numbered once every combination is used.
+
+    Args:
+        count: Number of workspaces
+        scales: Scales (names or factors, see scale_utils) drawn from per workspace
+        seed: Run seed; workspace i gets seed + i
+
+    Returns:
+        list: {"index", "workspace_id", "name", "domain", "scale", "seed"}
+            per workspace
+    """
+    rng = random.Random(seed)
+    names = [f"{prefix} {suffix}" for prefix, suffix in product(COMPANY_NAME_PREFIXES, COMPANY_NAME_SUFFIXES)]
+    rng.shuffle(names)
+
+    specs = []
+    for i in range(count):
+        name = names[i % len(names)]
+        if i >= len(names):
+            name = f"{name} {i // len(names) + 1}"
+        specs.append({
+            "index": i,
+            "workspace_id": f"workspace-{i + 1:03d}",
+            "name": name,
+            "domain": company_domain(name),
+            "scale": str(rng.choice(list(scales))),
+            "seed": seed + i
+        })
+    return specs
+
+
+def load_workspace_specs(path, default_scale="medium", seed=0):
+    """
+    Read workspace specs from a JSON list. Every field is optional; missing
+    ones are filled in as plan_workspaces would.
+
+    Example:
+        [{"name": "Acme Labs", "scale": "large", "seed": 7}, {"scale": 0.5}]
+
+    Returns:
+        list: Complete specs (see plan_workspaces)
+    """
+    with open(path) as f:
+        entries = json.load(f)
+
+    specs = plan_workspaces(len(entries), [default_scale], seed)
+    for spec, entry in zip(specs, entries):
+        spec.update(entry)
+        if "name" in entry and "domain" not in entry:
+            spec["domain"] = company_domain(entry["name"])
+        spec["scale"] = str(spec["scale"])
+        resolve_scale(spec["scale"])
+
+    for field in ("workspace_id", "domain"):
+        values = [spec[field] for spec in specs]
+        if len(set(values)) != len(values):
+            raise ValueError(f"Workspace specs in {path} repeat a {field}")
+    return specs
+
+
+# -----------------------------------------------------------------------------
+# MANY WORKSPACES
+# -----------------------------------------------------------------------------
+
+class WorkspaceTotals:
+    """
+    Stands in for a writer in the RunReport of a multi-workspace run: the
+    workers write, and their per-table stats are summed here as they finish.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def add(self, stats):
+        for table, table_stats in stats.items():
+            totals = self.stats.setdefault(table, {"rows": 0, "seconds": 0.0})
+            totals["rows"] += table_stats["rows"]
+            totals["seconds"] += table_stats["seconds"]
+
+    def report(self):
+        report_write_stats(self.stats)
+
+
+def workspace_path(db_path, workspace_id):
+    """
+    File of one workspace in --split-workspaces mode, e.g.
+    output/asana_simulation.workspace-001.sqlite.
+    """
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}.{workspace_id}{db_path.suffix}")
+
+
+def build_workspace_file(spec, db_path, options):
+    """
+    Build one workspace into its own database file (process pool worker).
+
+    Args:
+        spec: Workspace spec (see plan_workspaces)
+        db_path: File to (re)create
+        options: {"id_format", "defer_unique", "text_pools", "finalize"};
+            with finalize the file is indexed and gets its own run report
+
+    Returns:
+        dict: The spec plus db_path, rows, seconds, rows_per_sec and the
+            writer's per-table stats
+    """
+    set_master_seed(spec["seed"])
+    set_id_format(options["id_format"])
+    reset_id_counters(spec["index"] * GID_WORKSPACE_STRIDE)
+
+    conn = initialize_database(db_path, options["defer_unique"], backend="sqlite")
+    writer = create_writer(conn)
+    run = RunReport(writer, trace_memory=False, meta={**spec, "db_path": str(db_path)})
+
+    with load_pragmas(conn):
+        build_workspace(
+            writer,
+            run,
+            get_scale_settings(resolve_scale(spec["scale"])),
+            options["text_pools"],
+            spec,
+            log=lambda *_: None
+        )
+        if hasattr(writer, "close"):
+            writer.close()
+        if options["finalize"]:
+            with run.stage("finalize"):
+                finalize_database(conn, defer_unique=options["defer_unique"])
+    conn.close()
+
+    if options["finalize"]:
+        run.write(report_path_for(db_path))
+    totals = run.to_dict()["totals"]
+    return {
+        **spec,
+        "db_path": str(db_path),
+        "rows": totals["rows"],
+        "seconds": totals["seconds"],
+        "rows_per_sec": totals["rows_per_sec"],
+        "tables": writer.stats
+    }
+
+
+def merge_databases(conn, paths):
+    """
+    Append every table of each database file to the open database.
+
+    Args:
+        conn: SQLite connection to the target (same schema)
+        paths: Database files to copy in, in order
+
+    Returns:
+        int: Rows copied
+    """
+    before = conn.total_changes
+    for path in paths:
+        conn.execute("ATTACH DATABASE ? AS part", (str(path),))
+        for table in load_schema():
+            conn.execute(f"INSERT INTO main.{table} SELECT * FROM part.{table}")
+        conn.commit()
+        conn.execute("DETACH DATABASE part")
+    return conn.total_changes - before
+
+
+def generate_workspaces(specs, db_path, text_pools, run, workers=1, split=False,
+                        id_format="uuid", defer_unique=False):
+    """
+    Build many workspaces in parallel, into one database or one file each.
+
+    Args:
+        specs: Workspace specs (see plan_workspaces)
+        db_path: Target database (or the name the split files derive from)
+        text_pools: {pool_name: TextPool}, shared by every worker
+        run: RunReport of the whole run, over a WorkspaceTotals; gets
+            "workspaces", "merge" and "finalize" stages and a "workspaces"
+            list in its meta
+        workers: Workspaces built at once
+        split: Keep one file per workspace instead of merging
+        id_format: Primary key format
+        defer_unique: See db_utils.initialize_database
+
+    Returns:
+        list: One result per workspace (see build_workspace_file), in spec order
+    """
+    db_path = Path(db_path)
+    parts_dir = db_path.with_name(f"{db_path.stem}.parts")
+    if not split:
+        parts_dir.mkdir(parents=True, exist_ok=True)
+
+    options = {
+        "id_format": id_format,
+        "defer_unique": defer_unique,
+        "text_pools": text_pools,
+        "finalize": split
+    }
+    paths = [
+        workspace_path(db_path, spec["workspace_id"]) if split
+        else parts_dir / f"{spec['workspace_id']}.sqlite"
+        for spec in specs
+    ]
+
+    results = [None] * len(specs)
+    with run.stage("workspaces"):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(build_workspace_file, spec, path, options): i
+                for i, (spec, path) in enumerate(zip(specs, paths))
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                run.writer.add(result.pop("tables"))
+                results[futures[future]] = result
+                print(
+                    f"  {result['workspace_id']}  {result['name']:<28} scale {result['scale']:<7} "
+                    f"{result['rows']:>10,} rows {result['seconds']:>8.2f} s "
+                    f"{result['rows_per_sec']:>10,.0f} rows/s"
+                )
+    run.meta["workspaces"] = results
+
+    if split:
+        return results
+
+    print("Merging workspaces...")
+    conn = initialize_database(db_path, defer_unique, backend="sqlite")
+    with run.stage("merge"):
+        start = time.perf_counter()
+        rows = merge_databases(conn, paths)
+        run.meta["merge"] = {"rows": rows, "seconds": time.perf_counter() - start}
+
+    print("Building indexes...")
+    with run.stage("finalize"):
+        finalize_database(conn, defer_unique=defer_unique)
+    conn.close()
+
+    shutil.rmtree(parts_dir)
+    return results
@@ -0,0 +1,100 @@
+"""
+Comment dates stay inside their task's lifetime.
+"""
+
+import sqlite3
+from datetime import timedelta
+import numpy as np
+from src.config import CURRENT_DATE
+from src.main import main
+from src.append import activity_window
+from src.generators.comments import generate_comment_columns
+
+# Per-task tables of appended rows: (table, timestamp column)
+TASK_ACTIVITY = (
+    ("comments", "created_at"),
+    ("task_tags", "created_at"),
+    ("attachments", "uploaded_at")
+)
+
+
+def make_tasks():
+    now = np.datetime64(CURRENT_DATE, "s")
+    day = np.timedelta64(1, "D")
+    nat = np.datetime64("NaT", "s")
+    # (created_at, completed_at): open, completed, created after
+    # CURRENT_DATE, completed after CURRENT_DATE, completed before created
+    cases = [
+        (now - 30 * day, nat),
+        (now - 30 * day, now - 10 * day),
+        (now + 2 * day, nat),
+        (now - 5 * day, now + 3 * day),
+        (now - 5 * day, now - 8 * day)
+    ]
+    created_at, completed_at = zip(*(cases * 200))
+    n = len(created_at)
+    return {
+        "task_id": np.array([f"task-{i}" for i in range(n)], dtype=object),
+        "project_id": np.array(["project-0"] * n, dtype=object),
+        "created_at": np.array(created_at, dtype="datetime64[s]"),
+        "completed_at": np.array(completed_at, dtype="datetime64[s]")
+    }
+
+
+def check_lifetimes(tasks, comments, upper, lower=None):
+    index = {task_id: i for i, task_id in enumerate(tasks["task_id"])}
+    task = np.array([index[task_id] for task_id in comments["task_id"]], dtype=np.int64)
+    created_at = tasks["created_at"][task]
+    completed_at = tasks["completed_at"][task]
+    end = np.where(np.isnat(completed_at), upper, np.minimum(completed_at, upper))
+
+    posted_at = comments["created_at"]
+    assert posted_at.size
+    assert (created_at <= posted_at).all()
+    if lower is not None:
+        assert (lower <= posted_at).all()
+    assert (posted_at <= end).all()
+
+    edited_at = comments["edited_at"][comments["is_edited"] == 1]
+    assert (edited_at >= posted_at[comments["is_edited"] == 1]).all()
+    assert (edited_at <= end[comments["is_edited"] == 1]).all()
+
+
+def test_comments_inside_task_lifetime():
+    tasks = make_tasks()
+    users = [{"user_id": "user-0"}]
+    comments = generate_comment_columns(tasks, users)
+    now = np.datetime64(CURRENT_DATE, "s")
+    check_lifetimes(tasks, comments, now)
+
+
+def test_window_comments_inside_task_lifetime():
+    tasks = make_tasks()
+    users = [{"user_id": "user-0"}]
+    window = (CURRENT_DATE - timedelta(days=7), CURRENT_DATE + timedelta(days=7))
+    comments = generate_comment_columns(tasks, users, window=window)
+    lower, upper = (np.datetime64(bound, "s") for bound in window)
+    check_lifetimes(tasks, comments, upper, lower)
+
+
+def test_appended_rows_inside_task_lifetime(tmp_path):
+    db_path = str(tmp_path / "small.sqlite")
+    options = ["--db-path", db_path, "--text-pool-dir", str(tmp_path / "text_pools")]
+    main(["--scale", "small", *options])
+    conn = sqlite3.connect(db_path)
+    window_start = activity_window(conn, 30)[0].isoformat(sep=" ")
+
+    main(["--append-days", "30", *options])
+    try:
+        for table, column in TASK_ACTIVITY:
+            appended, outside = conn.execute(f"""
+                SELECT COUNT(*),
+                       SUM(r.{column} < t.created_at
+                           OR (t.completed_at IS NOT NULL AND r.{column} > t.completed_at))
+                FROM {table} r JOIN tasks t USING (task_id)
+                WHERE r.{column} > ?
+            """, (window_start,)).fetchone()
+            assert appended, table
+            assert outside == 0, table
+    finally:
+        conn.close()
@@ -0,0 +1,51 @@
+"""
+Episode sessions see their own writes and report them.
+"""
+
+import sqlite3
+import pytest
+from src.utils.episode_utils import EpisodeSession
+
+
+@pytest.fixture
+def session(tmp_path):
+    db_path = tmp_path / "base.sqlite"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE tasks (task_id TEXT PRIMARY KEY, estimated_hours REAL);
+        CREATE TABLE tags (tag_id TEXT PRIMARY KEY, name TEXT);
+        INSERT INTO tasks VALUES ('t1', 7.0);
+        INSERT INTO tags VALUES ('g1', 'base');
+    """)
+    conn.close()
+
+    with EpisodeSession(db_path) as session:
+        yield session
+
+
+def test_executemany_sees_earlier_rows(session):
+    session.conn.executemany(
+        "UPDATE tasks SET estimated_hours = estimated_hours + 1 WHERE task_id = ?",
+        [("t1",), ("t1",)]
+    )
+    assert session.conn.execute("SELECT estimated_hours FROM tasks").fetchall() == [(9.0,)]
+
+
+def test_executescript_sees_earlier_statements(session):
+    session.conn.executescript("""
+        INSERT INTO tags (tag_id, name) VALUES ('g2', 'n');
+        UPDATE tags SET name = 'z' WHERE tag_id = 'g2';
+    """)
+    assert session.conn.execute("SELECT name FROM tags WHERE tag_id = 'g2'").fetchall() == [("z",)]
+
+
+def test_changes_hide_only_base_rows(session):
+    session.conn.execute("INSERT INTO tags (tag_id, name) VALUES ('g2', 'n')")
+    session.conn.execute("UPDATE tags SET name = 'z' WHERE tag_id = 'g2'")
+    session.conn.execute("DELETE FROM tags WHERE tag_id = 'g2'")
+    session.conn.execute("UPDATE tasks SET estimated_hours = 1 WHERE task_id = 't1'")
+    assert session.changes() == {"tasks": {"written": 1, "hidden": 1}}
+
+    session.reset()
+    assert session.changes() == {}
+    assert session.conn.execute("SELECT estimated_hours FROM tasks").fetchall() == [(7.0,)]
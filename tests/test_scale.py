@@ -0,0 +1,39 @@
+"""
+Scale profiles keep the proportions of the medium workspace.
+"""
+
+import sqlite3
+import pytest
+from src.main import main
+from src.config import SCALE_PROFILES
+
+TABLES = ("users", "teams", "projects", "tasks")
+
+
+def build_counts(tmp_path, scale):
+    db_path = tmp_path / f"{scale}.sqlite"
+    main([
+        "--scale", scale,
+        "--db-path", str(db_path),
+        "--text-pool-dir", str(tmp_path / "text_pools")
+    ])
+    conn = sqlite3.connect(db_path)
+    try:
+        return {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in TABLES}
+    finally:
+        conn.close()
+
+
+def test_small_profile_keeps_medium_ratios(tmp_path):
+    small = build_counts(tmp_path, "small")
+    medium = build_counts(tmp_path, "medium")
+    factor = SCALE_PROFILES["small"] / SCALE_PROFILES["medium"]
+
+    assert small["users"] == round(medium["users"] * factor)
+    # Per-parent ratios stay close to medium's
+    for child, parent in (("teams", "users"), ("projects", "teams"), ("tasks", "projects")):
+        assert small[child] / small[parent] == pytest.approx(
+            medium[child] / medium[parent], rel=0.35
+        )
+    # ... and so does the overall size
+    assert small["tasks"] / medium["tasks"] == pytest.approx(factor, rel=0.5)
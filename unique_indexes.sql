@@ -0,0 +1,5 @@
+-- UNIQUE constraints of schema.sql built as indexes after the bulk load
+-- (--defer-unique). The schema is then created without them, so the load
+-- doesn't maintain them row by row; a duplicate fails the finalize stage.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_custom_field_values_field_task ON custom_field_values(field_id, task_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_task_tags_task_tag ON task_tags(task_id, tag_id);